@@ -0,0 +1,210 @@
+## BatchCreator.py
+# This file creates the boilerplate code for many plugins at once
+# The specs are read from a directory of JSON files or from a manifest JSON file
+# Usage: python BatchCreator.py <specDirectory or manifest.json> [-j numProcesses]
+
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import time
+
+import CreateBundle
+import CreateCommandPlugin
+import CreateDGNode
+import CreateDeformer
+import CreatorProfile
+import GenerationCache
+import JSONStream
+
+## The creator class to use for each type of spec
+creators = {
+	"node" : CreateDGNode.DGNodeFileCreator,
+	"deformer" : CreateDeformer.DeformerFileCreator,
+	"command" : CreateCommandPlugin.PluginFileCreator,
+	"bundle" : CreateBundle.BundleFileCreator
+}
+
+## Work out which creator a spec needs from the keys in the JSON file
+# A file that is missing or cannot be read has no type, so it fails with the other specs when it is generated
+# @param _fileName The JSON file to check
+# @return The spec type, or None if the file is not a plugin spec or cannot be read
+def getSpecType(_fileName):
+	try:
+		if os.path.getsize(_fileName) >= CreateDGNode.streamingThreshold:
+			# Only the keys are needed, so the attributes of a large spec are not loaded
+			return getSpecTypeFromJSON(dict.fromkeys(JSONStream.JSONStreamReader(_fileName, CreateDGNode.streamedKeys).getKeys()))
+		fileIn = open(_fileName, "r")
+		try:
+			jsonFile = json.load(fileIn)
+		finally:
+			fileIn.close()
+	except (IOError, OSError, ValueError):
+		return None
+	return getSpecTypeFromJSON(jsonFile)
+
+## Work out which creator a spec needs from its keys
+# @param _jsonFile The loaded JSON of the spec
+# @return The spec type, or None if it is not a plugin spec
+def getSpecTypeFromJSON(_jsonFile):
+	if not isinstance(_jsonFile, dict):
+		return None
+	if "bundle" in _jsonFile:
+		return "bundle"
+	if "nodeName" in _jsonFile:
+		# A deformer writes to the output geometry instead of its own output attributes
+		if "outputAttributes" in _jsonFile:
+			return "node"
+		return "deformer"
+	if "functionName" in _jsonFile:
+		return "command"
+	return None
+
+## Collect the specs to generate
+# A directory is scanned for JSON files and the spec type is detected from each file.
+# A manifest is a JSON file with a "specs" array. Each entry is either a path or a dict
+# with a "path" and an optional "type" ("node", "deformer", "command" or "bundle"). Paths are relative to the manifest.
+# @param _path A directory of JSON files or a manifest JSON file
+# @return A list of (specType, specPath) tuples
+def collectSpecs(_path):
+	specs = []
+	if os.path.isdir(_path):
+		for fileName in sorted(os.listdir(_path)):
+			# Hidden files such as the generation cache are not specs
+			if fileName.endswith(".json") and not fileName.startswith("."):
+				specPath = os.path.join(_path, fileName)
+				specs.append((getSpecType(specPath), specPath))
+		return specs
+	fileIn = open(_path, "r")
+	try:
+		manifest = json.load(fileIn)
+	finally:
+		fileIn.close()
+	manifestDir = os.path.dirname(os.path.abspath(_path))
+	for entry in manifest["specs"]:
+		if not isinstance(entry, dict):
+			entry = {"path" : entry}
+		specPath = os.path.join(manifestDir, entry["path"])
+		specType = entry.get("type")
+		if specType == None:
+			specType = getSpecType(specPath)
+		specs.append((specType, specPath))
+	return specs
+
+## Generate a single plugin
+# This runs in a worker process so it must not raise
+# @param _spec A (specType, specPath) tuple
+# @param _profiles A list that the profile of the spec is added to, or None to generate it without profiling
+# @return A (specPath, status, error message, time taken) tuple, where status is "OK" or "FAILED"
+def generateSpec(_spec, _profiles = None):
+	specType, specPath = _spec
+	startTime = time.time()
+	try:
+		if specType not in creators:
+			if not os.access(specPath, os.R_OK):
+				raise IOError("The spec file is missing or cannot be read")
+			raise ValueError("Unknown spec type: " + str(specType))
+		if _profiles != None:
+			_profiles.append(CreatorProfile.profileSpec(creators[specType], specPath))
+		else:
+			creators[specType](specPath)
+	except Exception as e:
+		return (specPath, "FAILED", "%s: %s" % (type(e).__name__, e), time.time() - startTime)
+	return (specPath, "OK", "", time.time() - startTime)
+
+## Generate a single plugin with a profiled creator
+# This runs in a worker process so it must not raise
+# @param _spec A (specType, specPath) tuple
+# @return A tuple of the result of generateSpec and the profile from CreatorProfile.profileSpec, or None if it failed
+def generateSpecProfiled(_spec):
+	profiles = []
+	result = generateSpec(_spec, profiles)
+	return (result, profiles[0] if profiles else None)
+
+## Generate every spec across a process pool
+# @param _specs A list of (specType, specPath) tuples
+# @param _numProcesses The number of worker processes, defaults to the number of cores
+# @param _cache A GenerationCache used to skip specs whose output is already current, or None to generate everything
+# @param _profiles A list that the profile of each generated spec is added to, or None to generate without profiling
+# @return A list of (specPath, status, error message, time taken) tuples in the order of _specs
+# The status is "OK", "SKIPPED" or "FAILED"
+def generateAll(_specs, _numProcesses = None, _cache = None, _profiles = None):
+	results = {}
+	staleSpecs = []
+	for spec in _specs:
+		specType, specPath = spec
+		if _cache != None and specType in creators and _cache.isCurrent(specPath, creators[specType]):
+			results[specPath] = (specPath, "SKIPPED", "", 0.0)
+		else:
+			staleSpecs.append(spec)
+	worker = generateSpec if _profiles == None else generateSpecProfiled
+	if _numProcesses == 1 or len(staleSpecs) <= 1:
+		staleResults = [worker(spec) for spec in staleSpecs]
+	else:
+		pool = multiprocessing.Pool(_numProcesses)
+		try:
+			# Small chunks keep the workers balanced when some specs are much larger than others
+			chunkSize = max(1, len(staleSpecs) // (4 * (_numProcesses or multiprocessing.cpu_count())))
+			staleResults = pool.map(worker, staleSpecs, chunkSize)
+		finally:
+			pool.close()
+			pool.join()
+	if _profiles != None:
+		_profiles.extend([profile for result, profile in staleResults if profile != None])
+		staleResults = [result for result, profile in staleResults]
+	for spec, result in zip(staleSpecs, staleResults):
+		results[result[0]] = result
+		if _cache != None:
+			if result[1] == "OK":
+				_cache.update(spec[1], creators[spec[0]])
+			else:
+				_cache.remove(spec[1])
+	if _cache != None:
+		_cache.save()
+	return [results[specPath] for specType, specPath in _specs]
+
+## Print the result of each spec and the total throughput
+# @param _results The results from generateAll
+# @param _totalTime The wall time for the whole batch in seconds
+def report(_results, _totalTime):
+	numFailed = 0
+	numSkipped = 0
+	for specPath, status, error, specTime in _results:
+		if status == "OK":
+			sys.stdout.write("OK      %s (%.3fs)\n" % (specPath, specTime))
+		elif status == "SKIPPED":
+			numSkipped += 1
+			sys.stdout.write("SKIPPED %s (up to date)\n" % specPath)
+		else:
+			numFailed += 1
+			sys.stdout.write("FAILED  %s (%.3fs): %s\n" % (specPath, specTime, error))
+	throughput = len(_results) / _totalTime if _totalTime > 0 else 0.0
+	numGenerated = len(_results) - numFailed - numSkipped
+	sys.stdout.write("Generated %i/%i specs, %i up to date, in %.3fs (%.1f specs/s)\n" % (numGenerated, len(_results), numSkipped, _totalTime, throughput))
+	return numFailed
+
+# Main
+if __name__ == "__main__":
+	parser = argparse.ArgumentParser(description = "Generate Maya plugins from a directory of JSON specs or a manifest")
+	parser.add_argument("path", help = "A directory of JSON specs or a manifest JSON file")
+	parser.add_argument("-j", "--jobs", type = int, default = None, help = "Number of worker processes (default: number of cores)")
+	parser.add_argument("--cache", default = None, help = "The generation cache file (default: .generationCache.json next to the specs)")
+	parser.add_argument("--force", action = "store_true", help = "Regenerate every spec even if its output is up to date")
+	parser.add_argument("--profile", default = None, help = "Profile the generators and write the timings to this JSON file")
+	args = parser.parse_args()
+	startTime = time.time()
+	cache = None
+	if not args.force:
+		cacheFile = args.cache
+		if cacheFile == None:
+			specDir = args.path if os.path.isdir(args.path) else os.path.dirname(os.path.abspath(args.path))
+			cacheFile = os.path.join(specDir, ".generationCache.json")
+		cache = GenerationCache.GenerationCache(cacheFile)
+	profiles = [] if args.profile != None else None
+	results = generateAll(collectSpecs(args.path), args.jobs, cache, profiles)
+	numFailed = report(results, time.time() - startTime)
+	if profiles != None:
+		CreatorProfile.writeJSON(profiles, args.profile)
+		CreatorProfile.report(profiles)
+	sys.exit(1 if numFailed else 0)
@@ -0,0 +1,281 @@
+## BenchmarkGenerator.py
+# This file measures how the generators scale with the size of the spec
+# Synthetic DG node specs with many attributes and dense dependencies, and command specs with many flags,
+# are generated while each phase of the creator is timed, and the results are written to a JSON file
+# Usage: python BenchmarkGenerator.py [--nodeSizes 10,100,1000,10000] [--flagCounts 10,100,500] [--json results.json] [--compare old.json]
+
+import argparse
+import gc
+import json
+import math
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+
+import CreateCommandPlugin
+import CreateDGNode
+import CreatorProfile
+
+## The best available timer
+timer = getattr(time, "perf_counter", time.time)
+
+try:
+	import tracemalloc
+except ImportError:
+	# Python 2 has no tracemalloc, the peak memory is not measured
+	tracemalloc = None
+
+## The phases of a creator that are timed, in the order they run
+phases = ("parseSpec", "writePluginDetails", "writeClass", "writeInitialisation", "writeFile")
+
+## The numeric and non-numeric attribute types used in the synthetic node specs
+numericTypes = ["Bool", "Char", "Double", "2Double", "3Double", "Float", "2Float", "3Float", "Int", "2Int", "3Int", "Short", "2Short", "3Short"]
+nonNumericTypes = ["DoubleArray", "IntArray", "Matrix", "Mesh", "NurbsCurve", "NurbsSurface", "String"]
+
+## The flag types used in the synthetic command specs and their default values
+flagTypes = [("bool", False), ("double", 1.0), ("float", 1.0), ("int", 1), ("MAngle", 0.0), ("MDistance", 1.0), ("MTime", 0.0), ("string", "\"\"")]
+
+## Make a synthetic DG node spec
+# Three quarters of the attributes are inputs, and each output depends on a window of the inputs
+# by both long and short name, so the dependency lists are dense and overlap
+# @param _outputDir The directory the plugin is generated in
+# @param _numAttributes The total number of attributes
+# @param _numDependencies The number of dependencies of each output
+# @param _computeDispatch "chain" or "dictionary"
+# @return The dict for the JSON file
+def makeNodeSpec(_outputDir, _numAttributes, _numDependencies, _computeDispatch):
+	numOutputs = max(1, _numAttributes // 4)
+	numInputs = max(1, _numAttributes - numOutputs)
+	inputAttributes = []
+	for i in range(numInputs):
+		if i % 4 == 3:
+			attrType = nonNumericTypes[i % len(nonNumericTypes)]
+			inputAttributes.append({"shortName" : "i" + str(i), "longName" : "input" + str(i), "type" : attrType, "defaultValue" : None, "minValue" : None, "maxValue" : None, "keyable" : False})
+		else:
+			attrType = numericTypes[i % len(numericTypes)]
+			isScalar = not attrType[0].isdigit() and attrType != "Bool"
+			inputAttributes.append({"shortName" : "i" + str(i), "longName" : "input" + str(i), "type" : attrType,
+				"defaultValue" : 0 if isScalar else None, "minValue" : -1 if isScalar else None, "maxValue" : 1 if isScalar else None, "keyable" : True})
+	outputAttributes = []
+	for i in range(numOutputs):
+		dependencies = []
+		for j in range(min(_numDependencies, numInputs)):
+			index = (i * 7 + j) % numInputs
+			dependencies.append(("i" if j % 2 else "input") + str(index))
+		outputAttributes.append({"shortName" : "o" + str(i), "longName" : "output" + str(i), "type" : numericTypes[i % len(numericTypes)], "dependencies" : dependencies})
+	return {
+		"filePath" : _outputDir,
+		"fileName" : "benchmarkNode" + str(_numAttributes),
+		"fileDescription" : "A synthetic node with " + str(_numAttributes) + " attributes",
+		"className" : "BenchmarkNode",
+		"classDescription" : "Synthetic node class",
+		"nodeName" : "benchmarkNode",
+		"nodeID" : "0x00012345",
+		"computeDispatch" : _computeDispatch,
+		"validNumericTypes" : numericTypes,
+		"validNonNumericTypes" : nonNumericTypes,
+		"inputAttributes" : inputAttributes,
+		"outputAttributes" : outputAttributes
+	}
+
+## Make a synthetic command spec
+# @param _outputDir The directory the plugin is generated in
+# @param _numFlags The number of flags
+# @return The dict for the JSON file
+def makeCommandSpec(_outputDir, _numFlags):
+	flags = []
+	for i in range(_numFlags):
+		flagType, defaultValue = flagTypes[i % len(flagTypes)]
+		flags.append({"shortName" : "-f" + str(i), "longName" : "-flag" + str(i), "type" : flagType, "defaultValue" : defaultValue})
+	return {
+		"filePath" : _outputDir,
+		"fileName" : "benchmarkCommand" + str(_numFlags),
+		"fileDescription" : "A synthetic command with " + str(_numFlags) + " flags",
+		"className" : "BenchmarkCommand",
+		"classDescription" : "Synthetic command class",
+		"functionName" : "benchmarkCommand",
+		"isUndoable" : True,
+		"hasFlags" : True,
+		"flags" : flags
+	}
+
+## Run a creator once
+# @param _creatorClass The FileCreator subclass
+# @param _specFile The JSON file
+# @param _traceMemory True to measure the peak memory with tracemalloc
+# @return A dict of the time of each phase, the total time, the peak memory and the size of the output
+def runCreator(_creatorClass, _specFile, _traceMemory):
+	# Only the phases are profiled, so the profiling adds little to the total time
+	profile = CreatorProfile.CreatorProfile()
+	timedCreator = CreatorProfile.makeProfiledCreator(_creatorClass, profile, phases)
+	gc.collect()
+	if _traceMemory:
+		tracemalloc.start()
+	startTime = timer()
+	try:
+		creator = timedCreator(_specFile)
+		totalTime = timer() - startTime
+		peakMemory = tracemalloc.get_traced_memory()[1] if _traceMemory else None
+	finally:
+		if _traceMemory:
+			tracemalloc.stop()
+	text = creator.getText()
+	return {
+		"phases" : dict((phase, profile.getTime(phase)) for phase in phases if phase in profile.m_methods),
+		"total" : totalTime,
+		"peakMemory" : peakMemory,
+		"outputBytes" : len(text.encode("utf-8")),
+		"outputLines" : text.count("\n")
+	}
+
+## Benchmark a spec
+# The time of each phase is the best of the repeats. The peak memory is measured in a separate run,
+# as tracing the allocations slows the generator down
+# @param _creatorClass The FileCreator subclass
+# @param _spec The dict for the JSON file
+# @param _workDir The directory the JSON file is written to
+# @param _repeats The number of timed runs
+# @return A dict of the results
+def benchmarkSpec(_creatorClass, _spec, _workDir, _repeats):
+	specFile = os.path.join(_workDir, _spec["fileName"] + ".json")
+	fileOut = open(specFile, "w")
+	try:
+		json.dump(_spec, fileOut)
+	finally:
+		fileOut.close()
+	runs = [runCreator(_creatorClass, specFile, False) for i in range(_repeats)]
+	result = {
+		"phases" : dict((phase, min(run["phases"].get(phase, 0.0) for run in runs)) for phase in phases),
+		"total" : min(run["total"] for run in runs),
+		"outputBytes" : runs[0]["outputBytes"],
+		"outputLines" : runs[0]["outputLines"],
+		"specBytes" : os.path.getsize(specFile),
+		"peakMemory" : None
+	}
+	if tracemalloc != None:
+		result["peakMemory"] = runCreator(_creatorClass, specFile, True)["peakMemory"]
+	return result
+
+## Get the name of a benchmark case, used to match the cases when comparing results
+# @param _case The dict of the case
+# @return The name
+def getCaseName(_case):
+	if _case["kind"] == "node":
+		return "node/%i attributes/%i dependencies/%s" % (_case["attributes"], _case["dependencies"], _case["computeDispatch"])
+	return "command/%i flags" % _case["flags"]
+
+## Estimate how the time grows with the size between consecutive cases
+# A value near 1 is linear and a value near 2 is quadratic
+# @param _cases The cases of one kind, in order of size
+# @param _sizeKey The key of the size in each case
+# @return A list of the exponent between each pair of cases
+def getScalingExponents(_cases, _sizeKey):
+	exponents = []
+	for previous, current in zip(_cases, _cases[1:]):
+		if previous["total"] > 0 and current[_sizeKey] > previous[_sizeKey]:
+			exponents.append(math.log(current["total"] / previous["total"]) / math.log(float(current[_sizeKey]) / previous[_sizeKey]))
+		else:
+			exponents.append(None)
+	return exponents
+
+## Run every benchmark case
+# @param _nodeSizes The numbers of attributes of the node specs
+# @param _numDependencies The number of dependencies of each output
+# @param _computeDispatch "chain" or "dictionary"
+# @param _flagCounts The numbers of flags of the command specs
+# @param _repeats The number of timed runs of each case
+# @return A list of the dict of each case
+def runBenchmarks(_nodeSizes, _numDependencies, _computeDispatch, _flagCounts, _repeats):
+	workDir = tempfile.mkdtemp(prefix = "benchmarkGenerator")
+	cases = []
+	try:
+		for size in _nodeSizes:
+			case = {"kind" : "node", "attributes" : size, "dependencies" : _numDependencies, "computeDispatch" : _computeDispatch}
+			case.update(benchmarkSpec(CreateDGNode.DGNodeFileCreator, makeNodeSpec(workDir, size, _numDependencies, _computeDispatch), workDir, _repeats))
+			cases.append(case)
+			sys.stdout.write("%-50s %10.4fs\n" % (getCaseName(case), case["total"]))
+		for numFlags in _flagCounts:
+			case = {"kind" : "command", "flags" : numFlags}
+			case.update(benchmarkSpec(CreateCommandPlugin.PluginFileCreator, makeCommandSpec(workDir, numFlags), workDir, _repeats))
+			cases.append(case)
+			sys.stdout.write("%-50s %10.4fs\n" % (getCaseName(case), case["total"]))
+	finally:
+		shutil.rmtree(workDir, True)
+	for kind, sizeKey in (("node", "attributes"), ("command", "flags")):
+		kindCases = [case for case in cases if case["kind"] == kind]
+		for case, exponent in zip(kindCases[1:], getScalingExponents(kindCases, sizeKey)):
+			case["scalingExponent"] = exponent
+	return cases
+
+## Print the results as a table
+# @param _cases The cases from runBenchmarks
+def report(_cases):
+	sys.stdout.write("\n%-50s" % "case")
+	for phase in phases:
+		sys.stdout.write(" %19s" % (phase + " s"))
+	sys.stdout.write(" %10s %12s %8s\n" % ("total s", "peak bytes", "scaling"))
+	for case in _cases:
+		sys.stdout.write("%-50s" % getCaseName(case))
+		for phase in phases:
+			sys.stdout.write(" %19.4f" % case["phases"][phase])
+		peakMemory = str(case["peakMemory"]) if case["peakMemory"] != None else "n/a"
+		exponent = case.get("scalingExponent")
+		sys.stdout.write(" %10.4f %12s %8s\n" % (case["total"], peakMemory, "%.2f" % exponent if exponent != None else "-"))
+
+## Compare the results with the results of a previous run
+# @param _cases The cases from runBenchmarks
+# @param _previousFile The JSON file written by a previous run
+# @param _threshold The ratio of the new to the old time above which a case counts as a regression
+# @return The number of cases that are slower by more than the threshold
+def compare(_cases, _previousFile, _threshold):
+	fileIn = open(_previousFile, "r")
+	try:
+		previous = dict((getCaseName(case), case) for case in json.load(fileIn)["cases"])
+	finally:
+		fileIn.close()
+	numRegressions = 0
+	sys.stdout.write("\nCompared with %s\n" % _previousFile)
+	for case in _cases:
+		oldCase = previous.get(getCaseName(case))
+		if oldCase == None or oldCase["total"] <= 0:
+			continue
+		ratio = case["total"] / oldCase["total"]
+		status = "REGRESSION" if ratio > _threshold else "ok"
+		if ratio > _threshold:
+			numRegressions += 1
+		sys.stdout.write("%-50s %10.4fs -> %10.4fs %7.2fx %s\n" % (getCaseName(case), oldCase["total"], case["total"], ratio, status))
+	return numRegressions
+
+## Convert a comma separated list of numbers
+# @param _text The text, e.g. "10,100,1000"
+# @return A list of ints
+def parseSizes(_text):
+	return [int(x) for x in _text.split(",") if x.strip()]
+
+# Main
+if __name__ == "__main__":
+	parser = argparse.ArgumentParser(description = "Measure how the generators scale with the size of the spec")
+	parser.add_argument("--nodeSizes", default = "10,100,1000,10000", help = "Numbers of attributes of the node specs (default: 10,100,1000,10000)")
+	parser.add_argument("--dependencies", type = int, default = 32, help = "Number of dependencies of each output (default: 32)")
+	parser.add_argument("--computeDispatch", default = "chain", choices = ["chain", "dictionary"], help = "The computeDispatch of the node specs (default: chain)")
+	parser.add_argument("--flagCounts", default = "10,100,500", help = "Numbers of flags of the command specs (default: 10,100,500)")
+	parser.add_argument("-r", "--repeats", type = int, default = 3, help = "Number of timed runs of each case, the best is kept (default: 3)")
+	parser.add_argument("--json", default = None, help = "Write the results to this JSON file")
+	parser.add_argument("--compare", default = None, help = "A JSON file from a previous run to compare with")
+	parser.add_argument("--threshold", type = float, default = 1.25, help = "Slowdown ratio that counts as a regression (default: 1.25)")
+	args = parser.parse_args()
+	cases = runBenchmarks(parseSizes(args.nodeSizes), args.dependencies, args.computeDispatch, parseSizes(args.flagCounts), args.repeats)
+	report(cases)
+	if args.json != None:
+		fileOut = open(args.json, "w")
+		try:
+			json.dump({"python" : sys.version.split()[0], "platform" : platform.platform(), "time" : time.strftime("%Y-%m-%dT%H:%M:%S"), "cases" : cases}, fileOut, indent = 1, sort_keys = True)
+		finally:
+			fileOut.close()
+	numRegressions = 0
+	if args.compare != None:
+		numRegressions = compare(cases, args.compare, args.threshold)
+	sys.exit(1 if numRegressions else 0)
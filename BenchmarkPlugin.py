@@ -0,0 +1,293 @@
+## BenchmarkPlugin.py
+# This file loads a generated plugin outside of Maya and times its compute, deform or doIt function
+# The plugin runs against the offline stand-in for maya.api.OpenMaya in the OfflineMaya directory,
+# so it measures the Python overhead of the generated code, not the cost of the dependency graph
+# Usage: python BenchmarkPlugin.py <plugin.py> [-n iterations] [--args "-r 2.0"] [--points P] [--elements E] [--targets T] [--json results.json]
+
+import argparse
+import gc
+import json
+import os
+import re
+import shlex
+import sys
+import time
+import types
+
+## The directory of the offline stand-in for the maya package
+offlineMayaDir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "OfflineMaya")
+
+## The best available timer
+timer = getattr(time, "perf_counter", time.time)
+
+## The placeholder lines where the user performs the computation, e.g. "# resultValue ="
+placeholderPattern = re.compile(r"^(\s*)# (\w+)Value =\s*$", re.MULTILINE)
+
+try:
+	import tracemalloc
+except ImportError:
+	# Python 2 has no tracemalloc, the allocations are not measured
+	tracemalloc = None
+
+## Import the stand-in OpenMaya modules, which have to be found before a real Maya install
+# @return A tuple of the OpenMaya and OpenMayaAnim modules
+def importOfflineMaya():
+	if offlineMayaDir not in sys.path:
+		sys.path.insert(0, offlineMayaDir)
+	import maya.api.OpenMaya as om
+	import maya.api.OpenMayaAnim as oma
+	if not os.path.abspath(om.__file__).startswith(offlineMayaDir):
+		raise ImportError("maya.api.OpenMaya was already imported from " + om.__file__)
+	return (om, oma)
+
+## Get the statistics of a list of timings
+# @param _times The time of each call in seconds
+# @return A dict with the percentiles, max and mean in microseconds
+def getLatencyStats(_times):
+	times = sorted(_times)
+	# The nearest rank percentile
+	def percentile(_percent):
+		return times[max(0, min(len(times) - 1, int(round(_percent / 100.0 * len(times) + 0.5)) - 1))]
+	return {
+		"p50" : percentile(50) * 1e6,
+		"p90" : percentile(90) * 1e6,
+		"p99" : percentile(99) * 1e6,
+		"max" : times[-1] * 1e6,
+		"mean" : sum(times) / len(times) * 1e6
+	}
+
+## Time a function
+# The allocations are measured in a separate pass, as tracing them slows every call down
+# @param _function The function to call, it takes no arguments
+# @param _iterations The number of calls to time
+# @param _setup A function called before each call and not timed, or None
+# @return A dict of the latency statistics and allocations
+def benchmark(_function, _iterations, _setup = None):
+	# Warm up, e.g. so a result cache is filled
+	if _setup != None:
+		_setup()
+	_function()
+	times = []
+	gcEnabled = gc.isenabled()
+	gc.disable()
+	try:
+		for i in range(_iterations):
+			if _setup != None:
+				_setup()
+			startTime = timer()
+			_function()
+			times.append(timer() - startTime)
+	finally:
+		if gcEnabled:
+			gc.enable()
+	result = getLatencyStats(times)
+	result["iterations"] = _iterations
+	result["allocations"] = measureAllocations(_function, _iterations, _setup)
+	return result
+
+## Measure the memory allocated by a function
+# @param _function The function to call
+# @param _iterations The number of calls
+# @param _setup A function called before each call and not measured, or None
+# @return A dict of the peak bytes allocated per call, the bytes still allocated after every call
+# and the change in the number of allocated blocks, or None if tracemalloc is not available
+def measureAllocations(_function, _iterations, _setup = None):
+	if tracemalloc == None:
+		return None
+	gc.collect()
+	blocksBefore = sys.getallocatedblocks()
+	tracemalloc.start()
+	try:
+		peak = 0
+		startSize = tracemalloc.get_traced_memory()[0]
+		for i in range(_iterations):
+			if _setup != None:
+				_setup()
+			callStart = tracemalloc.get_traced_memory()[0]
+			if hasattr(tracemalloc, "reset_peak"):
+				tracemalloc.reset_peak()
+			_function()
+			peak = max(peak, tracemalloc.get_traced_memory()[1] - callStart)
+		retained = tracemalloc.get_traced_memory()[0] - startSize
+	finally:
+		tracemalloc.stop()
+	gc.collect()
+	return {
+		"peakBytesPerCall" : peak,
+		"retainedBytes" : retained,
+		"allocatedBlocksDelta" : sys.getallocatedblocks() - blocksBefore
+	}
+
+## Load a generated plugin and call initializePlugin
+# The computation placeholders are filled with benchmark values so compute runs to the end
+# @param _fileName The generated plugin file
+# @return A tuple of the module and a dict of the placeholder names to whether they are NumPy values
+def loadPlugin(_fileName):
+	om, oma = importOfflineMaya()
+	fileIn = open(_fileName, "r")
+	try:
+		source = fileIn.read()
+	finally:
+		fileIn.close()
+	placeholders = {}
+	for match in placeholderPattern.finditer(source):
+		name = match.group(2)
+		placeholders[name] = (name + "Value.tolist()") in source
+	source = placeholderPattern.sub(lambda m: m.group(1) + m.group(2) + "Value = benchmarkValue(\"" + m.group(2) + "\")", source)
+	moduleName = os.path.splitext(os.path.basename(_fileName))[0]
+	module = types.ModuleType(moduleName)
+	module.__file__ = os.path.abspath(_fileName)
+	exec(compile(source, module.__file__, "exec"), module.__dict__)
+	module.initializePlugin(om.MObject())
+	return (module, placeholders)
+
+## Unload a plugin loaded with loadPlugin
+# @param _module The module of the plugin
+def unloadPlugin(_module):
+	om, oma = importOfflineMaya()
+	_module.uninitializePlugin(om.MObject())
+
+## Make the function that gives a value for each computation placeholder
+# @param _nodeClass The class of the node
+# @param _placeholders A dict of the placeholder names to whether they are NumPy values
+# @param _numElements The number of elements of arrays
+# @return The function, which takes the name of the output
+def makeBenchmarkValue(_nodeClass, _placeholders, _numElements):
+	om, oma = importOfflineMaya()
+	attributes = dict((x._data.longName, x) for x in om._getClassAttributes(_nodeClass))
+	values = {}
+	for name, isNumpy in _placeholders.items():
+		# The placeholders of the other nodes in a bundle
+		if name not in attributes:
+			continue
+		attribute = attributes[name]
+		if isNumpy:
+			import numpy as np
+			if attribute._data.dataType == om.MFnData.kMesh:
+				value = np.zeros((_numElements, 4), dtype = np.float64)
+			elif attribute._data.dataType == om.MFnData.kIntArray:
+				value = np.zeros(_numElements, dtype = np.int32)
+			else:
+				value = np.zeros(_numElements, dtype = np.float64)
+		else:
+			value = om._makeDefaultValue(attribute)
+			if attribute._data.dataType in (om.MFnData.kDoubleArray, om.MFnData.kIntArray):
+				value = list(value._data)
+		if attribute._data.array:
+			value = [value] * _numElements
+		values[name] = value
+	return values.__getitem__
+
+## Fill the input multi attributes of a node with elements
+# @param _node The node
+# @param _dataBlock The data block of the node
+# @param _numElements The number of elements in each multi attribute
+def fillArrayInputs(_node, _dataBlock, _numElements):
+	om, oma = importOfflineMaya()
+	for attribute in om._getClassAttributes(type(_node)):
+		if attribute._data.array and attribute._data.writable:
+			builder = om.MArrayDataBuilder(_dataBlock, attribute, _numElements)
+			for i in range(_numElements):
+				builder.addElement(i)
+			_dataBlock.inputArrayValue(attribute).set(builder)
+
+## Benchmark the nodes registered by a plugin
+# Each output attribute is computed separately, and a deformer is timed deforming one geometry
+# @param _module The module of the plugin
+# @param _placeholders A dict of the placeholder names to whether they are NumPy values
+# @param _options The parsed command line options
+# @return A dict of the results for each node and plug
+def benchmarkNodes(_module, _placeholders, _options):
+	om, oma = importOfflineMaya()
+	results = {}
+	for nodeName, (typeId, creator, initializer, nodeType) in sorted(om.MFnPlugin._registeredNodes.items()):
+		node = creator()
+		nodeClass = type(node)
+		_module.benchmarkValue = makeBenchmarkValue(nodeClass, _placeholders, _options.elements)
+		dataBlock = node._dataBlock()
+		fillArrayInputs(node, dataBlock, _options.elements)
+		if isinstance(node, oma.MPxGeometryFilter):
+			points = om._makeGridMesh(_options.points)._data.points
+			geoIter = om.MItGeometry(points)
+			matrix = om.MMatrix()
+			def deform():
+				node.deform(dataBlock, geoIter, matrix, 0)
+			results[nodeName + ".deform"] = benchmark(deform, _options.iterations)
+			results[nodeName + ".deform"]["points"] = len(points)
+			continue
+		for attribute in om._getClassAttributes(nodeClass):
+			if attribute._data.writable:
+				continue
+			plug = om.MPlug(node.thisMObject(), attribute)
+			def compute():
+				node.compute(plug, dataBlock)
+			results[nodeName + "." + attribute._data.longName] = benchmark(compute, _options.iterations)
+	return results
+
+## Benchmark the commands registered by a plugin
+# A new instance of the command is made for each call, as Maya does
+# @param _module The module of the plugin
+# @param _options The parsed command line options
+# @return A dict of the results for each command
+def benchmarkCommands(_module, _options):
+	om, oma = importOfflineMaya()
+	results = {}
+	# The objects the command operates on when it uses the selection
+	selection = om.MSelectionList()
+	for i in range(_options.targets):
+		selection.add(om._createNode("benchmarkNode" + str(i + 1)))
+	om.MGlobal.setActiveSelectionList(selection)
+	argList = om.MArgList(shlex.split(_options.args))
+	for commandName, (creator, syntaxCreator) in sorted(om.MFnPlugin._registeredCommands.items()):
+		state = {}
+		def makeCommand():
+			command = creator()
+			if syntaxCreator != None:
+				command._syntax = syntaxCreator()
+			state["command"] = command
+		def doIt():
+			state["command"].doIt(argList)
+		results[commandName + ".doIt"] = benchmark(doIt, _options.iterations, makeCommand)
+		makeCommand()
+		if state["command"].isUndoable():
+			def doAndSetup():
+				makeCommand()
+				doIt()
+			def undoIt():
+				state["command"].undoIt()
+			results[commandName + ".undoIt"] = benchmark(undoIt, _options.iterations, doAndSetup)
+	return results
+
+## Print the results as a table
+# @param _results The results from benchmarkNodes and benchmarkCommands
+def report(_results):
+	sys.stdout.write("%-40s %10s %10s %10s %10s %10s %12s\n" % ("function", "p50 us", "p90 us", "p99 us", "max us", "mean us", "peak bytes"))
+	for name, result in sorted(_results.items()):
+		allocations = result["allocations"]
+		peak = str(allocations["peakBytesPerCall"]) if allocations != None else "n/a"
+		sys.stdout.write("%-40s %10.2f %10.2f %10.2f %10.2f %10.2f %12s\n" % (name, result["p50"], result["p90"], result["p99"], result["max"], result["mean"], peak))
+
+# Main
+if __name__ == "__main__":
+	parser = argparse.ArgumentParser(description = "Time a generated plugin against the offline OpenMaya stand-in")
+	parser.add_argument("plugin", help = "The generated plugin file")
+	parser.add_argument("-n", "--iterations", type = int, default = 1000, help = "Number of calls to time (default: 1000)")
+	parser.add_argument("--args", default = "", help = "The arguments passed to doIt, e.g. \"-r 2.0\"")
+	parser.add_argument("--points", type = int, default = 1000, help = "Number of points in meshes, curves and deformed geometry (default: 1000)")
+	parser.add_argument("--elements", type = int, default = 10, help = "Number of elements in multi attributes and NumPy outputs (default: 10)")
+	parser.add_argument("--targets", type = int, default = 10, help = "Number of selected nodes for commands that use the selection (default: 10)")
+	parser.add_argument("--json", default = None, help = "Write the results to this JSON file")
+	args = parser.parse_args()
+	om, oma = importOfflineMaya()
+	om._defaultDataSize[0] = args.points
+	module, placeholders = loadPlugin(args.plugin)
+	results = benchmarkNodes(module, placeholders, args)
+	results.update(benchmarkCommands(module, args))
+	unloadPlugin(module)
+	report(results)
+	if args.json != None:
+		fileOut = open(args.json, "w")
+		try:
+			json.dump({"plugin" : args.plugin, "python" : sys.version.split()[0], "results" : results}, fileOut, indent = 1, sort_keys = True)
+		finally:
+			fileOut.close()
@@ -0,0 +1,132 @@
+## CodeTemplate.py
+# Templates for the generated code, compiled once per process
+# A template is the generated code with $name or ${name} fields, and $$ for a literal $
+# A field on a line of its own is a block field. Its value is a string of whole lines, each ending
+# in a newline, so an empty value removes the line rather than leaving a blank line behind
+# Each template is compiled into a str.format string, so rendering a block is one call
+
+import re
+import string
+
+## The tokens of a template, the braces are escaped for str.format
+tokenPattern = re.compile(r"^\$(?:(\w+)|\{(\w+)\})\n|\$\$|\$(\w+)|\$\{(\w+)\}|\{|\}", re.MULTILINE)
+
+## A block field on a line of its own
+blockFieldPattern = re.compile(r"^\$(?:\w+|\{\w+\})$")
+
+## The compiled format strings, by template text
+formatCache = {}
+
+## Compile the text of a template into a str.format string
+# The result is cached, so a template is only compiled once per process
+# @param _text The text of the template
+# @return A tuple of the format string and the names of the fields
+def compileTemplate(_text):
+	compiled = formatCache.get(_text)
+	if compiled == None:
+		fields = []
+		def replaceToken(_match):
+			token = _match.group(0)
+			if token == "{":
+				return "{{"
+			if token == "}":
+				return "}}"
+			if token == "$$":
+				return "$"
+			name = [x for x in _match.groups() if x][0]
+			if name not in fields:
+				fields.append(name)
+			return "{" + name + "}"
+		compiled = (tokenPattern.sub(replaceToken, _text), tuple(fields))
+		formatCache[_text] = compiled
+	return compiled
+
+## A compiled template
+class CodeTemplate(object):
+
+	## Constructor
+	# @param _text The text of the template
+	def __init__(self, _text):
+		self.m_text = _text
+		self.m_format, self.m_fields = compileTemplate(_text)
+		# The indented copies of the template, by the number of tabs
+		self.m_indented = {0 : self}
+		# The literal text and field name of each piece of the template, for renderChunks
+		self.m_pieces = None
+
+	## Get the template indented by a number of tabs
+	# Empty lines and block fields are not indented, a block value carries its own indentation
+	# The indented template is compiled the first time it is asked for
+	# @param _indent The indentation as a number of tabs
+	# @return The indented CodeTemplate
+	def indented(self, _indent):
+		template = self.m_indented.get(_indent)
+		if template == None:
+			lines = self.m_text.split("\n")
+			prefix = "\t" * _indent
+			text = "\n".join([line if not line or blockFieldPattern.match(line) else prefix + line for line in lines])
+			template = CodeTemplate(text)
+			self.m_indented[_indent] = template
+		return template
+
+	## Get the names of the fields
+	# @return A tuple of the field names
+	def fields(self):
+		return self.m_fields
+
+	## Render the template
+	# @param _values The value of each field
+	# @return The generated code
+	def render(self, **_values):
+		return self.m_format.format(**_values)
+
+	## Render the template once for each set of values, e.g. once per attribute
+	# @param _rows An iterable of dicts with the value of each field
+	# @return The generated code for every row
+	def renderAll(self, _rows):
+		format = self.m_format.format
+		return "".join([format(**row) for row in _rows])
+
+	## Render the template once for each set of values, as the rows are iterated
+	# @param _rows An iterable of dicts with the value of each field
+	# @return A generator of the generated code of each row
+	def renderEach(self, _rows):
+		format = self.m_format.format
+		for row in _rows:
+			yield format(**row)
+
+	## Render the template a piece at a time
+	# A field can be given an iterator of blocks of lines, e.g. from renderEach, which is only run as the pieces are
+	# iterated, so a section with many attributes is never held as one string
+	# @param _values The value of each field
+	# @return A generator of the pieces of the generated code
+	def renderChunks(self, **_values):
+		if self.m_pieces == None:
+			self.m_pieces = [(literal, name) for literal, name, formatSpec, conversion in string.Formatter().parse(self.m_format)]
+		for literal, name in self.m_pieces:
+			if literal:
+				yield literal
+			if name != None:
+				value = _values[name]
+				if isIterator(value):
+					for chunk in value:
+						yield chunk
+				else:
+					yield format(value)
+
+## Check if a value is an iterator, such as a generator, rather than a value to format
+# @param _value The value
+# @return True if the value is an iterator
+def isIterator(_value):
+	try:
+		return iter(_value) is _value
+	except TypeError:
+		return False
+
+## Make the value of a block field from lines of code
+# @param _lines The lines, without newlines
+# @param _indent The indentation for the lines as a number of tabs
+# @return The block, with a newline after each line
+def block(_lines, _indent = 0):
+	prefix = "\t" * _indent
+	return "".join([prefix + line + "\n" for line in _lines])
@@ -0,0 +1,210 @@
+## CreateBundle.py
+# This file creates one plugin file that registers many nodes, deformers and commands
+# A bundle spec lists the specs of its entries in the same way as a BatchCreator manifest, e.g.
+# {"filePath" : ..., "fileName" : ..., "fileDescription" : ..., "bundle" : ["myNode.json", {"path" : "myCommand.json", "type" : "command"}]}
+# Maya then loads one plugin and imports one module instead of one for every entry
+
+import json
+import os
+import re
+
+import CodeTemplate
+import CreateCommandPlugin
+import CreateDGNode
+import CreateDeformer
+import FileCreator
+
+#----------------------------------------------------------
+# Templates
+#----------------------------------------------------------
+
+## The list of the entries that registered
+registeredEntriesTemplate = CodeTemplate.CodeTemplate("""\
+# The names of the nodes and commands that registered, so only those are deregistered
+registeredEntries = []
+
+""")
+
+## The functions that load and unload the plugin
+initialiseUninitialiseTemplate = CodeTemplate.CodeTemplate("""\
+## Initialise the plugin when Maya loads it
+# Each entry is registered on its own, so one that fails does not stop the others from loading
+def initializePlugin(mobject):
+	mplugin = om.MFnPlugin(mobject)
+$registerEntries
+
+## Uninitialise the plugin when Maya unloads it
+# Every entry is deregistered even if one fails, then the failure is raised so Maya keeps the plugin loaded
+def uninitializePlugin(mobject):
+	mplugin = om.MFnPlugin(mobject)
+	failed = []
+$deregisterEntries
+	if failed:
+		raise RuntimeError("Failed to unregister: " + ", ".join(failed))
+""")
+
+## Registering one entry
+registerEntryTemplate = CodeTemplate.CodeTemplate("""\
+	try:
+		$register
+		registeredEntries.append($name)
+	except:
+		sys.stderr.write("Failed to register $kind: " + $name + "\\n" + traceback.format_exc())
+""")
+
+## Deregistering one entry
+deregisterEntryTemplate = CodeTemplate.CodeTemplate("""\
+	if $name in registeredEntries:
+		try:
+			$deregister
+			registeredEntries.remove($name)
+		except:
+			sys.stderr.write("Failed to unregister $kind: " + $name + "\\n" + traceback.format_exc())
+			failed.append($name)
+""")
+
+#----------------------------------------------------------
+# Creator
+#----------------------------------------------------------
+
+## The creator class to use for each type of entry
+entryCreators = {
+	"node" : CreateDGNode.DGNodeFileCreator,
+	"deformer" : CreateDeformer.DeformerFileCreator,
+	"command" : CreateCommandPlugin.PluginFileCreator
+}
+
+## The fileName of an entry starts its module-level names, so it must be an identifier
+identifierPattern = re.compile(r"^[A-Za-z_]\w*$")
+
+## Get the entries of a bundle spec
+# @param _jsonFile The loaded JSON of the bundle
+# @param _specDir The directory the entry paths are relative to
+# @return A list of (specType, specPath) tuples, where specType is None if it is to be detected
+def getEntrySpecs(_jsonFile, _specDir):
+	entries = []
+	for entry in _jsonFile.get("bundle") or []:
+		if not isinstance(entry, dict):
+			entry = {"path" : entry}
+		entries.append((entry.get("type"), os.path.join(_specDir, entry["path"])))
+	return entries
+
+## Class to create a plugin file that registers every entry of a bundle
+class BundleFileCreator(FileCreator.FileCreator):
+
+	## Constructor
+	# @param _fileName The JSON file describing the bundle, or a dict of the spec whose entry paths are relative to the working directory
+	# @param _write False to only generate the code in memory, see getText
+	# @param _bundle Must be None, a bundle cannot be an entry of another bundle
+	def __init__(self, _fileName = "BundlePluginData.json", _write = True, _bundle = None):
+		if _bundle != None:
+			raise ValueError("A bundle cannot be an entry of another bundle")
+		self.m_specDir = os.getcwd() if isinstance(_fileName, dict) else os.path.dirname(os.path.abspath(_fileName))
+		# The code shared by the entries, in the order it was first written
+		self.m_shared = []
+		FileCreator.FileCreator.__init__(self, _fileName)
+		self.writeSharedCode()
+		self.writeEntries()
+		self.writeInitialisation()
+		if _write:
+			self.writeFile()
+
+	## Generate the code of every entry
+	# An entry that fails stops the bundle, with the path of the entry in the error
+	def parseSpec(self):
+		# BatchCreator imports this module, so it is only imported once it is needed
+		import BatchCreator
+		self.m_entries = []
+		for specType, specPath in getEntrySpecs(self.m_jsonFile, self.m_specDir):
+			if specType == None:
+				specType = BatchCreator.getSpecType(specPath)
+			entryCreator = self.getEntryCreator(specType)
+			if entryCreator == None:
+				raise ValueError("Bundle entry " + specPath + ": an entry must be a node, deformer or command, not " + str(specType))
+			try:
+				self.m_entries.append(entryCreator(specPath, False, self))
+			except Exception as e:
+				raise ValueError("Bundle entry " + specPath + ": " + type(e).__name__ + ": " + str(e))
+		if not self.m_entries:
+			raise ValueError("A bundle needs at least one entry")
+		self.checkEntries()
+
+	## Get the creator class of a type of entry
+	# @param _specType "node", "deformer" or "command"
+	# @return The FileCreator subclass, or None if the type cannot be an entry
+	def getEntryCreator(self, _specType):
+		return entryCreators.get(_specType)
+
+	## Check that the entries do not clash with each other
+	def checkEntries(self):
+		seen = {}
+		for entry in self.m_entries:
+			kind = entry.getRegistration()["kind"]
+			values = [("fileName", entry.m_name), ("className", entry.getFromJSON("className", "string"))]
+			if kind == "node":
+				values.extend([("name", entry.getFromJSON("nodeName", "string")), ("nodeID", entry.getFromJSON("nodeID", "string").lower())])
+			else:
+				values.append(("name", entry.getFromJSON("functionName", "string")))
+			if not identifierPattern.match(entry.m_name):
+				raise ValueError("Bundle entry " + entry.m_name + ": the fileName must be a valid Python name")
+			for key, value in values:
+				if (key, value) in seen:
+					raise ValueError("Bundle entries " + seen[(key, value)] + " and " + entry.m_name + " have the same " + key + ": " + value)
+				seen[(key, value)] = entry.m_name
+
+	## Get the imports for the output file, every import of the entries once
+	# @return A list of import statements
+	def getImports(self):
+		imports = FileCreator.FileCreator.getImports(self)
+		for entry in self.m_entries:
+			imports.extend([x for x in entry.getImports() if x not in imports])
+		imports.append("import traceback")
+		return imports
+
+	## Keep code that the entries share, e.g. helper functions, to write it once
+	# @param _text The lines, each ending in a newline
+	def writeShared(self, _text):
+		if _text not in self.m_shared:
+			self.m_shared.append(_text)
+
+	## Write the code that the entries share
+	def writeSharedCode(self):
+		if self.m_shared:
+			self.writeSeparator("Shared")
+			for text in self.m_shared:
+				self.writeText(text)
+
+	## Write the code of every entry
+	def writeEntries(self):
+		for entry in self.m_entries:
+			self.writeText(entry.getText())
+
+	## Write the plugin initialisation functions
+	def writeInitialisation(self):
+		self.writeSeparator("Plugin Initialisation")
+		self.writeText(CreateDGNode.useNewAPITemplate.render())
+		self.writeText(registeredEntriesTemplate.render())
+		registrations = [entry.getRegistration() for entry in self.m_entries]
+		self.writeText(initialiseUninitialiseTemplate.render(registerEntries = registerEntryTemplate.renderAll(registrations),
+			deregisterEntries = deregisterEntryTemplate.renderAll(registrations)))
+
+	## Get the files that the output depends on, the bundle spec and the spec of every entry
+	# @param _specPath The JSON file of the bundle
+	# @return A list of the JSON files
+	@staticmethod
+	def getSpecFiles(_specPath):
+		try:
+			fileIn = open(_specPath, "r")
+			try:
+				jsonFile = json.load(fileIn)
+			finally:
+				fileIn.close()
+		except (IOError, ValueError):
+			return [_specPath]
+		if not isinstance(jsonFile, dict):
+			return [_specPath]
+		return [_specPath] + [specPath for specType, specPath in getEntrySpecs(jsonFile, os.path.dirname(os.path.abspath(_specPath)))]
+
+# Main
+if __name__ == "__main__":
+	BundleFileCreator()
@@ -1,73 +1,232 @@
 ## CreateCommandPlugin.py
 # This file creates boilerplate code for a command plugin
+# The code is rendered from the templates below, which are compiled once when the module is imported
 
+import CodeTemplate
 import FileCreator
 
+#----------------------------------------------------------
+# Templates
+#----------------------------------------------------------
+
+## The MSyntax argument type of each flag type
+syntaxTypes = {
+	"int" : "kLong",
+	"float" : "kDouble",
+	"double" : "kDouble",
+	"bool" : "kBoolean",
+	"MAngle" : "kAngle",
+	"MDistance" : "kDistance",
+	"MTime" : "kTime",
+	"string" : "kString"
+}
+
+## The command details
+pluginDetailsTemplate = CodeTemplate.CodeTemplate("""\
+# The name of the command
+${prefix}kPluginCmdName = "$functionName"
+
+""")
+
+## The names and types of the flags
+flagDetailsTemplate = CodeTemplate.CodeTemplate("""\
+# Flag details
+${prefix}shortFlagNames = [$shortFlagNames]
+${prefix}longFlagNames = [$longFlagNames]
+${prefix}flagTypes = [$flagTypes]
+
+""")
+
+## The class definition up to the end of the constructor
+classTemplate = CodeTemplate.CodeTemplate("""\
+## $classDescription
+class $className(om.MPxCommand):
+
+	## Constructor
+	def __init__(self):
+		om.MPxCommand.__init__(self)
+
+""")
+
+## The doIt, redoIt, undoIt and isUndoable functions of an undoable command
+undoableDoItTemplate = CodeTemplate.CodeTemplate("""\
+	## The doIt function
+	def doIt(self, args):
+$body
+
+	## The redo function
+	def redoIt(self):
+		$redo
+
+	## The undo function
+	def undoIt(self):
+		$undo
+
+	## This function is needed to make the command undoable
+	def isUndoable(self):
+		return True
+
+""")
+
+## The doIt function of a command that cannot be undone
+doItTemplate = CodeTemplate.CodeTemplate("""\
+	## The doIt function
+	def doIt(self, args):
+$body
+
+""")
+
+## The default value of a flag
+flagDefaultTemplate = CodeTemplate.CodeTemplate("""\
+		self.${name}Value = $defaultValue
+""")
+
+## The part of doIt that queues the operations into the modifier
+# The targets come from the objects passed to the command, or the selection if there are none
+modifierOperationsTemplate = CodeTemplate.CodeTemplate("""\
+		# Get the objects to operate on, the selection is used if none are given
+		self.targets = om.MArgDatabase(self.syntax(), args).getObjectList()
+		# Queue every operation into one modifier, so the command is done and undone in one step
+		self.modifier = om.$modifierType()
+		for i in range(self.targets.length()):
+			node = self.targets.getDependNode(i)
+			# Queue the operation for the node here, e.g.
+			# self.modifier.renameNode(node, "newName")
+""")
+
+## The parseArguments function
+parseArgumentsTemplate = CodeTemplate.CodeTemplate("""\
+## This function is used for parsing arguments
+	def parseArguments(self, args):
+		argData = om.MArgParser(self.syntax(), args)
+$flagStanzas
+
+""")
+
+## The parsing of one flag by its short and long name
+parseFlagTemplate = CodeTemplate.CodeTemplate("""\
+		if argData.isFlagSet("$shortName"):
+			self.${name}Value = argData.flagArgument${argumentType}("$shortName", 0)
+		if argData.isFlagSet("$longName"):
+			self.${name}Value = argData.flagArgument${argumentType}("$longName", 0)
+""")
+
+## The function that tells Maya the plugin uses API 2.0
+useNewAPITemplate = CodeTemplate.CodeTemplate("""\
+## This function tells Maya to use the Python API 2.0
+def maya_useNewAPI():
+	pass
+
+""")
+
+## The function to create the command
+initialisationTemplate = CodeTemplate.CodeTemplate("""\
+## Create an instance of the command
+def ${prefix}cmdCreator():
+	return $className()
+
+""")
+
+## The syntaxCreator function
+syntaxCreatorTemplate = CodeTemplate.CodeTemplate("""\
+## This defines argument and flag syntax for the command
+def ${prefix}syntaxCreator():
+	syntax = om.MSyntax()
+$objectType
+$flags
+	return syntax
+""")
+
+## The objects a command with a modifier operates on, the objects passed to it or the selection
+selectionListTemplate = CodeTemplate.CodeTemplate("""\
+	syntax.setObjectType(om.MSyntax.kSelectionList)
+	syntax.useSelectionAsDefault(True)
+""")
+
+## Adding a flag to the syntax
+addFlagTemplate = CodeTemplate.CodeTemplate("""\
+	syntax.addFlag(${prefix}shortFlagNames[$index], ${prefix}longFlagNames[$index], om.MSyntax.$syntaxType)
+""")
+
+## The functions that load and unload the plugin
+initialiseUninitialiseTemplate = CodeTemplate.CodeTemplate("""\
+## Initialise the plugin when Maya loads it
+def initializePlugin(mobject):
+	mplugin = om.MFnPlugin(mobject)
+	try:
+		mplugin.registerCommand($registerArguments)
+	except:
+		sys.stderr.write("Failed to register command: " + kPluginCmdName)
+		raise
+
+## Uninitialise the plugin when Maya unloads it
+def uninitializePlugin(mobject):
+	mplugin = om.MFnPlugin(mobject)
+	try:
+		mplugin.deregisterCommand(kPluginCmdName)
+	except:
+		sys.stderr.write("Failed to unregister command: " + kPluginCmdName)
+		raise
+""")
+
+#----------------------------------------------------------
+# Creator
+#----------------------------------------------------------
+
 ## Class to create Maya command plugin files
 class PluginFileCreator(FileCreator.FileCreator):
 
 	## Constructor
-	def __init__(self):
-		FileCreator.FileCreator.__init__(self, "CommandPluginData.json")
+	# @param _fileName The JSON file describing the command, or a dict of the spec
+	# @param _write False to only generate the code in memory, see getText
+	# @param _bundle The BundleFileCreator this command is an entry of, or None
+	def __init__(self, _fileName = "CommandPluginData.json", _write = True, _bundle = None):
+		FileCreator.FileCreator.__init__(self, _fileName, _bundle)
 		self.writePluginDetails()
 		self.writeClass()
 		self.writeInitialisation()
+		if _write:
+			self.writeFile()
+
+	## Read the undo settings from the JSON file
+	def parseSpec(self):
+		# "modifier" queues every operation into one MDGModifier/MDagModifier, "none" leaves redoIt and undoIt empty
+		self.undoMode = str(self.m_jsonFile.get("undoMode") or "none")
+		if self.undoMode not in ("none", "modifier"):
+			raise ValueError("undoMode must be none or modifier")
+		self.modifierType = str(self.m_jsonFile.get("modifierType") or "MDagModifier")
+		if self.modifierType not in ("MDGModifier", "MDagModifier"):
+			raise ValueError("modifierType must be MDGModifier or MDagModifier")
+		if self.undoMode == "modifier" and not self.getFromJSON("isUndoable", "bool"):
+			raise ValueError("A command with undoMode modifier must be undoable")
 
 	## Create a separator for the plugin and then write the plugin details
 	def writePluginDetails(self):
-		# Write a separator for the plugin
-		self.writeLine("#----------------------------------------------------------")
-		self.writeLine("# Plugin")
-		self.writeLine("#----------------------------------------------------------")
-		self.writeLine()
-		# write the plugin name
-		self.writeLine("# The name of the command")
-		kPluginCmdName = self.getFromJSON("functionName", "string")
-		self.writeLine("kPluginCmdName = " + "\"" + kPluginCmdName + "\"")
-		self.writeLine()
+		self.writeSeparator("Plugin")
+		self.writeText(pluginDetailsTemplate.render(prefix = self.m_prefix, functionName = self.getFromJSON("functionName", "string")))
+		# Write the profiler category for the doIt events
+		self.writeProfilerCategory(self.getFromJSON("functionName", "string"))
 		# Get the flags if necessary
 		if(self.getFromJSON("hasFlags", "bool")):
-			self.writeLine("# Flag details")
 			self.flags = self.getFromJSON("flags", "array")
 			# Split an array of dict into separate arrays
-			self.shortFlags = []
-			self.longFlags = []
-			self.flagTypes = []
-			self.defaultValues = []
-			# Create a string for the list
-			shortNames = "["
-			longNames = "["
-			flagTypesStr = "["
-			for flag in self.flags:
-				# Append to the separate arrays
-				self.shortFlags.append(flag["shortName"])
-				self.longFlags.append(flag["longName"])
-				self.flagTypes.append(flag["type"])
-				self.defaultValues.append(flag["defaultValue"])
-				# Append to the string
-				shortNames += "\"" + flag["shortName"] + "\","
-				longNames += "\"" + flag["longName"] + "\","
-				flagTypesStr += "\"" + flag["type"] + "\","
-			shortFlagNames = shortNames[:-1] + "]"
-			longFlagNames = longNames[:-1] + "]"
-			flagTypesString = flagTypesStr[:-1] + "]"
-			self.writeLine("shortFlagNames = " + shortFlagNames)
-			self.writeLine("longFlagNames = " + longFlagNames)
-			self.writeLine("flagTypes = " + flagTypesString)
-			self.writeLine()
+			self.shortFlags = [flag["shortName"] for flag in self.flags]
+			self.longFlags = [flag["longName"] for flag in self.flags]
+			self.flagTypes = [flag["type"] for flag in self.flags]
+			self.defaultValues = [flag["defaultValue"] for flag in self.flags]
+			self.writeText(flagDetailsTemplate.render(prefix = self.m_prefix, shortFlagNames = self.getListCode(self.shortFlags),
+				longFlagNames = self.getListCode(self.longFlags), flagTypes = self.getListCode(self.flagTypes)))
+
+	## Get the code for the items of a list of strings
+	# @param _strings The strings
+	# @return The quoted strings separated by commas
+	def getListCode(self, _strings):
+		return ",".join(["\"" + x + "\"" for x in _strings])
 
 	## Write the class definition
 	def writeClass(self):
-		cDescription = self.getFromJSON("classDescription", "string")
-		self.writeLine("## " + cDescription)
-		cName = self.getFromJSON("className", "string")
-		self.writeLine("class " + cName + "(om.MPxCommand):")
-		self.writeLine()
-		# Write the Constructor
-		self.writeLine("## Constructor", 1)
-		self.writeLine("def __init__(self):", 1)
-		self.writeLine("om.MPxCommand.__init__(self)", 2)
-		self.writeLine()
+		self.writeText(classTemplate.render(classDescription = self.getFromJSON("classDescription", "string"),
+			className = self.getFromJSON("className", "string")))
 		# Write the DoIt function
 		self.writeDoItFunction()
 		# Write the parseArguments function
@@ -75,140 +234,93 @@ class PluginFileCreator(FileCreator.FileCreator):
 
 	## Write the doIt class function
 	def writeDoItFunction(self):
-		# Declare the doIt function
-		self.writeLine("## The doIt function", 1)
-		self.writeLine("def doIt(self, args):", 1)
+		hasFlags = self.getFromJSON("hasFlags", "bool")
+		# A body timed with the profiler is indented inside a try statement
+		extraIndent = 1 if self.usesProfiler() else 0
+		indent = 2 + extraIndent
+		flagDefaults = ""
+		if hasFlags:
+			# Define the default values
+			flagDefaults = flagDefaultTemplate.indented(extraIndent).renderAll([{"name" : flag["longName"][1:], "defaultValue" : flag["defaultValue"]} for flag in self.flags])
 		# Check if the function is undoable
 		if(self.getFromJSON("isUndoable", "bool")):
-			# Write the doIt function
-			if(self.getFromJSON("hasFlags", "bool")):
-				# Define the default values
-				self.writeLine("# Initialise the default values", 2)
-				for flag in self.flags:
-					self.writeLine("self." + flag["longName"][1:] + "Value = " + str(flag["defaultValue"]), 2)
-				self.writeLine("# Parse the arguments", 2)
-				self.writeLine("self.parseArguments(args)", 2)
-			self.writeLine("self.redoIt()", 2)
-			self.writeLine()
-			self.writeReDoItFunction()
+			if hasFlags:
+				flagDefaults = CodeTemplate.block(["# Initialise the default values"], indent) + flagDefaults + CodeTemplate.block(["# Parse the arguments", "self.parseArguments(args)"], indent)
+			modifierOperations = ""
+			redo = "pass"
+			undo = "pass"
+			if self.undoMode == "modifier":
+				modifierOperations = modifierOperationsTemplate.indented(extraIndent).render(modifierType = self.modifierType)
+				redo = "self.modifier.doIt()"
+				undo = "self.modifier.undoIt()"
+			body = flagDefaults + modifierOperations + CodeTemplate.block(["self.redoIt()"], indent)
+			self.writeText(undoableDoItTemplate.render(body = self.getProfiledCode(body, "\"doIt\"", 2), redo = redo, undo = undo))
+		elif hasFlags:
+			body = CodeTemplate.block(["# Initialise the default values"], indent) + flagDefaults + CodeTemplate.block(["self.parseArguments(args)"], indent)
+			self.writeText(doItTemplate.render(body = self.getProfiledCode(body, "\"doIt\"", 2)))
 		else:
-			# Write the doIt function
-			if(self.getFromJSON("hasFlags", "bool")):
-				# Define the default values
-				self.writeLine("# Initialise the default values", 2)
-				for flag in flags:
-					self.writeLine("self." + flag["longName"][1:] + "Value = " + str(flag["defaultValue"]), 2)
-				self.writeLine("self.parseArguments(args)", 2)
-			else:
-				self.writeLine("pass", 2)
-		self.writeLine()
-
-	## Write the redoIt, undoIt and isUndoable class functions
-	def writeReDoItFunction(self):
-		# Write the redoIt function
-		self.writeLine("## The redo function", 1)
-		self.writeLine("def redoIt(self):", 1)
-		self.writeLine("pass", 2)
-		self.writeLine()
-		# Write the undoIt function
-		self.writeLine("## The undo function", 1)
-		self.writeLine("def undoIt(self):", 1)
-		self.writeLine("pass", 2)
-		self.writeLine()
-		# Write the isUndoable function
-		self.writeLine("## This function is needed to make the command undoable", 1)
-		self.writeLine("def isUndoable(self):", 1)
-		self.writeLine("return True", 2)
+			self.writeText(doItTemplate.render(body = self.getProfiledCode(CodeTemplate.block(["pass"], indent), "\"doIt\"", 2)))
 
 	## Write the parseArguments class function
 	def writeParseArgumentsFunction(self):
 		if(self.getFromJSON("hasFlags", "bool")):
-			self.writeLine("## This function is used for parsing arguments")
-			self.writeLine("def parseArguments(self, args):", 1)
-			self.writeLine("argData = om.MArgParser(self.syntax(), args)", 2)
-			numArgs = len(self.shortFlags)
-			for i in range(numArgs):
-				typeCheck = self.flagTypes[i][0].upper() + self.flagTypes[i][1:]
-				# Check for short flag
-				self.writeLine("if argData.isFlagSet(\"" + self.shortFlags[i] + "\"):", 2)
-				self.writeLine("self." + self.longFlags[i][1:] + "Value = argData.flagArgument" + typeCheck + "(\"" + self.shortFlags[i] + "\", 0)", 3)
-				self.writeLine("if argData.isFlagSet(\"" + self.longFlags[i] + "\"):", 2)
-				self.writeLine("self." + self.longFlags[i][1:] + "Value = argData.flagArgument" + typeCheck + "(\"" + self.longFlags[i] + "\", 0)", 3)
-			self.writeLine()
+			flagStanzas = parseFlagTemplate.renderAll([{"shortName" : flag["shortName"], "longName" : flag["longName"], "name" : flag["longName"][1:],
+				"argumentType" : flag["type"][0].upper() + flag["type"][1:]} for flag in self.flags])
+			self.writeText(parseArgumentsTemplate.render(flagStanzas = flagStanzas))
 
 	## Write the plugin initialisation functions
 	def writeInitialisation(self):
 		# Write a separator for the plugin initialisation
-		self.writeLine("#----------------------------------------------------------")
-		self.writeLine("# Plugin Initialisation")
-		self.writeLine("#----------------------------------------------------------")
-		self.writeLine()
-		# Function to use API 2.0
-		self.writeLine("## This function tells Maya to use the Python API 2.0")
-		self.writeLine("def maya_useNewAPI():")
-		self.writeLine("pass", 1)
-		self.writeLine("")
-		# cmds creator function
-		self.writeLine("## Create an instance of the command")
-		self.writeLine("def cmdCreator():")
-		cName = self.getFromJSON("className", "string")
-		self.writeLine("return " + cName + "()", 1)
-		self.writeLine()
+		self.writeSeparator("Plugin Initialisation")
+		# Write the function to use API 2.0, a bundle writes it once for every entry
+		if self.m_bundle == None:
+			self.writeText(useNewAPITemplate.render())
+		# Write the function to create the command
+		self.writeText(initialisationTemplate.render(prefix = self.m_prefix, className = self.getFromJSON("className", "string")))
 		# Write the function syntaxCreator
 		self.writeSyntaxCreatorFunction()
-		# Write the functions initializePlugin and uninitializePlugin
-		self.writeInitialiseUninitialiseFunctions()
+		# Write the functions initializePlugin and uninitializePlugin, a bundle registers its entries itself
+		if self.m_bundle == None:
+			self.writeInitialiseUninitialiseFunctions()
+
+	## Check if the command needs a syntaxCreator function
+	# @return True if the command has flags or operates on objects
+	def hasSyntax(self):
+		return self.getFromJSON("hasFlags", "bool") or self.undoMode == "modifier"
 
 	## Write the syntaxCreator function
 	def writeSyntaxCreatorFunction(self):
-		if(self.getFromJSON("hasFlags", "bool")):
-			self.writeLine("## This defines argument and flag syntax for the command")
-			self.writeLine("def syntaxCreator():")
-			self.writeLine("syntax = om.MSyntax()", 1)
-			numFlags = len(self.shortFlags)
-			for i in range(numFlags):
-				# Check the type of variable
-				flagType = self.flagTypes[i]
-				if (flagType == "int") or (flagType == "float") or (flagType == "double"):
-					syntaxType = "kDouble"
-				elif (flagType == "bool"):
-					syntaxType = "kBoolean"
-				elif (flagType == "MAngle"):
-					syntaxType = "kAngle"
-				elif (flagType == "MDistance"):
-					syntaxType = "kDistance"
-				elif (flagType == "MTime"):
-					syntaxType = "kTime"
-				elif (flagType == "string"):
-					syntaxType = "kString"
-				self.writeLine("syntax.addFlag(shortFlagNames[%i], longFlagNames[%i], om.MSyntax.%s)" % (i, i, syntaxType), 1)
-			self.writeLine("return syntax", 1)
+		if self.hasSyntax():
+			flags = []
+			if self.getFromJSON("hasFlags", "bool"):
+				for i, flagType in enumerate(self.flagTypes):
+					if flagType not in syntaxTypes:
+						raise ValueError(self.longFlags[i] + ": flags of type " + flagType + " are not supported by MSyntax")
+					flags.append({"prefix" : self.m_prefix, "index" : i, "syntaxType" : syntaxTypes[flagType]})
+			objectType = selectionListTemplate.render() if self.undoMode == "modifier" else ""
+			self.writeText(syntaxCreatorTemplate.render(prefix = self.m_prefix, objectType = objectType, flags = addFlagTemplate.renderAll(flags)))
 		self.writeLine()
 
+	## Get the arguments for registerCommand
+	# @return The code for the arguments
+	def getRegisterCommandArguments(self):
+		names = ["kPluginCmdName", "cmdCreator", "syntaxCreator"] if self.hasSyntax() else ["kPluginCmdName", "cmdCreator"]
+		return ", ".join([self.m_prefix + x for x in names])
+
+	## Get how a bundle registers and deregisters the command
+	# @return A dict of the kind of entry, the code for its name and the code to register and deregister it
+	def getRegistration(self):
+		return {
+			"kind" : "command",
+			"name" : self.m_prefix + "kPluginCmdName",
+			"register" : "mplugin.registerCommand(" + self.getRegisterCommandArguments() + ")",
+			"deregister" : "mplugin.deregisterCommand(" + self.m_prefix + "kPluginCmdName)"
+		}
+
 	## Write the functions for initializePlugin and uninitializePlugin
 	def writeInitialiseUninitialiseFunctions(self):
-		# Write the function for initializePlugin
-		self.writeLine("## Initialise the plugin when Maya loads it")
-		self.writeLine("def initializePlugin(mobject):")
-		self.writeLine("mplugin = om.MFnPlugin(mobject)", 1)
-		self.writeLine("try:", 1)
-		if(self.getFromJSON("hasFlags", "bool")):
-			self.writeLine("mplugin.registerCommand(kPluginCmdName, cmdCreator, syntaxCreator)", 2)
-		else:
-			self.writeLine("mplugin.registerCommand(kPluginCmdName, cmdCreator)", 2)
-		self.writeLine("except:", 1)
-		self.writeLine("sys.stderr.write(\"Failed to register command: \" + kPluginCmdName)", 2)
-		self.writeLine("raise", 2)
-		self.writeLine()
-		# Write the function for uninitializePlugin
-		self.writeLine("## Uninitialise the plugin when Maya unloads it")
-		self.writeLine("def uninitializePlugin(mobject):")
-		self.writeLine("mplugin = om.MFnPlugin(mobject)", 1)
-		self.writeLine("try:", 1)
-		self.writeLine("mplugin.deregisterCommand(kPluginCmdName)", 2)
-		self.writeLine("except:", 1)
-		self.writeLine("sys.stderr.write(\"Failed to unregister command: \" + kPluginCmdName)", 2)
-		self.writeLine("raise", 2)
+		self.writeText(initialiseUninitialiseTemplate.render(registerArguments = self.getRegisterCommandArguments()))
 
 # Main
-PluginFileCreator()
+if __name__ == "__main__":
+	PluginFileCreator()
@@ -1,250 +1,862 @@
 ## CreateDGNode.py
 # This files creates the boilerplate code for a Dependency Graph Node
+# The code is rendered from the templates below, which are compiled once when the module is imported
+# The class and the node initialiser are generated as they are written, so a spec with many attributes can be streamed
 
+import itertools
+import os
+
+import CodeTemplate
+import DGNodeSpec
 import FileCreator
+import JSONStream
+
+## Specs of at least this many bytes are streamed rather than loaded, see DGNodeSpec.StreamingNodeSpec
+streamingThreshold = 4 * 1024 * 1024
+
+## The arrays of a spec that are streamed
+streamedKeys = ("inputAttributes", "outputAttributes")
+
+#----------------------------------------------------------
+# Templates
+#----------------------------------------------------------
+
+## The node details
+pluginDetailsTemplate = CodeTemplate.CodeTemplate("""\
+# Node info
+${prefix}kPluginNodeName = "$nodeName"
+${prefix}kPluginNodeID = om.MTypeId($nodeID)
+
+# Default attribute values
+$defaultValues
+
+""")
+
+## The default value of an input attribute
+defaultValueTemplate = CodeTemplate.CodeTemplate("""\
+${prefix}${longName}DefaultValue = $defaultValue
+""")
+
+## The functions that read and write every element of a multi attribute
+arrayFunctionsTemplate = CodeTemplate.CodeTemplate("""\
+## Read every element of an array attribute in one pass
+# @param _arrayHandle The MArrayDataHandle of the attribute
+# @param _getter The function that gets the value from an element MDataHandle, e.g. om.MDataHandle.asFloat
+# @return A list of the element values
+def readArray(_arrayHandle, _getter):
+	values = []
+	for i in range(len(_arrayHandle)):
+		_arrayHandle.jumpToPhysicalElement(i)
+		values.append(_getter(_arrayHandle.inputValue()))
+	return values
+
+## Write every element of an array attribute
+# The array is built once at its final size rather than growing an element at a time
+# @param _dataBlock The data block of the node
+# @param _attribute The array attribute
+# @param _arrayHandle The MArrayDataHandle of the attribute
+# @param _setter The function that sets the value on an element MDataHandle, e.g. om.MDataHandle.setFloat
+# @param _values The element values
+def writeArray(_dataBlock, _attribute, _arrayHandle, _setter, _values):
+	builder = om.MArrayDataBuilder(_dataBlock, _attribute, len(_values))
+	for i, value in enumerate(_values):
+		_setter(builder.addElement(i), value)
+	_arrayHandle.set(builder)
+
+""")
+
+## The fingerprint functions and the result cache class
+cacheFunctionsTemplate = CodeTemplate.CodeTemplate("""\
+## The types of value that are fingerprinted by their repr
+try:
+	plainTypes = (bool, int, long, float, str, unicode)
+except NameError:
+	plainTypes = (bool, int, float, str)
+
+## Get the topology of a mesh, the number of vertices of each face and the vertices of the faces
+# @param _object The MObject of the mesh
+# @return A tuple of the two NumPy arrays
+def getMeshTopology(_object):
+	counts, vertices = om.MFnMesh(_object).getVertices()
+	return (np.array(counts, dtype = np.int32), np.array(vertices, dtype = np.int32))
+
+## Get the contents of a data object such as a mesh, so it can be fingerprinted
+# @param _object The MObject of the data
+# @return A tuple of NumPy arrays that describe the data, or None if the type of data is not supported
+def getDataContents(_object):
+	if _object.hasFn(om.MFn.kMesh):
+		return (np.array(om.MFnMesh(_object).getPoints(), dtype = np.float64),) + getMeshTopology(_object)
+	if _object.hasFn(om.MFn.kNurbsCurve):
+		curveFn = om.MFnNurbsCurve(_object)
+		return (np.array(curveFn.cvPositions(), dtype = np.float64), np.array(curveFn.knots(), dtype = np.float64))
+	if _object.hasFn(om.MFn.kNurbsSurface):
+		surfaceFn = om.MFnNurbsSurface(_object)
+		return (np.array(surfaceFn.cvPositions(), dtype = np.float64), np.array(surfaceFn.knotsInU(), dtype = np.float64),
+			np.array(surfaceFn.knotsInV(), dtype = np.float64))
+	return None
+
+## Add a value to a fingerprint
+# Numbers, strings, NumPy arrays, meshes, curves, surfaces and lists and tuples of these are supported
+# @param _sha The hash to update
+# @param _value The value
+# @return True if the value was added, False if it cannot be fingerprinted
+def addToFingerprint(_sha, _value):
+	if isinstance(_value, plainTypes):
+		_sha.update(repr(_value).encode("utf-8"))
+	elif isinstance(_value, (list, tuple)):
+		_sha.update(b"(")
+		for item in _value:
+			if not addToFingerprint(_sha, item):
+				return False
+		_sha.update(b")")
+	elif isinstance(_value, (om.MDoubleArray, om.MIntArray)):
+		return addToFingerprint(_sha, np.array(_value))
+	elif isinstance(_value, np.ndarray):
+		_sha.update(repr((_value.shape, _value.dtype.str)).encode("utf-8"))
+		_sha.update(np.ascontiguousarray(_value).tobytes())
+	elif isinstance(_value, om.MObject):
+		contents = getDataContents(_value)
+		if contents is None:
+			return False
+		return addToFingerprint(_sha, contents)
+	else:
+		return False
+	_sha.update(b"|")
+	return True
+
+## Make a fingerprint of the input values of a computation
+# @param _values The input values
+# @return A digest that changes when any of the values change, or None if a value cannot be fingerprinted
+def fingerprint(_values):
+	sha = hashlib.sha1()
+	for value in _values:
+		if not addToFingerprint(sha, value):
+			return None
+	return sha.digest()
+
+## A cache of computed results, which forgets the least recently used result when it is full
+# The cache holds a number of results rather than a number of bytes, so its memory use grows with the size of
+# each result, e.g. a cache of 4 meshes keeps 4 copies of the mesh
+class ResultCache(object):
+
+	## Constructor
+	# @param _maxEntries The number of results to keep, whatever their size
+	def __init__(self, _maxEntries):
+		self.m_maxEntries = _maxEntries
+		self.m_entries = collections.OrderedDict()
+
+	## Get a result
+	# @param _key The fingerprint of the inputs
+	# @return The result, or None if it is not in the cache
+	def get(self, _key):
+		result = self.m_entries.pop(_key, None)
+		if result is not None:
+			# Move the result to the most recently used end
+			self.m_entries[_key] = result
+		return result
+
+	## Store a result
+	# @param _key The fingerprint of the inputs, results without a fingerprint are not stored
+	# @param _result The result
+	def put(self, _key, _result):
+		if _key is None:
+			return
+		self.m_entries[_key] = _result
+		while len(self.m_entries) > self.m_maxEntries:
+			self.m_entries.popitem(last = False)
+
+""")
+
+## The class definition up to the end of the constructor
+classTemplate = CodeTemplate.CodeTemplate("""\
+## $classDescription
+class $className($baseClass):
+	# Define the attributes
+$attributeDeclarations
+
+	def __init__(self):
+		$baseClass.__init__(self)
+$resultCaches
+
+""")
+
+## The declaration of an attribute on the node class
+attributeDeclarationTemplate = CodeTemplate.CodeTemplate("""\
+	$variableName = om.MObject()
+""")
+
+## The result cache of a group of outputs
+resultCacheTemplate = CodeTemplate.CodeTemplate("""\
+		# The last $cache results of $outputNames
+		self.${longName}Cache = ResultCache($cache)
+""")
+
+## The scheduling type for the Evaluation Manager
+schedulingTypeTemplate = CodeTemplate.CodeTemplate("""\
+	## Tell the Evaluation Manager how the node can be scheduled
+	def schedulingType(self):
+		return om.MPxNode.$schedulingType
+
+""")
+
+## The functions that store the outputs in the evaluation cache
+evaluationCacheTemplate = CodeTemplate.CodeTemplate("""\
+	## Ask for the node to be stored in the evaluation cache
+	def getCacheSetup(self, _evaluationNode, _disablingInfo, _cacheSetupInfo, _monitoredAttributes):
+		$baseClass.getCacheSetup(self, _evaluationNode, _disablingInfo, _cacheSetupInfo, _monitoredAttributes)
+		_cacheSetupInfo.setPreference(om.MNodeCacheSetupInfo.kWantToCacheByDefault, True)
+
+	## Add the output attributes to the evaluation cache
+	def configCache(self, _evaluationNode, _schema):
+		$baseClass.configCache(self, _evaluationNode, _schema)
+$cachedAttributes
+
+""")
+
+## An attribute stored in the evaluation cache
+cachedAttributeTemplate = CodeTemplate.CodeTemplate("""\
+		_schema.add($attribute)
+""")
+
+## The start of the compute function
+computeTemplate = CodeTemplate.CodeTemplate("""\
+	## The function that is called when the node is dirty
+	# @param _plug A plug for one of the i/o attributes
+	# @param _dataBlock The data used for the computations
+	def compute(self, _plug, _dataBlock):
+""")
+
+## The branch of a compute function with one if statement per output
+computeBranchTemplate = CodeTemplate.CodeTemplate("""\
+		# Check if the plug is the $longName attribute
+		if ($plugCondition):
+$body
+""")
+
+## The body of a branch of the compute function, rendered at the indentation of the branch
+computeBranchBodyTemplate = CodeTemplate.CodeTemplate("""\
+# Get handles for the attributes
+$inputHandles
+${longName}DataHandle = $outputHandle
+
+# Get values for the attributes
+$inputValues
+
+$computation
+
+# Set the output value
+$setOutputValue
+
+# Mark the output data handle as clean
+$setClean
+""")
+
+## A compute function that looks up a handler for the plug in a dictionary
+dispatchComputeTemplate = CodeTemplate.CodeTemplate("""\
+		# Find the handler for the plug, Maya handles any other plug
+		handler = $className.computeHandlers.get(om.MFnAttribute(_plug.attribute()).name)
+		if handler is None:
+			return None
+$callHandler
+
+""")
+
+## The handler for a group of outputs
+computeHandlerTemplate = CodeTemplate.CodeTemplate("""\
+	## Compute the $outputNames
+	# @param _dataBlock The data used for the computations
+	def $handlerName(self, _dataBlock):
+		# Get values for the input attributes
+$inputValues
+		# Get handles for the output attributes
+$outputHandles
+
+$computation
+
+		# Set the output values and mark the output data handles as clean
+$setOutputValues
+
+""")
+
+## The dispatch table from the output attributes to their handlers
+computeHandlersTemplate = CodeTemplate.CodeTemplate("""\
+	## The handler for each output attribute
+	computeHandlers = {
+$handlers
+	}
+
+""")
+
+## An entry in the dispatch table
+computeHandlerEntryTemplate = CodeTemplate.CodeTemplate("""\
+		"$longName" : $handlerName,
+""")
+
+## A data handle of an attribute
+handleTemplate = CodeTemplate.CodeTemplate("""\
+${longName}DataHandle = $handle
+""")
+
+## The value of an input attribute
+valueTemplate = CodeTemplate.CodeTemplate("""\
+${longName}Value = $value
+""")
+
+## The computation of a group of outputs using the result cache
+cachedComputationTemplate = CodeTemplate.CodeTemplate("""\
+# Use the cached result if the inputs have not changed
+cacheKey = fingerprint($inputValues)
+cachedResult = $cacheName.get(cacheKey)
+if cachedResult is None:
+$computation
+	cachedResult = $outputValues
+	$cacheName.put(cacheKey, cachedResult)
+$outputValues = cachedResult
+""")
+
+## The comments where the user performs the computation
+computationStubTemplate = CodeTemplate.CodeTemplate("""\
+# Perform the desired computation here
+$numpyComment
+$placeholders
+""")
+
+## The comment for a computation that uses NumPy
+numpyCommentTemplate = CodeTemplate.CodeTemplate("""\
+# Use whole-array NumPy operations rather than looping over the elements in Python
+""")
+
+## The placeholder where the user sets the value of an output
+placeholderTemplate = CodeTemplate.CodeTemplate("""\
+# ${longName}Value =
+""")
+
+## Setting a NumPy mesh output by copying the input mesh and replacing its points
+meshOutputTemplate = CodeTemplate.CodeTemplate("""\
+${longName}Data = om.MFnMeshData().create()
+${longName}Fn = om.MFnMesh()
+${longName}Fn.copy(_dataBlock.inputValue($className.$sourceVariable).asMesh(), ${longName}Data)
+${longName}Fn.setPoints(om.MPointArray(${longName}Value.tolist()), om.MSpace.kObject)
+${longName}DataHandle.setMObject(${longName}Data)
+""")
+
+## The function that tells Maya the plugin uses API 2.0
+useNewAPITemplate = CodeTemplate.CodeTemplate("""\
+## This function tells Maya to use the Python API 2.0
+def maya_useNewAPI():
+	pass
+
+""")
+
+## The functions before the node initialiser
+initialisationTemplate = CodeTemplate.CodeTemplate("""\
+## Create an instance of the node
+def ${prefix}nodeCreator():
+	return $className()
+
+## Initialise the node attributes
+def ${prefix}nodeInitializer():
+""")
+
+## The attribute function sets
+numericFnTemplate = CodeTemplate.CodeTemplate("""\
+	# Create a numeric attribute function set
+	mFnNumericAttribute = om.MFnNumericAttribute()
+""")
+typedFnTemplate = CodeTemplate.CodeTemplate("""\
+	# Create a non-numeric attribute function set
+	mFnTypedAttribute = om.MFnTypedAttribute()
+""")
+
+## The creation of an input attribute
+inputAttributeTemplate = CodeTemplate.CodeTemplate("""\
+	$className.$variableName = mFn${fnType}Attribute.create("$longName", "$shortName", om.MFn${dataFn}Data.$dataTypeName$defaultArgument)
+	mFn${fnType}Attribute.readable = False
+	mFn${fnType}Attribute.writable = True
+	mFn${fnType}Attribute.storable = True
+$array
+	mFn${fnType}Attribute.keyable = $keyable
+$minValue
+$maxValue
+
+""")
+
+## The creation of an output attribute
+outputAttributeTemplate = CodeTemplate.CodeTemplate("""\
+	$className.$variableName = mFn${fnType}Attribute.create("$longName", "$shortName", om.MFn${dataFn}Data.$dataTypeName)
+	mFn${fnType}Attribute.readable = True
+	mFn${fnType}Attribute.writable = False
+	mFn${fnType}Attribute.storable = False
+$array
+
+""")
+
+## An option of an attribute that is only set for some attributes
+attributeOptionTemplate = CodeTemplate.CodeTemplate("""\
+	mFn${fnType}Attribute.$option = $value
+""")
+
+## Adding an attribute to the node class
+addAttributeTemplate = CodeTemplate.CodeTemplate("""\
+	$className.addAttribute($className.$variableName)
+""")
+
+## Making an output depend on an input
+attributeAffectsTemplate = CodeTemplate.CodeTemplate("""\
+	$className.attributeAffects($className.$inputVariable, $outputAttribute)
+""")
+
+## The functions that load and unload the plugin
+initialiseUninitialiseTemplate = CodeTemplate.CodeTemplate("""\
+## Initialise the plugin when Maya loads it
+def initializePlugin(mobject):
+	mplugin = om.MFnPlugin(mobject)
+	try:
+		mplugin.registerNode($registerArguments)
+	except:
+		sys.stderr.write("Failed to register node: " + kPluginNodeName)
+		raise
+
+## Uninitialise the plugin when Maya unloads it
+def uninitializePlugin(mobject):
+	mplugin = om.MFnPlugin(mobject)
+	try:
+		mplugin.deregisterNode(kPluginNodeID)
+	except:
+		sys.stderr.write("Failed to unregister node: " + kPluginNodeName)
+		raise
+
+""")
+
+#----------------------------------------------------------
+# Creator
+#----------------------------------------------------------
 
 ## Class to create Maya DG node plugin files
 class DGNodeFileCreator(FileCreator.FileCreator):
 
 	## Constructor
-	def __init__(self):
-		FileCreator.FileCreator.__init__(self, "DGNodePluginData.json")
+	# @param _fileName The JSON file describing the node, or a dict of the spec
+	# @param _write False to only generate the code in memory, see getText
+	# @param _bundle The BundleFileCreator this node is an entry of, or None
+	def __init__(self, _fileName = "DGNodePluginData.json", _write = True, _bundle = None):
+		FileCreator.FileCreator.__init__(self, _fileName, _bundle)
 		self.writePluginDetails()
 		self.writeClass()
 		self.writeInitialisation()
+		if _write:
+			self.writeFile()
+
+	## Load the JSON file, or only the members that are not attributes if it is large
+	# The attributes of a large file are read by the node description as they are needed
+	# @param _fileName The JSON file to load, or a dict of the spec that is already loaded
+	# @return The dict of the spec
+	def loadJSON(self, _fileName):
+		self.m_reader = None
+		if not isinstance(_fileName, dict) and os.path.isfile(_fileName) and os.path.getsize(_fileName) >= streamingThreshold:
+			self.m_reader = JSONStream.JSONStreamReader(_fileName, streamedKeys)
+			return self.m_reader.getMembers()
+		return FileCreator.FileCreator.loadJSON(self, _fileName)
+
+	## Parse the JSON file into the node description
+	def parseSpec(self):
+		if self.m_reader != None:
+			self.m_spec = DGNodeSpec.StreamingNodeSpec(self.m_jsonFile, self.m_reader)
+		else:
+			self.m_spec = DGNodeSpec.NodeSpec(self.m_jsonFile)
+
+	## Check if the sections of the output file are generated as it is written
+	# A bundle joins the code of its entries, so only a plugin file of its own is streamed
+	# @return True if the spec is streamed
+	def isStreamed(self):
+		return self.m_reader != None and self.m_bundle == None
+
+	## Get the imports for the output file, adding NumPy if any attribute uses it
+	# @return A list of import statements
+	def getImports(self):
+		imports = FileCreator.FileCreator.getImports(self)
+		if self.m_spec.usesCache:
+			imports.extend(["import collections", "import hashlib"])
+		# The result cache fingerprints the inputs with NumPy
+		if self.m_spec.usesNumpy or self.m_spec.usesCache:
+			imports.append("import numpy as np")
+		return imports
 
 	## Create a separator for the plugin and then write the node details
 	def writePluginDetails(self):
-		# Write a separator for the plugin
-		self.writeLine("#----------------------------------------------------------")
-		self.writeLine("# Plugin")
-		self.writeLine("#----------------------------------------------------------")
-		self.writeLine()
-		# write the plugin name
-		self.writeLine("# Node info")
-		kPluginNodeName = self.getFromJSON("nodeName", "string")
-		self.writeLine("kPluginNodeName = " + "\"" + kPluginNodeName + "\"")
-		kPluginNodeID = self.getFromJSON("nodeID", "string")
-		self.writeLine("kPluginNodeID = om.MTypeId(" + kPluginNodeID + ")")
-		self.writeLine()
+		self.writeSeparator("Plugin")
 		# write the default attribute values if it is not None, i.e. it is defined
-		self.writeLine("# Default attribute values")
-		self.inputAttributes = self.getFromJSON("inputAttributes", "array")
-		for attr in self.inputAttributes:
-			if (attr["defaultValue"] != None):
-				variableName = attr["longName"] + "DefaultValue"
-				variableValue = attr["defaultValue"]
-				self.writeLine(variableName + " = " + str(variableValue))
-		self.writeLine()
+		defaultValues = defaultValueTemplate.renderAll([{"prefix" : self.m_prefix, "longName" : attr.longName, "defaultValue" : attr.defaultValue}
+			for attr in self.m_spec.inputAttributes if attr.defaultValue != None])
+		self.writeText(pluginDetailsTemplate.render(prefix = self.m_prefix, nodeName = self.getFromJSON("nodeName", "string"),
+			nodeID = self.getFromJSON("nodeID", "string"), defaultValues = defaultValues))
+		# write the profiler category for the compute events
+		self.writeProfilerCategory(self.getFromJSON("nodeName", "string"))
+		# write the functions for reading and writing multi attributes
+		if self.m_spec.usesArrays:
+			self.writeShared(arrayFunctionsTemplate.render())
+		# write the result cache for outputs that remember their results
+		if self.m_spec.usesCache:
+			self.writeShared(cacheFunctionsTemplate.render())
 
 	## Write the class definition
 	def writeClass(self):
-		cDescription = self.getFromJSON("classDescription", "string")
-		self.writeLine("## " + cDescription)
-		cName = self.getFromJSON("className", "string")
-		self.writeLine("class " + cName + "(om.MPxNode):")
-		self.writeLine("# Define the attributes", 1)
-		# Write all the input attributes first with the prefix in
-		for attr in self.inputAttributes:
-			variableName = "in" + self.capitalise(attr["longName"])
-			self.writeLine(variableName + " = om.MObject()", 1)
-		# Write all the output attributes with the prefix out
-		self.outputAttributes = self.getFromJSON("outputAttributes", "array")
-		for attr in self.outputAttributes:
-			variableName = "out" + self.capitalise(attr["longName"])
-			self.writeLine(variableName + " = om.MObject()", 1)
-		self.writeLine()
-		# write the init function
-		self.writeLine("def __init__(self):", 1)
-		self.writeLine("om.MPxNode.__init__(self)", 2)
-		self.writeLine()
+		self.writeSection(self.iterClass)
+
+	## Generate the class definition
+	# @return A generator of the blocks of lines
+	def iterClass(self):
+		spec = self.m_spec
+		# Write all the input attributes first with the prefix in, then the outputs with the prefix out
+		attributeDeclarations = attributeDeclarationTemplate.renderEach({"variableName" : attr.variableName} for attr in spec.iterAttributes())
+		# the outputs are only read again for the result caches if any of them have one
+		resultCaches = ""
+		if spec.usesCache:
+			resultCaches = resultCacheTemplate.renderEach({"outputNames" : ", ".join(attr.longName for attr in group), "longName" : group[0].longName, "cache" : group[0].cache}
+				for group in spec.getComputeGroups() if group[0].cache)
+		for text in classTemplate.renderChunks(classDescription = self.getFromJSON("classDescription", "string"), className = spec.className,
+			baseClass = self.getBaseClassCode(), attributeDeclarations = attributeDeclarations, resultCaches = resultCaches):
+			yield text
+		# write the overrides for the Evaluation Manager
+		for text in self.iterEvaluationFunctions():
+			yield text
 		# write the compute function
-		self.writeComputeFunction()
-
-	## Write the compute class function
-	def writeComputeFunction(self):
-		# write the comments
-		self.writeLine("## The function that is called when the node is dirty", 1)
-		self.writeLine("# @param _plug A plug for one of the i/o attributes", 1)
-		self.writeLine("# @param _dataBlock The data used for the computations", 1)
-		self.writeLine("def compute(self, _plug, _dataBlock):", 1)
-		# loop through each output attribute and create an if statement for each one
-		className = self.getFromJSON("className", "string")
-		for attr in self.outputAttributes:
-			self.writeLine("# Check if the plug is the %s attribute" % attr["longName"], 2)
-			self.writeLine("if (_plug == " + className + ".out" + self.capitalise(attr["longName"]) + "):", 2)
-			# Get the handles for the attributes
-			self.writeLine("# Get handles for the attributes", 3)
-			# Get the input values
-			for dependency in attr["dependencies"]:
-				# Check if the dependency is an input attribute
-				try:
-					d = [x["longName"] for x in self.inputAttributes if (x["longName"] == dependency or x["shortName"] == dependency)][0]
-					self.writeLine(d + "DataHandle = _dataBlock.inputValue(" + className + ".in" + self.capitalise(d) + ")", 3)
-				except:
-					print "Warning: ", dependency, "is not an input attribute."
-			self.writeLine(attr["longName"] + "DataHandle = _dataBlock.outputValue(" + className + ".out" + self.capitalise(attr["longName"]) + ")", 3)
-			self.writeLine()
-			# Extract the values
-			self.writeLine("# Get values for the attributes", 3)
-			for dependency in attr["dependencies"]:
-				# Check if the dependency is an input attribute
-				try:
-					dName = [x["longName"] for x in self.inputAttributes if (x["longName"] == dependency or x["shortName"] == dependency)][0]
-					dType = [x["type"] for x in self.inputAttributes if (x["longName"] == dependency or x["shortName"] == dependency)][0]
-					# Check for multiple values, e.g. 2Float, and put the digit at the end of the string
-					if dType[0].isdigit():
-						dType = dType[1:] + dType[0]
-					self.writeLine(dName + "Value = " + dName + "DataHandle.as" + dType + "()", 3)
-				except:
-					pass
-			self.writeLine()
-			# Perform the desired computation
-			self.writeLine("# Perform the desired computation here", 3)
-			self.writeLine("# " + attr["longName"] + "Value =", 3)
-			self.writeLine()
-			# Set the output value
-			self.writeLine("# Set the output value", 3)
-			self.writeLine(attr["longName"] + "DataHandle.set" + attr["type"] + "(" + attr["longName"] + "Value)", 3)
-			self.writeLine()
-			# Mark the output data handle as clean
-			self.writeLine("# Mark the output data handle as clean", 3)
-			self.writeLine(attr["longName"] + "DataHandle.setClean()", 3)
-		self.writeLine()
+		for text in self.iterComputeFunction():
+			yield text
+
+	## Generate the class functions that tell the Evaluation Manager how to schedule and cache the node
+	# @return A generator of the blocks of lines
+	def iterEvaluationFunctions(self):
+		spec = self.m_spec
+		if spec.schedulingType != None:
+			yield schedulingTypeTemplate.render(schedulingType = DGNodeSpec.schedulingTypes[spec.schedulingType])
+		if spec.evaluationCache:
+			# Ask to be cached during cached playback and add the outputs to the cache
+			cachedAttributes = cachedAttributeTemplate.renderEach({"attribute" : attribute} for attribute in self.getCachedAttributes())
+			for text in evaluationCacheTemplate.renderChunks(baseClass = self.getBaseClassCode(), cachedAttributes = cachedAttributes):
+				yield text
+
+	## Get the code for the base class of the node
+	# @return The code for the class
+	def getBaseClassCode(self):
+		return "om.MPxNode"
+
+	## Get the attributes that are stored in the evaluation cache
+	# @return An iterable of the code for each attribute
+	def getCachedAttributes(self):
+		return (self.m_spec.className + "." + attr.variableName for attr in self.m_spec.outputAttributes)
+
+	## Generate the compute class function
+	# @return A generator of the blocks of lines
+	def iterComputeFunction(self):
+		if self.m_spec.computeDispatch == "dictionary":
+			for text in self.iterDispatchComputeFunction():
+				yield text
+			return
+		yield computeTemplate.render()
+		# create an if statement for each output attribute
+		className = self.m_spec.className
+		# a branch timed with the profiler is indented inside a try statement
+		indent = 4 if self.usesProfiler() else 3
+		for attr in self.m_spec.outputAttributes:
+			attribute = className + "." + attr.variableName
+			if attr.array:
+				# Maya may ask for a single element of a multi attribute
+				plugCondition = "_plug == " + attribute + " or (_plug.isElement and _plug.array() == " + attribute + ")"
+			else:
+				plugCondition = "_plug == " + attribute
+			body = computeBranchBodyTemplate.indented(indent).render(
+				longName = attr.longName,
+				inputHandles = handleTemplate.indented(indent).renderAll([{"longName" : dependency.longName, "handle" : self.getInputHandleCode(dependency)} for dependency in attr.dependencies]),
+				outputHandle = self.getOutputHandleCode(attr),
+				inputValues = valueTemplate.indented(indent).renderAll([{"longName" : dependency.longName, "value" : self.getInputValueCode(dependency, dependency.longName + "DataHandle")} for dependency in attr.dependencies]),
+				computation = self.getComputationCode([attr], indent),
+				setOutputValue = self.getSetOutputValueCode(attr, indent),
+				setClean = CodeTemplate.block([self.getSetCleanCode(attr)], indent))
+			yield computeBranchTemplate.render(longName = attr.longName, plugCondition = plugCondition,
+				body = self.getProfiledCode(body, "\"" + attr.longName + "\"", 3))
+		yield "\n"
+
+	## Generate a compute function that looks up a handler for the plug in a dictionary
+	# Outputs that depend on the same inputs share one handler, which reads the inputs once
+	# and computes and cleans all of the outputs in the group
+	# @return A generator of the blocks of lines
+	def iterDispatchComputeFunction(self):
+		className = self.m_spec.className
+		groups = self.m_spec.getComputeGroups()
+		# write the compute function
+		yield computeTemplate.render()
+		# the handler is timed with the profiler as one event, named after the handler
+		callHandler = CodeTemplate.block(["handler(self, _dataBlock)"], 3 if self.usesProfiler() else 2)
+		yield dispatchComputeTemplate.render(className = className, callHandler = self.getProfiledCode(callHandler, "handler.__name__", 2))
+		# write a handler for each group of outputs
+		for group in groups:
+			yield computeHandlerTemplate.render(
+				outputNames = ", ".join(attr.longName for attr in group) + " attribute" + ("s" if len(group) > 1 else ""),
+				handlerName = self.getHandlerName(group),
+				inputValues = valueTemplate.indented(2).renderAll([{"longName" : dependency.longName, "value" : self.getInputValueCode(dependency, self.getInputHandleCode(dependency))} for dependency in group[0].dependencies]),
+				outputHandles = handleTemplate.indented(2).renderAll([{"longName" : attr.longName, "handle" : self.getOutputHandleCode(attr)} for attr in group]),
+				computation = self.getComputationCode(group, 2),
+				setOutputValues = "".join([self.getSetOutputValueCode(attr, 2) + CodeTemplate.block([self.getSetCleanCode(attr)], 2) for attr in group]))
+		# write the dispatch table, after the handlers so it can refer to them
+		entries = computeHandlerEntryTemplate.renderEach({"longName" : attr.longName, "handlerName" : self.getHandlerName(group)} for group in groups for attr in group)
+		for text in computeHandlersTemplate.renderChunks(handlers = entries):
+			yield text
+
+	## Get the name of the handler of a group of outputs
+	# @param _group The output attributes of the group
+	# @return The name of the handler method
+	def getHandlerName(self, _group):
+		return "compute" + DGNodeSpec.capitalise(_group[0].longName)
+
+	## Get the code for the data handle of an input attribute
+	# @param _attr The input attribute
+	# @return The code for the MDataHandle, or the MArrayDataHandle of a multi attribute
+	def getInputHandleCode(self, _attr):
+		if _attr.array:
+			return "_dataBlock.inputArrayValue(" + self.m_spec.className + "." + _attr.variableName + ")"
+		return "_dataBlock.inputValue(" + self.m_spec.className + "." + _attr.variableName + ")"
+
+	## Get the code for the data handle of an output attribute
+	# @param _attr The output attribute
+	# @return The code for the MDataHandle, or the MArrayDataHandle of a multi attribute
+	def getOutputHandleCode(self, _attr):
+		if _attr.array:
+			return "_dataBlock.outputArrayValue(" + self.m_spec.className + "." + _attr.variableName + ")"
+		return "_dataBlock.outputValue(" + self.m_spec.className + "." + _attr.variableName + ")"
+
+	## Get the code that marks an output attribute as clean
+	# @param _attr The output attribute
+	# @return The code to mark the data handle as clean
+	def getSetCleanCode(self, _attr):
+		if _attr.array:
+			return _attr.longName + "DataHandle.setAllClean()"
+		return _attr.longName + "DataHandle.setClean()"
+
+	## Get the code for a function that gets the value of an attribute from an MDataHandle
+	# @param _attr The attribute
+	# @return The code for the function, e.g. om.MDataHandle.asFloat
+	def getGetterCode(self, _attr):
+		if _attr.type in DGNodeSpec.arrayDataTypes:
+			return "lambda handle: om.MFn" + _attr.type + "Data(handle.data()).array()"
+		return "om.MDataHandle.as" + _attr.getterType
+
+	## Get the code for a function that sets the value of an attribute on an MDataHandle
+	# @param _attr The attribute
+	# @return The code for the function, which takes the handle and the value
+	def getSetterCode(self, _attr):
+		if _attr.type in DGNodeSpec.arrayDataTypes:
+			return "lambda handle, value: handle.setMObject(om.MFn" + _attr.type + "Data().create(value))"
+		if _attr.type[0].isdigit():
+			# The setters of compound numeric types take each value separately
+			return "lambda handle, value: handle.set" + _attr.setterType + "(*value)"
+		return "om.MDataHandle.set" + _attr.setterType
+
+	## Get the code that reads the value of an input attribute from its data handle
+	# NumPy attributes are copied from the M*Array into an array and multi attributes are read into a list
+	# @param _attr The input attribute
+	# @param _handle The code for the data handle of the attribute
+	# @return The code for the value
+	def getInputValueCode(self, _attr, _handle):
+		if _attr.array:
+			return "readArray(" + _handle + ", " + self.getGetterCode(_attr) + ")"
+		if not _attr.numpy:
+			if _attr.type in DGNodeSpec.arrayDataTypes:
+				return "om.MFn" + _attr.type + "Data(" + _handle + ".data()).array()"
+			return _handle + ".as" + _attr.getterType + "()"
+		if _attr.type == "DoubleArray":
+			return "np.array(om.MFnDoubleArrayData(" + _handle + ".data()).array(), dtype = np.float64)"
+		if _attr.type == "IntArray":
+			return "np.array(om.MFnIntArrayData(" + _handle + ".data()).array(), dtype = np.int32)"
+		# Mesh points as an (n, 4) array of homogeneous coordinates
+		return "np.array(om.MFnMesh(" + _handle + ".asMesh()).getPoints(om.MSpace.kObject), dtype = np.float64)"
+
+	## Get the code for the computation of a group of outputs, using the result cache if the outputs have one
+	# @param _outputs The output attributes computed here
+	# @param _indent The indentation for the lines
+	# @return The code
+	def getComputationCode(self, _outputs, _indent):
+		if not _outputs[0].cache:
+			return self.getComputationStubCode(_outputs, _indent)
+		return cachedComputationTemplate.indented(_indent).render(
+			inputValues = self.getTupleCode(self.getFingerprintItems(_outputs[0].dependencies)),
+			outputValues = self.getTupleCode([attr.longName + "Value" for attr in _outputs]),
+			cacheName = "self." + _outputs[0].longName + "Cache",
+			computation = self.getComputationStubCode(_outputs, _indent + 1))
+
+	## Get the code for the values that the result cache fingerprints
+	# A NumPy mesh input only holds the points, so its topology is read from the data handle as well
+	# @param _dependencies The input attributes of the computation
+	# @return A list of the code for each value
+	def getFingerprintItems(self, _dependencies):
+		items = []
+		for dependency in _dependencies:
+			items.append(dependency.longName + "Value")
+			if dependency.numpy and dependency.type == "Mesh":
+				items.append("getMeshTopology(" + self.getInputHandleCode(dependency) + ".asMesh())")
+		return items
+
+	## Get the code for a tuple
+	# @param _items The code for each item
+	# @return The code for the tuple
+	def getTupleCode(self, _items):
+		if len(_items) == 1:
+			return "(" + _items[0] + ",)"
+		return "(" + ", ".join(_items) + ")"
+
+	## Get the comments where the user performs the computation
+	# @param _outputs The output attributes computed here
+	# @param _indent The indentation for the lines
+	# @return The code
+	def getComputationStubCode(self, _outputs, _indent):
+		numpyComment = ""
+		if any(attr.numpy for attr in _outputs + _outputs[0].dependencies):
+			numpyComment = numpyCommentTemplate.indented(_indent).render()
+		return computationStubTemplate.indented(_indent).render(numpyComment = numpyComment,
+			placeholders = placeholderTemplate.indented(_indent).renderAll([{"longName" : attr.longName} for attr in _outputs]))
+
+	## Get the code that sets the value of an output attribute on its data handle
+	# NumPy attributes are copied out of the array through a list, as API 2.0 cannot build an M*Array from a buffer,
+	# and multi attributes are written from a list
+	# @param _attr The output attribute
+	# @param _indent The indentation for the lines
+	# @return The code
+	def getSetOutputValueCode(self, _attr, _indent):
+		handle = _attr.longName + "DataHandle"
+		value = _attr.longName + "Value"
+		if _attr.array:
+			code = "writeArray(_dataBlock, " + self.m_spec.className + "." + _attr.variableName + ", " + handle + ", " + self.getSetterCode(_attr) + ", " + value + ")"
+		elif _attr.type in DGNodeSpec.arrayDataTypes and not _attr.numpy:
+			code = handle + ".setMObject(om.MFn" + _attr.type + "Data().create(" + value + "))"
+		elif _attr.type[0].isdigit():
+			code = handle + ".set" + _attr.setterType + "(*" + value + ")"
+		elif not _attr.numpy:
+			code = handle + ".set" + _attr.setterType + "(" + value + ")"
+		elif _attr.type == "DoubleArray":
+			code = handle + ".setMObject(om.MFnDoubleArrayData().create(om.MDoubleArray(" + value + ".tolist())))"
+		elif _attr.type == "IntArray":
+			code = handle + ".setMObject(om.MFnIntArrayData().create(om.MIntArray(" + value + ".tolist())))"
+		else:
+			# Copy the input mesh and replace its points
+			return meshOutputTemplate.indented(_indent).render(longName = _attr.longName, className = self.m_spec.className,
+				sourceVariable = self.m_spec.getTopologySource(_attr).variableName)
+		return CodeTemplate.block([code], _indent)
 
 	## Write the plugin initialisation functions
 	def writeInitialisation(self):
 		# Write a separator for the plugin initialisation
-		self.writeLine("#----------------------------------------------------------")
-		self.writeLine("# Plugin Initialisation")
-		self.writeLine("#----------------------------------------------------------")
-		self.writeLine()
-		# Function to use API 2.0
-		self.writeLine("## This function tells Maya to use the Python API 2.0")
-		self.writeLine("def maya_useNewAPI():")
-		self.writeLine("pass", 1)
-		self.writeLine("")
-		# node creator function
-		self.writeLine("## Create an instance of the node")
-		self.writeLine("def nodeCreator():")
-		className = self.getFromJSON("className", "string")
-		self.writeLine("return " + className + "()", 1)
-		self.writeLine()
-		# write the nodeInitializer function
+		self.writeSeparator("Plugin Initialisation")
+		# write the function to use API 2.0, a bundle writes it once for every entry
+		if self.m_bundle == None:
+			self.writeText(useNewAPITemplate.render())
+		# write the function to create the node, and the start of the nodeInitializer function
+		self.writeText(initialisationTemplate.render(prefix = self.m_prefix, className = self.m_spec.className))
+		# write the rest of the nodeInitializer function
 		self.writeNodeInitialiser()
-		# write the load and unload plugin functions
-		self.writeInitialiseUninitialiseFunctions()
+		# write the load and unload plugin functions, a bundle registers its entries itself
+		if self.m_bundle == None:
+			self.writeInitialiseUninitialiseFunctions()
 
-	## Write the nodeInitializer function
+	## Write the body of the nodeInitializer function
 	def writeNodeInitialiser(self):
-		self.writeLine("## Initialise the node attributes")
-		self.writeLine("def nodeInitializer():")
-		# Decide if a numeric function set or a typed function set is needed or both
-		numericFn = False
-		typedFn = False
-		numericTypes = self.getFromJSON("validNumericTypes", "array")
-		nonNumericTypes = self.getFromJSON("validNonNumericTypes", "array")
-		for attr in self.inputAttributes + self.outputAttributes:
-			if attr["type"] in numericTypes:
-				numericFn = True
-				break
-			if attr["type"] in nonNumericTypes:
-				typedFn = True
-		# Check if there is a typed function set needed
-		if typedFn == False:
-			for attr in self.inputAttributes + self.outputAttributes:
-				if attr["type"] in nonNumericTypes:
-					typedFn = True
-					break
-		if (numericFn):
-			self.writeLine("# Create a numeric attribute function set", 1)
-			self.writeLine("mFnNumericAttribute = om.MFnNumericAttribute()", 1)
-		if (typedFn):
-			self.writeLine("# Create a non-numeric attribute function set", 1)
-			self.writeLine("mFnTypedAttribute = om.MFnTypedAttribute()", 1)
-		self.writeLine()
-		className = self.getFromJSON("className", "string")
-		# Write the input attributes
-		self.writeLine("# Input node attributes", 1)
-		for attr in self.inputAttributes:
-			# Check if the attribute is numeric or non-numeric (typed)
-			if attr["type"] in numericTypes:
-				attrType = ["Numeric", "Numeric"]
-			else:
-				attrType = ["Typed", ""]
-			variableName = className + ".in" + self.capitalise(attr["longName"])
-			fnParameters = "\"" + attr["longName"] + "\", \"" + attr["shortName"] + "\", om.MFn" + attrType[1] + "Data.k" + attr["type"]
-			if attr["defaultValue"] != None:
-				fnParameters += ", " + attr["longName"] + "DefaultValue"
-			self.writeLine(variableName + " = mFn" + attrType[0] + "Attribute.create(" + fnParameters  + ")", 1)
-			self.writeLine("mFn" + attrType[0] + "Attribute.readable = False", 1)
-			self.writeLine("mFn" + attrType[0] + "Attribute.writable = True", 1)
-			self.writeLine("mFn" + attrType[0] + "Attribute.storable = True", 1)
-			if attr["keyable"]:
-				self.writeLine("mFn" + attrType[0] + "Attribute.keyable = True", 1)
-			else:
-				self.writeLine("mFn" + attrType[0] + "Attribute.keyable = False", 1)
-			if attr["minValue"] != None:
-				self.writeLine("mFn" + attrType[0] + "Attribute.minValue = " + str(attr["minValue"]), 1)
-			if attr["maxValue"] != None:
-				self.writeLine("mFn" + attrType[0] + "Attribute.maxValue = " + str(attr["minValue"]), 1)
-			self.writeLine()
-		# Write the output node attributes
-		self.writeLine("# Output node attributes", 1)
-		for attr in self.outputAttributes:
-			# Check if the attribute is numeric or non-numeric (typed)
-			if attr["type"] in numericTypes:
-				attrType = ["Numeric", "Numeric"]
-			else:
-				attrType = ["Typed", ""]
-			variableName = className + ".out" + self.capitalise(attr["longName"])
-			fnParameters = "\"" + attr["longName"] + "\", \"" + attr["shortName"] + "\", om.MFn" + attrType[1] + "Data.k" + attr["type"]
-			self.writeLine(variableName + " = mFn" + attrType[0] + "Attribute.create(" + fnParameters + ")", 1)
-			self.writeLine("mFn" + attrType[0] + "Attribute.readable = True", 1)
-			self.writeLine("mFn" + attrType[0] + "Attribute.writable = False", 1)
-			self.writeLine("mFn" + attrType[0] + "Attribute.storable = False", 1)
-			self.writeLine()
-		# Add the attributes to the class
-		self.writeLine("# Add the attributes to the class", 1)
-		for attr in self.inputAttributes:
-			self.writeLine(className + ".addAttribute(" + className + ".in" + self.capitalise(attr["longName"]) + ")", 1)
-		for attr in self.outputAttributes:
-			self.writeLine(className + ".addAttribute(" + className + ".out" + self.capitalise(attr["longName"]) + ")", 1)
-		self.writeLine()
-		# Write the dependencies
-		self.writeLine("# Connect input/output dependencies", 1)
-		for attr in self.outputAttributes:
-			for dependency in attr["dependencies"]:
-				# Check if the dependency is an input attribute
-				try:
-					d = [x["longName"] for x in self.inputAttributes if (x["longName"] == dependency or x["shortName"] == dependency)][0]
-					self.writeLine(className + ".attributeAffects(" + className + ".in" + self.capitalise(d) + ", " + className + ".out" + self.capitalise(attr["longName"]) + ")", 1)
-				except:
-					pass
-		self.writeLine()
+		self.writeSection(self.iterNodeInitialiser)
+
+	## Generate the body of the nodeInitializer function
+	# @return An iterator of the blocks of lines
+	def iterNodeInitialiser(self):
+		return itertools.chain(self.iterAttributeFunctionSets(), self.iterInputAttributes(), self.iterOutputAttributes(),
+			self.iterAddAttributes(), self.iterAttributeAffects())
+
+	## Generate the attribute function sets needed by the attributes
+	# @return A generator of the blocks of lines
+	def iterAttributeFunctionSets(self):
+		if self.m_spec.needsNumericFn:
+			yield numericFnTemplate.render()
+		if self.m_spec.needsTypedFn:
+			yield typedFnTemplate.render()
+		yield "\n"
+
+	## Get the template fields that describe the creation of an attribute
+	# @param _attr The attribute
+	# @return A dict of the fields
+	def getAttributeFields(self, _attr):
+		return {
+			"className" : self.m_spec.className,
+			"variableName" : _attr.variableName,
+			"longName" : _attr.longName,
+			"shortName" : _attr.shortName,
+			# Numeric attributes use MFnNumericAttribute and MFnNumericData, the others MFnTypedAttribute and MFnData
+			"fnType" : "Numeric" if _attr.isNumeric else "Typed",
+			"dataFn" : "Numeric" if _attr.isNumeric else "",
+			"dataTypeName" : _attr.dataTypeName
+		}
+
+	## Generate the creation of the input attributes
+	# @return A generator of the blocks of lines
+	def iterInputAttributes(self):
+		yield CodeTemplate.block(["# Input node attributes"], 1)
+		for attr in self.m_spec.inputAttributes:
+			fields = self.getAttributeFields(attr)
+			fnType = fields["fnType"]
+			fields["defaultArgument"] = ", " + self.m_prefix + attr.longName + "DefaultValue" if attr.defaultValue != None else ""
+			fields["array"] = attributeOptionTemplate.render(fnType = fnType, option = "array", value = "True") if attr.array else ""
+			fields["keyable"] = "True" if attr.keyable else "False"
+			fields["minValue"] = attributeOptionTemplate.render(fnType = fnType, option = "minValue", value = attr.minValue) if attr.minValue != None else ""
+			fields["maxValue"] = attributeOptionTemplate.render(fnType = fnType, option = "maxValue", value = attr.maxValue) if attr.maxValue != None else ""
+			yield inputAttributeTemplate.render(**fields)
+
+	## Generate the creation of the output attributes
+	# @return A generator of the blocks of lines
+	def iterOutputAttributes(self):
+		yield CodeTemplate.block(["# Output node attributes"], 1)
+		for attr in self.m_spec.outputAttributes:
+			fields = self.getAttributeFields(attr)
+			fields["array"] = ""
+			if attr.array:
+				# The output is built at its final size with an MArrayDataBuilder
+				fields["array"] = attributeOptionTemplate.renderAll([{"fnType" : fields["fnType"], "option" : "array", "value" : "True"},
+					{"fnType" : fields["fnType"], "option" : "usesArrayDataBuilder", "value" : "True"}])
+			yield outputAttributeTemplate.render(**fields)
+
+	## Generate the calls to add the attributes to the node class
+	# @return A generator of the blocks of lines
+	def iterAddAttributes(self):
+		spec = self.m_spec
+		yield CodeTemplate.block(["# Add the attributes to the class"], 1)
+		for text in addAttributeTemplate.renderEach({"className" : spec.className, "variableName" : attr.variableName} for attr in spec.iterAttributes()):
+			yield text
+		yield "\n"
+
+	## Generate the attributeAffects calls for the dependencies
+	# @return A generator of the blocks of lines
+	def iterAttributeAffects(self):
+		spec = self.m_spec
+		className = spec.className
+		yield CodeTemplate.block(["# Connect input/output dependencies"], 1)
+		for text in attributeAffectsTemplate.renderEach({"className" : className, "inputVariable" : dependency.variableName, "outputAttribute" : className + "." + attr.variableName}
+			for attr in spec.outputAttributes for dependency in attr.dependencies):
+			yield text
+		yield "\n"
+
+	## Get the arguments for registerNode
+	# @return The code for the arguments
+	def getRegisterNodeArguments(self):
+		return ", ".join([self.m_prefix + x for x in ("kPluginNodeName", "kPluginNodeID", "nodeCreator", "nodeInitializer")])
+
+	## Get how a bundle registers and deregisters the node
+	# @return A dict of the kind of entry, the code for its name and the code to register and deregister it
+	def getRegistration(self):
+		return {
+			"kind" : "node",
+			"name" : self.m_prefix + "kPluginNodeName",
+			"register" : "mplugin.registerNode(" + self.getRegisterNodeArguments() + ")",
+			"deregister" : "mplugin.deregisterNode(" + self.m_prefix + "kPluginNodeID)"
+		}
 
 	## Write the functions for initializePlugin and uninitializePlugin
 	def writeInitialiseUninitialiseFunctions(self):
-		# Write the function for initializePlugin
-		self.writeLine("## Initialise the plugin when Maya loads it")
-		self.writeLine("def initializePlugin(mobject):")
-		self.writeLine("mplugin = om.MFnPlugin(mobject)", 1)
-		self.writeLine("try:", 1)
-		self.writeLine("mplugin.registerNode(kPluginNodeName, kPluginNodeID, nodeCreator, nodeInitializer)", 2)
-		self.writeLine("except:", 1)
-		self.writeLine("sys.stderr.write(\"Failed to register node: \" + kPluginNodeName)", 2)
-		self.writeLine("raise", 2)
-		self.writeLine()
-		# Write the function for uninitializePlugin
-		self.writeLine("## Uninitialise the plugin when Maya unloads it")
-		self.writeLine("def uninitializePlugin(mobject):")
-		self.writeLine("mplugin = om.MFnPlugin(mobject)", 1)
-		self.writeLine("try:", 1)
-		self.writeLine("mplugin.deregisterNode(kPluginNodeID)", 2)
-		self.writeLine("except:", 1)
-		self.writeLine("sys.stderr.write(\"Failed to unregister node: \" + kPluginNodeName)", 2)
-		self.writeLine("raise", 2)
-		self.writeLine()
+		self.writeText(initialiseUninitialiseTemplate.render(registerArguments = self.getRegisterNodeArguments()))
 
 # Main
-DGNodeFileCreator()
+if __name__ == "__main__":
+	DGNodeFileCreator()
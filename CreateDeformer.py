@@ -0,0 +1,199 @@
+## CreateDeformer.py
+# This file creates the boilerplate code for a deformer node
+# The deformer reads every point in one call, deforms them as a NumPy array and writes them back in one call
+# API 2.0 has no buffer access to MPointArray, so the points are copied into the array and back out through a list
+
+import itertools
+
+import CodeTemplate
+import CreateDGNode
+
+## The class definition up to the end of the constructor
+deformerClassTemplate = CodeTemplate.CodeTemplate("""\
+## $classDescription
+class $className(oma.MPxDeformerNode):
+	# Define the attributes
+$attributeDeclarations
+
+	def __init__(self):
+		oma.MPxDeformerNode.__init__(self)
+		# The component indices and painted weights of the points of each geometry, read again only when they change
+		self.weightsCache = {}
+
+""")
+
+## The deform function
+deformTemplate = CodeTemplate.CodeTemplate("""\
+	## The function that is called to deform the points of one geometry
+	# @param _dataBlock The data used for the computations
+	# @param _geoIter An iterator over the points of the geometry
+	# @param _localToWorldMatrix The world matrix of the geometry
+	# @param _multiIndex The index of the geometry in the input array
+	def deform(self, _dataBlock, _geoIter, _localToWorldMatrix, _multiIndex):
+$body
+
+""")
+
+## The body of the deform function, rendered at its indentation
+deformBodyTemplate = CodeTemplate.CodeTemplate("""\
+# Nothing to do if the deformer is switched off
+envelope = _dataBlock.inputValue(oma.MPxGeometryFilter.envelope).asFloat()
+if envelope == 0.0:
+	return
+
+# Get values for the attributes
+$attributeValues
+
+# Get every point in one call as an (n, 4) array
+points = np.array(_geoIter.allPositions(), dtype = np.float64)
+if len(points) == 0:
+	return
+# Get the weight of every point, scaled by the envelope
+weights = self.getWeights(_dataBlock, _multiIndex, _geoIter, len(points)) * envelope
+
+# Perform the desired deformation here
+# Use whole-array NumPy operations rather than looping over the points in Python
+deformedPoints = points.copy()
+
+# Blend from the original to the deformed points and write them back in one call
+points += (deformedPoints - points) * weights[:, np.newaxis]
+_geoIter.setAllPositions(om.MPointArray(points.tolist()))
+""")
+
+## The functions to read and cache the painted weights
+weightsFunctionsTemplate = CodeTemplate.CodeTemplate("""\
+	## Get the painted weights for one geometry
+	# The weights are painted by component index, but the points are in the order of the iterator,
+	# which skips the components that are not in the deformer set. The component index of each point is
+	# read from the iterator once and the weights are gathered through it, so they line up with the points.
+	# The weights are cached until they are changed, so they are not read on every evaluation
+	# @param _dataBlock The data used for the computations
+	# @param _multiIndex The index of the geometry in the input array
+	# @param _geoIter The iterator over the points of the geometry
+	# @param _numPoints The number of points being deformed
+	# @return An array with one weight per point, unpainted points have a weight of 1
+	def getWeights(self, _dataBlock, _multiIndex, _geoIter, _numPoints):
+		weights = self.weightsCache.get(_multiIndex)
+		if weights is not None and len(weights) == _numPoints:
+			return weights
+		componentIndices = []
+		_geoIter.reset()
+		while not _geoIter.isDone():
+			componentIndices.append(_geoIter.index())
+			_geoIter.next()
+		_geoIter.reset()
+		componentIndices = np.array(componentIndices, dtype = np.int64)
+		# The weight of every component up to the highest one being deformed
+		paintedWeights = np.ones(int(componentIndices.max()) + 1 if len(componentIndices) else 0, dtype = np.float64)
+		weightListHandle = _dataBlock.inputArrayValue(oma.MPxDeformerNode.weightList)
+		try:
+			weightListHandle.jumpToLogicalElement(_multiIndex)
+		except RuntimeError:
+			# No weights have been painted for this geometry
+			weightListHandle = None
+		if weightListHandle is not None:
+			weightsHandle = om.MArrayDataHandle(weightListHandle.inputValue().child(oma.MPxDeformerNode.weights))
+			for i in range(len(weightsHandle)):
+				weightsHandle.jumpToPhysicalElement(i)
+				index = weightsHandle.elementLogicalIndex()
+				if index < len(paintedWeights):
+					paintedWeights[index] = weightsHandle.inputValue().asFloat()
+		weights = paintedWeights[componentIndices]
+		self.weightsCache[_multiIndex] = weights
+		return weights
+
+	## Clear the cached weights when the painted weights change
+	# @param _plug The plug that has been made dirty
+	# @param _plugArray The plugs that are affected by _plug
+	def setDependentsDirty(self, _plug, _plugArray):
+		if _plug.attribute() == oma.MPxDeformerNode.weightList or _plug.attribute() == oma.MPxDeformerNode.weights:
+			self.weightsCache.clear()
+		return oma.MPxDeformerNode.setDependentsDirty(self, _plug, _plugArray)
+
+	## Clear the cached weights when the painted weights change under the Evaluation Manager
+	# @param _context The context of the evaluation
+	# @param _evaluationNode The dirty plugs of the node
+	def preEvaluation(self, _context, _evaluationNode):
+		if _evaluationNode.dirtyPlugExists(oma.MPxDeformerNode.weightList) or _evaluationNode.dirtyPlugExists(oma.MPxDeformerNode.weights):
+			self.weightsCache.clear()
+
+""")
+
+## Class to create Maya deformer node plugin files
+# The deformer attributes are created in the same way as the DG node input attributes
+class DeformerFileCreator(CreateDGNode.DGNodeFileCreator):
+
+	## Constructor
+	# @param _fileName The JSON file describing the deformer, or a dict of the spec
+	# @param _write False to only generate the code in memory, see getText
+	# @param _bundle The BundleFileCreator this deformer is an entry of, or None
+	def __init__(self, _fileName = "DeformerPluginData.json", _write = True, _bundle = None):
+		CreateDGNode.DGNodeFileCreator.__init__(self, _fileName, _write, _bundle)
+
+	## Parse the JSON file into the node description
+	def parseSpec(self):
+		CreateDGNode.DGNodeFileCreator.parseSpec(self)
+		if self.m_spec.outputAttributes:
+			raise ValueError("A deformer writes to outputGeom, it cannot have outputAttributes")
+
+	## Get the imports for the output file
+	# @return A list of import statements
+	def getImports(self):
+		imports = CreateDGNode.DGNodeFileCreator.getImports(self)
+		imports.insert(imports.index("import maya.api.OpenMaya as om") + 1, "import maya.api.OpenMayaAnim as oma")
+		if "import numpy as np" not in imports:
+			imports.append("import numpy as np")
+		return imports
+
+	## Generate the class definition
+	# @return An iterator of the blocks of lines
+	def iterClass(self):
+		spec = self.m_spec
+		attributeDeclarations = CreateDGNode.attributeDeclarationTemplate.renderEach({"variableName" : attr.variableName} for attr in spec.inputAttributes)
+		# the class, the overrides for the Evaluation Manager, the deform function and the functions for the painted weights
+		return itertools.chain(deformerClassTemplate.renderChunks(classDescription = self.getFromJSON("classDescription", "string"), className = spec.className,
+			attributeDeclarations = attributeDeclarations), self.iterEvaluationFunctions(), [self.getDeformFunctionCode(), weightsFunctionsTemplate.render()])
+
+	## Get the code for the deform class function
+	# @return The code
+	def getDeformFunctionCode(self):
+		# the body timed with the profiler is indented inside a try statement
+		indent = 3 if self.usesProfiler() else 2
+		attributeValues = CreateDGNode.valueTemplate.indented(indent).renderAll([{"longName" : attr.longName, "value" : self.getInputValueCode(attr, self.getInputHandleCode(attr))}
+			for attr in self.m_spec.inputAttributes])
+		body = deformBodyTemplate.indented(indent).render(attributeValues = attributeValues)
+		return deformTemplate.render(body = self.getProfiledCode(body, "\"deform\"", 2))
+
+	## Get the code for the base class of the node
+	# @return The code for the class
+	def getBaseClassCode(self):
+		return "oma.MPxDeformerNode"
+
+	## Get the attributes that are stored in the evaluation cache
+	# @return A list of the code for each attribute
+	def getCachedAttributes(self):
+		return ["oma.MPxGeometryFilter.outputGeom"]
+
+	## A deformer has no output attributes of its own
+	# @return An empty list
+	def iterOutputAttributes(self):
+		return []
+
+	## Generate the attributeAffects calls, every attribute affects the output geometry
+	# @return A generator of the blocks of lines
+	def iterAttributeAffects(self):
+		className = self.m_spec.className
+		yield CodeTemplate.block(["# Connect the attributes to the output geometry"], 1)
+		for text in CreateDGNode.attributeAffectsTemplate.renderEach({"className" : className, "inputVariable" : attr.variableName, "outputAttribute" : "oma.MPxGeometryFilter.outputGeom"}
+			for attr in self.m_spec.inputAttributes):
+			yield text
+		yield "\n"
+
+	## Get the arguments for registerNode
+	# @return The code for the arguments
+	def getRegisterNodeArguments(self):
+		return CreateDGNode.DGNodeFileCreator.getRegisterNodeArguments(self) + ", om.MPxNode.kDeformerNode"
+
+# Main
+if __name__ == "__main__":
+	DeformerFileCreator()
@@ -0,0 +1,208 @@
+## CreatorProfile.py
+# Opt-in instrumentation of the creators, to see where the generation time goes
+# A profiled creator is a subclass whose methods record their call count, their total time and their
+# self time (the total less the time in the other profiled methods they call). Creators that are not
+# profiled run the normal classes, so profiling costs nothing when it is off
+# e.g. python BatchCreator.py specs/ --force --profile profile.json
+
+import json
+import os
+import sys
+import time
+import types
+
+import CodeTemplate
+
+## The best available timer
+timer = getattr(time, "perf_counter", time.time)
+
+## The methods that are highlighted in the summary
+highlightedMethods = ("loadJSON", "parseSpec", "getFromJSON", "writeFile")
+
+## Class to collect the timings of the methods of a creator
+class CreatorProfile(object):
+
+	## Constructor
+	def __init__(self):
+		# The call count, total time and self time of each method, by name
+		self.m_methods = {}
+		# The time spent in the profiled methods called by each method on the stack
+		self.m_stack = []
+
+	## Call a method and record its time
+	# A method that returns an iterator, e.g. an emitter generator that is drained later as the file is written,
+	# is charged for the time of each item it produces as well
+	# @param _name The name of the method
+	# @param _method The method
+	# @param _args The arguments, starting with self
+	# @return The return value of the method, or a generator that times each item if it is an iterator
+	def call(self, _name, _method, _args):
+		result = self.timeCall(_name, 1, _method, _args)
+		if CodeTemplate.isIterator(result):
+			return self.iterTimed(_name, result)
+		return result
+
+	## Iterate over the items of an iterator, recording the time to produce each one against a method
+	# @param _name The name of the method that returned the iterator
+	# @param _iterator The iterator
+	# @return A generator of the items
+	def iterTimed(self, _name, _iterator):
+		while True:
+			try:
+				item = self.timeCall(_name, 0, next, (_iterator,))
+			except StopIteration:
+				return
+			yield item
+
+	## Call a function and add its time to a method
+	# @param _name The name of the method
+	# @param _calls The number of calls to add, 0 for the items of an iterator the method returned
+	# @param _function The function
+	# @param _args The arguments
+	# @return The return value of the function
+	def timeCall(self, _name, _calls, _function, _args):
+		self.m_stack.append(0.0)
+		startTime = timer()
+		try:
+			return _function(*_args)
+		finally:
+			elapsed = timer() - startTime
+			childTime = self.m_stack.pop()
+			if self.m_stack:
+				self.m_stack[-1] += elapsed
+			stats = self.m_methods.get(_name)
+			if stats == None:
+				stats = self.m_methods[_name] = {"calls" : 0, "time" : 0.0, "selfTime" : 0.0}
+			stats["calls"] += _calls
+			stats["time"] += elapsed
+			stats["selfTime"] += elapsed - childTime
+
+	## Get the time of a method
+	# @param _name The name of the method
+	# @return The total time in seconds, 0 if it was not called
+	def getTime(self, _name):
+		stats = self.m_methods.get(_name)
+		return stats["time"] if stats != None else 0.0
+
+## Get the names of the methods of a creator class that can be profiled
+# @param _creatorClass The FileCreator subclass
+# @return A sorted list of the method names, without the constructor and other special methods
+def getMethodNames(_creatorClass):
+	names = set()
+	for cls in _creatorClass.__mro__:
+		for name, value in vars(cls).items():
+			if isinstance(value, types.FunctionType) and not name.startswith("__"):
+				names.add(name)
+	return sorted(names)
+
+## Make a subclass of a creator that records the time of its methods
+# @param _creatorClass The FileCreator subclass
+# @param _profile The CreatorProfile the times are added to
+# @param _methodNames The names of the methods to profile, or None for all of them
+# @return The subclass
+def makeProfiledCreator(_creatorClass, _profile, _methodNames = None):
+	def profiled(_name):
+		method = getattr(_creatorClass, _name)
+		def profiledMethod(*_args):
+			return _profile.call(_name, method, _args)
+		return profiledMethod
+	if _methodNames == None:
+		_methodNames = getMethodNames(_creatorClass)
+	members = dict((name, profiled(name)) for name in _methodNames)
+	if hasattr(_creatorClass, "getEntryCreator"):
+		# The entries of a bundle are made with profiled creators too, so their methods are timed within the bundle's
+		profiledEntryCreators = {}
+		def getEntryCreator(_self, _specType):
+			entryCreator = _creatorClass.getEntryCreator(_self, _specType)
+			if entryCreator == None:
+				return None
+			if entryCreator not in profiledEntryCreators:
+				profiledEntryCreators[entryCreator] = makeProfiledCreator(entryCreator, _profile)
+			return profiledEntryCreators[entryCreator]
+		members["getEntryCreator"] = getEntryCreator
+	return type("Profiled" + _creatorClass.__name__, (_creatorClass,), members)
+
+## Count the lines of a file, reading it a chunk at a time
+# @param _fileName The file
+# @return The number of newlines
+def countLines(_fileName):
+	numLines = 0
+	fileIn = open(_fileName, "rb")
+	try:
+		for chunk in iter(lambda: fileIn.read(65536), b""):
+			numLines += chunk.count(b"\n")
+	finally:
+		fileIn.close()
+	return numLines
+
+## Generate a spec with a profiled creator
+# The output is written as normal and measured on disk, so a streamed spec is never held in memory
+# @param _creatorClass The FileCreator subclass
+# @param _specPath The JSON file
+# @return A dict of the total time, the JSON parse time, the getFromJSON lookups, the size of the output and the time of each method
+def profileSpec(_creatorClass, _specPath):
+	profile = CreatorProfile()
+	profiledCreator = makeProfiledCreator(_creatorClass, profile)
+	startTime = timer()
+	creator = profiledCreator(_specPath)
+	totalTime = timer() - startTime
+	lookups = profile.m_methods.get("getFromJSON", {"calls" : 0, "time" : 0.0})
+	return {
+		"spec" : _specPath,
+		"creator" : _creatorClass.__name__,
+		"total" : totalTime,
+		"jsonParse" : profile.getTime("loadJSON"),
+		"getFromJSON" : {"calls" : lookups["calls"], "time" : lookups["time"]},
+		"outputBytes" : os.path.getsize(creator.m_fileOut),
+		"outputLines" : countLines(creator.m_fileOut),
+		"methods" : profile.m_methods
+	}
+
+## Add up the method times of many specs
+# @param _profiles A list of the results of profileSpec
+# @return A dict of the call count, total time and self time of each method
+def mergeMethods(_profiles):
+	merged = {}
+	for profile in _profiles:
+		for name, stats in profile["methods"].items():
+			total = merged.setdefault(name, {"calls" : 0, "time" : 0.0, "selfTime" : 0.0})
+			for key in total:
+				total[key] += stats[key]
+	return merged
+
+## Write the profiles as JSON
+# @param _profiles A list of the results of profileSpec
+# @param _fileName The JSON file to write
+def writeJSON(_profiles, _fileName):
+	data = {
+		"python" : sys.version.split()[0],
+		"specs" : _profiles,
+		"methods" : mergeMethods(_profiles)
+	}
+	fileOut = open(_fileName, "w")
+	try:
+		json.dump(data, fileOut, indent = 1, sort_keys = True)
+	finally:
+		fileOut.close()
+
+## Print a summary of the profiles, the slowest specs and the methods with the most self time
+# @param _profiles A list of the results of profileSpec
+# @param _numRows The number of specs and methods to list
+def report(_profiles, _numRows = 10):
+	if not _profiles:
+		return
+	totalTime = sum(profile["total"] for profile in _profiles)
+	sys.stdout.write("\nSlowest specs:\n")
+	sys.stdout.write("%-50s %10s %10s %10s %12s %10s\n" % ("spec", "total ms", "parse ms", "lookups", "bytes", "lines"))
+	for profile in sorted(_profiles, key = lambda x: -x["total"])[:_numRows]:
+		sys.stdout.write("%-50s %10.3f %10.3f %10i %12i %10i\n" % (profile["spec"][-50:], profile["total"] * 1e3, profile["jsonParse"] * 1e3,
+			profile["getFromJSON"]["calls"], profile["outputBytes"], profile["outputLines"]))
+	methods = mergeMethods(_profiles)
+	sys.stdout.write("\nMethods by self time (%i specs, %.3f ms in total):\n" % (len(_profiles), totalTime * 1e3))
+	sys.stdout.write("%-40s %10s %12s %12s %8s\n" % ("method", "calls", "total ms", "self ms", "self %"))
+	names = sorted(methods, key = lambda x: -methods[x]["selfTime"])
+	shown = names[:_numRows] + [x for x in highlightedMethods if x in methods and x not in names[:_numRows]]
+	for name in shown:
+		stats = methods[name]
+		share = 100.0 * stats["selfTime"] / totalTime if totalTime > 0 else 0.0
+		sys.stdout.write("%-40s %10i %12.3f %12.3f %7.1f%%\n" % (name, stats["calls"], stats["time"] * 1e3, stats["selfTime"] * 1e3, share))
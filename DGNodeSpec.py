@@ -0,0 +1,254 @@
+## DGNodeSpec.py
+# The parsed description of a Dependency Graph Node
+# The JSON file is read once into attribute records and an index of attribute names,
+# so the emitters never have to scan the attribute lists to resolve a dependency
+# A large file can be streamed instead, see StreamingNodeSpec
+
+import itertools
+
+## The ways the compute function can find the code for the requested plug
+# chain: one if statement per output attribute
+# dictionary: a dictionary lookup from the attribute name to a handler method
+validComputeDispatch = ("chain", "dictionary")
+
+## The scheduling types for the Evaluation Manager and their MPxNode values
+schedulingTypes = {
+	"parallel" : "kParallel",
+	"serial" : "kSerial",
+	"globallySerial" : "kGloballySerial",
+	"untrusted" : "kUntrusted"
+}
+
+## The attribute types that can be converted to and from NumPy arrays
+numpyTypes = ("DoubleArray", "IntArray", "Mesh")
+
+## The attribute types that are read and created with an array data function set, e.g. MFnDoubleArrayData
+arrayDataTypes = ("DoubleArray", "IntArray")
+
+## The MFnNumericData and MFnData constants that do not match the name of the type
+dataTypeNames = {
+	"Bool" : "kBoolean"
+}
+
+## The MDataHandle setters that do not match the name of the type
+# The data types are set as an MObject, the array data is created with its function set first
+setterTypes = {
+	"Matrix" : "MMatrix",
+	"Mesh" : "MObject",
+	"NurbsCurve" : "MObject",
+	"NurbsSurface" : "MObject",
+	"DoubleArray" : "MObject",
+	"IntArray" : "MObject"
+}
+
+## Capitalise the first letter of a string
+# @param _string The string to capitalise
+# @return The string with the first letter capitalised
+def capitalise(_string):
+	return _string[0].upper() + _string[1:]
+
+## An input or output attribute of the node
+class Attribute(object):
+	__slots__ = ("shortName", "longName", "type", "isNumeric", "variableName", "getterType",
+		"setterType", "dataTypeName", "defaultValue", "minValue", "maxValue", "keyable", "numpy", "array", "cache", "dependencies")
+
+	## Constructor
+	# @param _data The dict for the attribute from the JSON file
+	# @param _prefix The prefix of the class variable, "in" or "out"
+	# @param _numericTypes The set of valid numeric types
+	def __init__(self, _data, _prefix, _numericTypes):
+		self.shortName = _data["shortName"]
+		self.longName = _data["longName"]
+		self.type = _data["type"]
+		self.isNumeric = self.type in _numericTypes
+		# The name of the MObject on the node class, e.g. inRadius
+		self.variableName = _prefix + capitalise(self.longName)
+		# The MDataHandle getter puts the number of values at the end, e.g. 3Float -> asFloat3
+		if self.type[0].isdigit():
+			self.getterType = self.type[1:] + self.type[0]
+		else:
+			self.getterType = self.type
+		self.setterType = setterTypes.get(self.type, self.type)
+		# The constant for the type in MFnNumericData or MFnData, e.g. kFloat
+		self.dataTypeName = dataTypeNames.get(self.type, "k" + self.type)
+		self.defaultValue = _data.get("defaultValue")
+		self.minValue = _data.get("minValue")
+		self.maxValue = _data.get("maxValue")
+		self.keyable = _data.get("keyable", False)
+		# Convert the data to and from a NumPy array. API 2.0 has no buffer access to its arrays, so the data is copied
+		# into the array when it is read, and through a Python list into a new M*Array when it is written
+		self.numpy = bool(_data.get("numpy", False))
+		if self.numpy and self.type not in numpyTypes:
+			raise ValueError(self.longName + ": numpy is only supported for " + ", ".join(numpyTypes))
+		# A multi attribute, read and written as a list of element values
+		self.array = bool(_data.get("array", False))
+		if self.numpy and self.array:
+			raise ValueError(self.longName + ": numpy cannot be used on an array attribute")
+		# The number of results of an output to remember, counted as entries whatever their size, 0 turns the cache off
+		self.cache = int(_data.get("cache") or 0)
+		if self.cache < 0:
+			raise ValueError(self.longName + ": cache must be the number of results to keep")
+		# The input attributes this attribute depends on, resolved by NodeSpec
+		self.dependencies = []
+
+## The parsed node description
+class NodeSpec(object):
+
+	## Build the attribute records and the name index
+	# @param _jsonFile The dict loaded from the JSON file
+	def __init__(self, _jsonFile):
+		self.setOptions(_jsonFile)
+		self.m_numericTypes = frozenset(_jsonFile.get("validNumericTypes") or [])
+		self.inputAttributes = [Attribute(x, "in", self.m_numericTypes) for x in _jsonFile.get("inputAttributes") or []]
+		self.outputAttributes = [Attribute(x, "out", self.m_numericTypes) for x in _jsonFile.get("outputAttributes") or []]
+		self.indexInputs()
+		# Resolve the dependencies of each output once
+		for attr, data in zip(self.outputAttributes, _jsonFile.get("outputAttributes") or []):
+			self.resolveDependencies(attr, data, True)
+		allAttributes = self.inputAttributes + self.outputAttributes
+		self.usesNumpy = any(attr.numpy for attr in allAttributes)
+		self.usesArrays = any(attr.array for attr in allAttributes)
+		self.usesCache = any(attr.cache for attr in self.outputAttributes)
+		# Decide if a numeric function set or a typed function set is needed or both
+		self.needsNumericFn = any(attr.isNumeric for attr in allAttributes)
+		self.needsTypedFn = any(not attr.isNumeric for attr in allAttributes)
+
+	## Read the options of the node that are not attributes
+	# @param _jsonFile The dict loaded from the JSON file
+	def setOptions(self, _jsonFile):
+		self.className = str(_jsonFile.get("className"))
+		self.computeDispatch = str(_jsonFile.get("computeDispatch") or "chain")
+		if self.computeDispatch not in validComputeDispatch:
+			raise ValueError("computeDispatch must be one of " + ", ".join(validComputeDispatch))
+		# How the Evaluation Manager may schedule the node, None keeps Maya's default
+		self.schedulingType = _jsonFile.get("schedulingType")
+		if self.schedulingType != None and self.schedulingType not in schedulingTypes:
+			raise ValueError("schedulingType must be one of " + ", ".join(sorted(schedulingTypes)))
+		# Whether the outputs are stored in the evaluation cache for cached playback
+		self.evaluationCache = bool(_jsonFile.get("evaluationCache", False))
+
+	## Index the input attributes by both long and short name
+	def indexInputs(self):
+		self.m_inputIndex = {}
+		for attr in self.inputAttributes:
+			self.m_inputIndex.setdefault(attr.longName, attr)
+			self.m_inputIndex.setdefault(attr.shortName, attr)
+
+	## Resolve the dependencies of an output attribute to the input attributes
+	# @param _attr The output attribute
+	# @param _data The dict for the attribute from the JSON file
+	# @param _warn True to warn about the dependencies that are not input attributes
+	def resolveDependencies(self, _attr, _data, _warn):
+		# The inputs already added, so a dependency listed by both its names is added once
+		added = set(_attr.dependencies)
+		for dependency in _data.get("dependencies") or []:
+			inputAttr = self.m_inputIndex.get(dependency)
+			if inputAttr == None:
+				if _warn:
+					print("Warning: %s is not an input attribute." % dependency)
+			elif inputAttr not in added:
+				added.add(inputAttr)
+				_attr.dependencies.append(inputAttr)
+		# The output mesh copies its topology from an input mesh and only the points are set
+		if _attr.numpy and _attr.type == "Mesh" and self.getTopologySource(_attr) == None:
+			raise ValueError(_attr.longName + ": a numpy Mesh output needs a Mesh dependency to copy the topology from")
+
+	## Iterate over every attribute, the inputs and then the outputs
+	# @return An iterator of the attributes
+	def iterAttributes(self):
+		return itertools.chain(self.inputAttributes, self.outputAttributes)
+
+	## Group the output attributes that depend on exactly the same inputs
+	# The outputs in a group can be computed together, reading each input once
+	# Outputs with different cache sizes are kept in separate groups, as the group shares one cache
+	# @return An iterable of lists of output attributes, in the order of the outputs.
+	# Each output is a group of its own for the chain dispatch, and these are made as they are iterated
+	def getComputeGroups(self):
+		if self.computeDispatch == "chain":
+			return ([attr] for attr in self.outputAttributes)
+		groups = []
+		groupIndex = {}
+		for attr in self.outputAttributes:
+			key = (frozenset(dependency.longName for dependency in attr.dependencies), attr.cache)
+			if key not in groupIndex:
+				groupIndex[key] = len(groups)
+				groups.append([])
+			groups[groupIndex[key]].append(attr)
+		return groups
+
+	## Find the input mesh that a numpy Mesh output copies its topology from
+	# @param _attr The output attribute
+	# @return The first Mesh dependency that is not an array, or None if there is none
+	def getTopologySource(self, _attr):
+		for dependency in _attr.dependencies:
+			if dependency.type == "Mesh" and not dependency.array:
+				return dependency
+		return None
+
+	## Find an input attribute
+	# @param _name The long or short name of the attribute
+	# @return The attribute, or None if there is no input with that name
+	def findInput(self, _name):
+		return self.m_inputIndex.get(_name)
+
+## The output attributes of a streamed node, read from the JSON file each time they are iterated
+# Only one output record is held in memory at a time
+class OutputAttributeStream(object):
+
+	## Constructor
+	# @param _spec The StreamingNodeSpec
+	# @param _length The number of output attributes
+	def __init__(self, _spec, _length):
+		self.m_spec = _spec
+		self.m_length = _length
+
+	## Get the number of output attributes
+	# @return The number of output attributes
+	def __len__(self):
+		return self.m_length
+
+	## Iterate over the output attributes, with their dependencies resolved
+	# @return A generator of the attributes
+	def __iter__(self):
+		for data in self.m_spec.m_reader.iterArray("outputAttributes"):
+			yield self.m_spec.makeOutputAttribute(data, False)
+
+## The description of a node whose output attributes are streamed from a large JSON file
+# The input attributes are kept, as they are the index the dependencies are resolved with, and the outputs are
+# read again whenever they are iterated. The file is read once here to check the outputs and find what they need.
+# The dictionary dispatch groups the outputs across the whole file, so its groups are kept in memory
+class StreamingNodeSpec(NodeSpec):
+
+	## Read the inputs and check the outputs
+	# @param _jsonFile The dict of the members of the JSON file that are not streamed
+	# @param _reader The JSONStream.JSONStreamReader of the file, which streams inputAttributes and outputAttributes
+	def __init__(self, _jsonFile, _reader):
+		self.setOptions(_jsonFile)
+		self.m_reader = _reader
+		self.m_numericTypes = frozenset(_jsonFile.get("validNumericTypes") or [])
+		self.inputAttributes = [Attribute(x, "in", self.m_numericTypes) for x in _reader.iterArray("inputAttributes")]
+		self.indexInputs()
+		self.usesNumpy = any(attr.numpy for attr in self.inputAttributes)
+		self.usesArrays = any(attr.array for attr in self.inputAttributes)
+		self.usesCache = False
+		self.needsNumericFn = any(attr.isNumeric for attr in self.inputAttributes)
+		self.needsTypedFn = any(not attr.isNumeric for attr in self.inputAttributes)
+		numOutputs = 0
+		for data in _reader.iterArray("outputAttributes"):
+			attr = self.makeOutputAttribute(data, True)
+			numOutputs += 1
+			self.usesNumpy = self.usesNumpy or attr.numpy
+			self.usesArrays = self.usesArrays or attr.array
+			self.usesCache = self.usesCache or bool(attr.cache)
+			self.needsNumericFn = self.needsNumericFn or attr.isNumeric
+			self.needsTypedFn = self.needsTypedFn or not attr.isNumeric
+		self.outputAttributes = OutputAttributeStream(self, numOutputs)
+
+	## Make an output attribute from its record
+	# @param _data The dict for the attribute from the JSON file
+	# @param _warn True to warn about the dependencies that are not input attributes
+	# @return The attribute
+	def makeOutputAttribute(self, _data, _warn):
+		attr = Attribute(_data, "out", self.m_numericTypes)
+		self.resolveDependencies(attr, _data, _warn)
+		return attr
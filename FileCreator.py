@@ -1,32 +1,238 @@
 ## FileCreator.py
 # This is the base class for the boilerplate creators
 
+import filecmp
 import json
+import os
+import shutil
+import tempfile
+
+import CodeTemplate
+
+## The header of every generated file
+headerTemplate = CodeTemplate.CodeTemplate("""\
+## $fileName.py
+# $fileDescription
+
+$imports
+
+""")
+
+## A separator between the sections of a generated file
+separatorTemplate = CodeTemplate.CodeTemplate("""\
+#----------------------------------------------------------
+# $title
+#----------------------------------------------------------
+
+""")
+
+## The functions that time the generated code, with Maya's profiler or with Python's timer if it is not available
+profilerFunctionsTemplate = CodeTemplate.CodeTemplate("""\
+## Time the generated code with Maya's profiler, or with Python's timer when the profiler is not available
+# Without the profiler the number of calls and the total time of each event are kept in profilerTimings
+profilerTimings = {}
+if hasattr(om, "MProfiler"):
+	## Add a profiler category, so the events can be filtered in the Profiler window
+	# @param _name The name of the category
+	# @return The category
+	def addProfilerCategory(_name):
+		return om.MProfiler.addCategory(_name, "Generated plugin " + _name)
+
+	## Start timing an event
+	# @param _category The category from addProfilerCategory
+	# @param _eventName The name of the event
+	# @return The event, to pass to profilerEnd
+	def profilerBegin(_category, _eventName):
+		return om.MProfiler.eventBegin(_category, om.MProfiler.kColorE_L3, _eventName)
+
+	## Stop timing an event
+	# @param _event The event from profilerBegin
+	def profilerEnd(_event):
+		om.MProfiler.eventEnd(_event)
+else:
+	profilerTimer = getattr(time, "perf_counter", time.time)
+
+	def addProfilerCategory(_name):
+		return _name
+
+	def profilerBegin(_category, _eventName):
+		return (_category, _eventName, profilerTimer())
+
+	def profilerEnd(_event):
+		elapsed = profilerTimer() - _event[2]
+		timing = profilerTimings.get(_event[:2])
+		if timing is None:
+			timing = profilerTimings[_event[:2]] = [0, 0.0]
+		timing[0] += 1
+		timing[1] += elapsed
+
+""")
+
+## The profiler category of a node or command
+profilerCategoryTemplate = CodeTemplate.CodeTemplate("""\
+# The profiler category of the events
+${prefix}kProfilerCategory = addProfilerCategory("$name")
+
+""")
+
+## A block of code timed as one profiler event
+profiledBlockTemplate = CodeTemplate.CodeTemplate("""\
+profilerEvent = profilerBegin($category, $eventName)
+try:
+$body
+finally:
+	profilerEnd(profilerEvent)
+""")
+
+## The file mode creation mask of the process
+# The mask can only be read by setting it, so it is read once here rather than each time a file is written
+processUmask = os.umask(0)
+os.umask(processUmask)
+
+## Write a file atomically, skipping the write if the contents are unchanged
+# The data is written to a temporary file in the same directory and renamed over the target,
+# so readers never see a partially written file
+# @param _fileName The file to write
+# @param _data The bytes to write
+# @return True if the file was written, False if it already had the same contents
+def atomicWrite(_fileName, _data):
+	if os.path.isfile(_fileName):
+		fileIn = open(_fileName, "rb")
+		try:
+			if fileIn.read() == _data:
+				return False
+		finally:
+			fileIn.close()
+	replaceFile(writeTempFile(_fileName, [_data]), _fileName)
+	return True
+
+## Write a file atomically from chunks of data, skipping the write if the contents are unchanged
+# The chunks are written to the temporary file as they are generated, so the whole file is never held in memory
+# @param _fileName The file to write
+# @param _chunks An iterable of the bytes to write
+# @return True if the file was written, False if it already had the same contents
+def atomicWriteChunks(_fileName, _chunks):
+	tempFile = writeTempFile(_fileName, _chunks)
+	if os.path.isfile(_fileName) and filecmp.cmp(tempFile, _fileName, False):
+		os.remove(tempFile)
+		return False
+	replaceFile(tempFile, _fileName)
+	return True
+
+## Write data to a temporary file next to a file
+# mkstemp creates the file as owner only, so it is given the permissions of the file it replaces,
+# or the normal permissions for a new file
+# @param _fileName The file the data is for
+# @param _chunks An iterable of the bytes to write
+# @return The path of the temporary file
+def writeTempFile(_fileName, _chunks):
+	fileDir = os.path.dirname(os.path.abspath(_fileName))
+	handle, tempFile = tempfile.mkstemp(prefix = "." + os.path.basename(_fileName), suffix = ".tmp", dir = fileDir)
+	try:
+		fileOut = os.fdopen(handle, "wb")
+		try:
+			if os.path.exists(_fileName):
+				shutil.copymode(_fileName, tempFile)
+			elif hasattr(os, "fchmod"):
+				os.fchmod(fileOut.fileno(), 0o666 & ~processUmask)
+			else:
+				os.chmod(tempFile, 0o666 & ~processUmask)
+			for chunk in _chunks:
+				fileOut.write(chunk)
+		finally:
+			fileOut.close()
+	except:
+		os.remove(tempFile)
+		raise
+	return tempFile
+
+## Rename a temporary file over a file
+# @param _tempFile The temporary file from writeTempFile
+# @param _fileName The file to replace
+def replaceFile(_tempFile, _fileName):
+	try:
+		if hasattr(os, "replace"):
+			os.replace(_tempFile, _fileName)
+		else:
+			# Python 2 on Windows cannot rename over an existing file
+			if os.name == "nt" and os.path.exists(_fileName):
+				os.remove(_fileName)
+			os.rename(_tempFile, _fileName)
+	except:
+		os.remove(_tempFile)
+		raise
 
 class FileCreator(object):
 
-	## Load the JSON file, create the output file and set up the headers
-	# @param _fileName The JSON file to load
-	def __init__(self, _fileName):
-		# Open the JSON file
-		fileIn = open(_fileName, "r")
-		self.m_jsonFile = json.load(fileIn)
-		fileIn.close()
+	## Load the JSON file and set up the headers
+	# The output is kept in memory until writeFile is called
+	# @param _fileName The JSON file to load, or a dict of the spec that is already loaded
+	# @param _bundle The BundleFileCreator this is an entry of, or None for a plugin file of its own.
+	# An entry has no header or plugin functions, and its module-level names start with its fileName
+	def __init__(self, _fileName, _bundle = None):
+		self.m_bundle = _bundle
+		self.m_jsonFile = self.loadJSON(_fileName)
+		self.parseSpec()
 		# Get the output file path and name
 		fPath = self.getFromJSON("filePath", "string")
 		fName = self.getFromJSON("fileName", "string")
 		fDescription = self.getFromJSON("fileDescription", "string")
-		fOut = fPath + "/" + fName + ".py"
-		# Create the output file
-		self.m_fOut = file(fOut, "w")
-		# Add file description
-		self.writeLine("## " + fName + ".py")
-		self.writeLine("# " + fDescription)
-		self.writeLine()
-		# Add imports
-		self.writeLine("import sys\nimport maya.api.OpenMaya as om")
-		self.writeLine()
+		self.m_fileOut = fPath + "/" + fName + ".py"
+		self.m_name = fName
+		# The prefix of the module-level names, so the entries of a bundle do not clash
+		self.m_prefix = "" if _bundle == None else fName + "_"
+		# The blocks of lines of the output file, and the functions that generate the streamed sections
+		self.m_lines = []
+		# Add file description and imports
+		if _bundle == None:
+			self.writeText(headerTemplate.render(fileName = fName, fileDescription = fDescription, imports = CodeTemplate.block(self.getImports())))
+
+	## Load the JSON file
+	# @param _fileName The JSON file to load, or a dict of the spec that is already loaded
+	# @return The dict of the spec
+	def loadJSON(self, _fileName):
+		if isinstance(_fileName, dict):
+			return _fileName
+		fileIn = open(_fileName, "r")
+		try:
+			return json.load(fileIn)
+		finally:
+			fileIn.close()
+
+	## Parse the JSON file into the data the emitters need
+	# This is called before anything is written, override it in the subclasses that need it
+	def parseSpec(self):
+		pass
+
+	## Get the imports for the output file
+	# @return A list of import statements
+	def getImports(self):
+		if self.usesProfiler():
+			return ["import sys", "import time", "import maya.api.OpenMaya as om"]
+		return ["import sys", "import maya.api.OpenMaya as om"]
+
+	## Check if the generated code is timed with the profiler
+	# Nothing is added to the generated code unless "profile" is set in the JSON file
+	# @return True if the spec sets "profile"
+	def usesProfiler(self):
+		return self.getFromJSON("profile", "bool")
+
+	## Write the profiler functions and the profiler category, if the spec uses the profiler
+	# @param _name The name of the category, e.g. the node name
+	def writeProfilerCategory(self, _name):
+		if self.usesProfiler():
+			self.writeShared(profilerFunctionsTemplate.render())
+			self.writeText(profilerCategoryTemplate.render(prefix = self.m_prefix, name = _name))
 
+	## Get the code that times a block of code as a profiler event
+	# @param _body The code, indented by one more tab than _indent
+	# @param _eventName The code for the name of the event, e.g. a quoted string
+	# @param _indent The indentation as a number of tabs
+	# @return The code, or _body as it is if the spec does not use the profiler
+	def getProfiledCode(self, _body, _eventName, _indent):
+		if not self.usesProfiler():
+			return _body
+		return profiledBlockTemplate.indented(_indent).render(category = self.m_prefix + "kProfilerCategory", eventName = _eventName, body = _body)
 
 	## Get a variable from the JSON file
 	# @param _variableName The name of the variable in the JSON file
@@ -51,7 +257,74 @@ class FileCreator(object):
 	# @param _text The text to write
 	# @param _indent The indentation for the line as a number of tabs
 	def writeLine(self, _text = "", _indent = 0):
-		self.m_fOut.write("\t"*_indent + _text + "\n")
+		self.m_lines.append("\t"*_indent + _text + "\n")
+
+	## Write a block of lines to the output file, e.g. a rendered template
+	# @param _text The lines, each ending in a newline
+	def writeText(self, _text):
+		self.m_lines.append(_text)
+
+	## Write a separator between the sections of the output file
+	# @param _title The title of the section
+	def writeSeparator(self, _title):
+		if self.m_bundle != None:
+			_title = self.m_name + " " + _title
+		self.writeText(separatorTemplate.render(title = _title))
+
+	## Write a section of the output file that is generated a block of lines at a time
+	# A streamed creator keeps the function and only runs it as the file is written, see isStreamed,
+	# otherwise the section is generated straight away
+	# @param _section A function that returns an iterable of the blocks of lines
+	def writeSection(self, _section):
+		if self.isStreamed():
+			self.m_lines.append(_section)
+		else:
+			self.writeText("".join(_section()))
+
+	## Check if the sections of the output file are generated as it is written
+	# @return True to stream the sections, which only the creators of large specs do
+	def isStreamed(self):
+		return False
+
+	## Write code that every entry of a bundle shares, e.g. helper functions
+	# A bundle writes each block once, before its entries
+	# @param _text The lines, each ending in a newline
+	def writeShared(self, _text):
+		if self.m_bundle == None:
+			self.writeText(_text)
+		else:
+			self.m_bundle.writeShared(_text)
+
+	## Get the files that the output depends on, used to check if it is up to date
+	# @param _specPath The JSON file
+	# @return A list of the JSON files
+	@staticmethod
+	def getSpecFiles(_specPath):
+		return [_specPath]
+
+	## Get the generated code a block of lines at a time, running the streamed sections
+	# @return A generator of the blocks of lines
+	def iterText(self):
+		for lines in self.m_lines:
+			if callable(lines):
+				for text in lines():
+					yield text
+			else:
+				yield lines
+
+	## Get the generated code
+	# @return The contents of the output file as a string
+	def getText(self):
+		return "".join(self.iterText())
+
+	## Write the generated code to the output file
+	# The file is replaced in a single rename and left untouched if the contents are unchanged.
+	# A streamed creator writes each block of lines as it is generated
+	# @return True if the file was written
+	def writeFile(self):
+		if self.isStreamed():
+			return atomicWriteChunks(self.m_fileOut, (text.encode("utf-8") for text in self.iterText()))
+		return atomicWrite(self.m_fileOut, self.getText().encode("utf-8"))
 
 	## Capitalise the first letter of a string
 	# @param _string The string to capitalise
@@ -0,0 +1,165 @@
+## GenerationCache.py
+# A persistent record of which specs have already been generated
+# Each spec is stored with the hash of its contents, the hash of the generator that produced it
+# and the hash of the output file, so unchanged specs can be skipped on the next run
+
+import hashlib
+import json
+import os
+import sys
+
+import CodeTemplate
+import CreateDGNode
+import DGNodeSpec
+import FileCreator
+import JSONStream
+
+## Hash the contents of a file
+# @param _fileName The file to hash
+# @return The hex digest, or None if the file does not exist
+def hashFile(_fileName):
+	if not os.path.isfile(_fileName):
+		return None
+	sha = hashlib.sha1()
+	fileIn = open(_fileName, "rb")
+	try:
+		# Read a chunk at a time, so a large spec or output is never held in memory
+		for chunk in iter(lambda: fileIn.read(65536), b""):
+			sha.update(chunk)
+	finally:
+		fileIn.close()
+	return sha.hexdigest()
+
+## Get the source file of a module, rather than its compiled file
+# @param _module The module
+# @return The path to the .py file
+def getSourceFile(_module):
+	fileName = _module.__file__
+	if fileName.endswith(".pyc") or fileName.endswith(".pyo"):
+		fileName = fileName[:-1]
+	return fileName
+
+## The helper modules that every creator uses
+helperModules = (FileCreator, CodeTemplate, DGNodeSpec, JSONStream)
+
+## Get the modules of the generator code used by a creator class
+# These are the modules of the creator and its base classes, and of the entry creators of a bundle,
+# with the helper modules. Other files next to the generator, e.g. generated plugins, are not included
+# @param _creatorClass The FileCreator subclass
+# @return A set of the modules
+def getGeneratorModules(_creatorClass):
+	classes = list(_creatorClass.__mro__)
+	# A bundle generates its entries with the creators in the entryCreators of its module
+	for entryCreator in getattr(sys.modules[_creatorClass.__module__], "entryCreators", {}).values():
+		classes.extend(entryCreator.__mro__)
+	modules = set(helperModules)
+	for cls in classes:
+		module = sys.modules.get(cls.__module__)
+		# object and the other built in classes have no source file
+		if module != None and getattr(module, "__file__", None) != None:
+			modules.add(module)
+	return modules
+
+## Hash the generator code used by a creator class
+# Any edit to the modules of the creator changes the hash and invalidates the cache
+# @param _creatorClass The FileCreator subclass
+# @return The hex digest
+def hashGenerator(_creatorClass):
+	sourceFiles = set(os.path.abspath(getSourceFile(module)) for module in getGeneratorModules(_creatorClass))
+	sha = hashlib.sha1()
+	for sourceFile in sorted(sourceFiles):
+		sha.update((hashFile(sourceFile) or "missing").encode("ascii"))
+	return sha.hexdigest()
+
+## Hash a spec and the other specs it depends on, e.g. the entries of a bundle
+# @param _specPath The JSON file
+# @param _creatorClass The FileCreator subclass used to generate it
+# @return The hex digest
+def hashSpec(_specPath, _creatorClass):
+	specFiles = _creatorClass.getSpecFiles(_specPath)
+	if len(specFiles) == 1:
+		return hashFile(specFiles[0])
+	sha = hashlib.sha1()
+	for specFile in specFiles:
+		sha.update((hashFile(specFile) or "missing").encode("ascii"))
+	return sha.hexdigest()
+
+## Get the path of the file that a spec generates
+# @param _specPath The JSON file
+# @return The output file path
+def getOutputPath(_specPath):
+	if os.path.getsize(_specPath) >= CreateDGNode.streamingThreshold:
+		# Only the file path and name are needed, so the attributes of a large spec are not loaded
+		jsonFile = JSONStream.JSONStreamReader(_specPath, CreateDGNode.streamedKeys).getMembers()
+	else:
+		fileIn = open(_specPath, "r")
+		try:
+			jsonFile = json.load(fileIn)
+		finally:
+			fileIn.close()
+	return str(jsonFile.get("filePath")) + "/" + str(jsonFile.get("fileName")) + ".py"
+
+## Class to store the generation state of each spec
+class GenerationCache(object):
+
+	## Load the cache file if it exists
+	# @param _cacheFile The JSON file the cache is stored in
+	def __init__(self, _cacheFile):
+		self.m_cacheFile = _cacheFile
+		self.m_entries = {}
+		self.m_generatorHashes = {}
+		if os.path.isfile(_cacheFile):
+			fileIn = open(_cacheFile, "r")
+			try:
+				self.m_entries = json.load(fileIn)
+			except ValueError:
+				# A corrupt cache is treated as empty, everything is regenerated
+				self.m_entries = {}
+			finally:
+				fileIn.close()
+
+	## Get the generator hash, computed once per creator class
+	# @param _creatorClass The FileCreator subclass
+	# @return The hex digest
+	def getGeneratorHash(self, _creatorClass):
+		if _creatorClass not in self.m_generatorHashes:
+			self.m_generatorHashes[_creatorClass] = hashGenerator(_creatorClass)
+		return self.m_generatorHashes[_creatorClass]
+
+	## Check if the output of a spec is up to date
+	# @param _specPath The JSON file
+	# @param _creatorClass The FileCreator subclass used to generate it
+	# @return True if the spec, the generator and the output are unchanged since the last run
+	def isCurrent(self, _specPath, _creatorClass):
+		entry = self.m_entries.get(os.path.abspath(_specPath))
+		if entry == None:
+			return False
+		if entry["specHash"] != hashSpec(_specPath, _creatorClass):
+			return False
+		if entry["generatorHash"] != self.getGeneratorHash(_creatorClass):
+			return False
+		# The output may have been edited or deleted since it was generated
+		return entry["outputHash"] == hashFile(entry["outputPath"])
+
+	## Record a spec that has just been generated
+	# @param _specPath The JSON file
+	# @param _creatorClass The FileCreator subclass used to generate it
+	def update(self, _specPath, _creatorClass):
+		outputPath = getOutputPath(_specPath)
+		self.m_entries[os.path.abspath(_specPath)] = {
+			"specHash" : hashSpec(_specPath, _creatorClass),
+			"generatorHash" : self.getGeneratorHash(_creatorClass),
+			"outputPath" : outputPath,
+			"outputHash" : hashFile(outputPath)
+		}
+
+	## Remove a spec from the cache, e.g. when it failed to generate
+	# @param _specPath The JSON file
+	def remove(self, _specPath):
+		self.m_entries.pop(os.path.abspath(_specPath), None)
+
+	## Write the cache file
+	# The file is replaced atomically so an interrupted run keeps the old cache
+	def save(self):
+		data = json.dumps(self.m_entries, indent = 1, sort_keys = True, separators = (",", ": "))
+		FileCreator.atomicWrite(self.m_cacheFile, data.encode("utf-8"))
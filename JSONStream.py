@@ -0,0 +1,159 @@
+## JSONStream.py
+# Incremental reading of large JSON specs
+# The file is read a chunk at a time and decoded one value at a time with json.JSONDecoder.raw_decode.
+# The elements of the streamed arrays, e.g. the attribute records of a node, are decoded as they are
+# iterated, so only one element is held in memory rather than the whole document
+
+import json
+import re
+
+## The JSON whitespace between values
+whitespacePattern = re.compile(r"[ \t\n\r]*")
+
+## The decoder for the values
+decoder = json.JSONDecoder()
+
+## The characters that can follow a complete value
+valueEndChars = frozenset(" \t\n\r,:]}")
+
+## Class to read the values of a JSON file in order, holding only the text that has not been decoded
+class TextBuffer(object):
+
+	## Constructor
+	# @param _fileIn The open file
+	# @param _chunkSize The number of characters to read at a time
+	def __init__(self, _fileIn, _chunkSize):
+		self.m_fileIn = _fileIn
+		self.m_chunkSize = _chunkSize
+		self.m_text = ""
+		self.m_pos = 0
+
+	## Read more of the file, dropping the text that has been decoded
+	# At least as much as is still to be decoded is read, so a value that spans many chunks is decoded in linear time
+	# @return False if the end of the file has been reached
+	def fill(self):
+		chunk = self.m_fileIn.read(max(self.m_chunkSize, len(self.m_text) - self.m_pos))
+		if not chunk:
+			return False
+		self.m_text = self.m_text[self.m_pos:] + chunk
+		self.m_pos = 0
+		return True
+
+	## Skip the whitespace and get the next character
+	# @return The character, or an empty string at the end of the file
+	def peek(self):
+		while True:
+			self.m_pos = whitespacePattern.match(self.m_text, self.m_pos).end()
+			if self.m_pos < len(self.m_text):
+				return self.m_text[self.m_pos]
+			if not self.fill():
+				return ""
+
+	## Read one of the punctuation characters, e.g. a comma or the end of an array
+	# @param _chars The characters that are valid here
+	# @return The character that was read
+	def expect(self, _chars):
+		char = self.peek()
+		if not char or char not in _chars:
+			raise ValueError("Expected one of '" + _chars + "' but found " + (repr(char) if char else "the end of the file"))
+		self.m_pos += 1
+		return char
+
+	## Decode the next value
+	# @return The value
+	def decode(self):
+		self.peek()
+		while True:
+			try:
+				value, end = decoder.raw_decode(self.m_text, self.m_pos)
+			except ValueError:
+				# The value may continue in the next chunk
+				if self.fill():
+					continue
+				raise
+			# A number that ends with the text, or where the text ends after its . or e, continues in the next chunk
+			if (end == len(self.m_text) or self.m_text[end] not in valueEndChars) and self.fill():
+				continue
+			self.m_pos = end
+			return value
+
+## Class to read a JSON object, streaming the elements of some of its arrays
+class JSONStreamReader(object):
+
+	## Constructor
+	# @param _fileName The JSON file, which must hold an object
+	# @param _streamedKeys The keys of the arrays that are streamed rather than loaded
+	# @param _chunkSize The number of characters to read at a time
+	def __init__(self, _fileName, _streamedKeys, _chunkSize = 65536):
+		self.m_fileName = _fileName
+		self.m_streamedKeys = frozenset(_streamedKeys)
+		self.m_chunkSize = _chunkSize
+
+	## Read the members of the object
+	# The elements of a streamed array are decoded one at a time, and only kept if they are asked for
+	# @param _arrayKey The streamed array to read the elements of, or None to read the members
+	# @return A generator of (key, element) tuples for each element of _arrayKey, or if it is None, of (key, value) tuples for
+	# each member, where the value of a streamed array is None
+	def scan(self, _arrayKey):
+		fileIn = open(self.m_fileName, "r")
+		try:
+			buffer = TextBuffer(fileIn, self.m_chunkSize)
+			buffer.expect("{")
+			if buffer.peek() == "}":
+				return
+			while True:
+				key = buffer.decode()
+				buffer.expect(":")
+				if key not in self.m_streamedKeys:
+					value = buffer.decode()
+					if _arrayKey == None:
+						yield (key, value)
+				elif buffer.peek() != "[":
+					# Anything other than an array, e.g. null, is read as it is
+					value = buffer.decode()
+					if _arrayKey == None:
+						yield (key, None)
+					elif key == _arrayKey:
+						for element in value or []:
+							yield (key, element)
+						return
+				else:
+					buffer.expect("[")
+					if buffer.peek() == "]":
+						buffer.expect("]")
+					else:
+						while True:
+							element = buffer.decode()
+							if key == _arrayKey:
+								yield (key, element)
+							if buffer.expect(",]") == "]":
+								break
+					if _arrayKey == None:
+						yield (key, None)
+					elif key == _arrayKey:
+						# The rest of the file is not needed
+						return
+				if buffer.expect(",}") == "}":
+					return
+		finally:
+			fileIn.close()
+
+	## Get the members of the object that are not streamed
+	# @return A dict of the members
+	def getMembers(self):
+		return dict((key, value) for key, value in self.scan(None) if key not in self.m_streamedKeys)
+
+	## Get the keys of the object, including the keys of the streamed arrays
+	# @return A list of the keys in the order of the file
+	def getKeys(self):
+		return [key for key, value in self.scan(None)]
+
+	## Iterate over the elements of a streamed array
+	# The file is read again each time, and an array that is missing or null has no elements
+	# @param _key The key of the array
+	# @return A generator of the elements
+	def iterArray(self, _key):
+		if _key not in self.m_streamedKeys:
+			raise ValueError(_key + " is not a streamed array")
+		for key, element in self.scan(_key):
+			yield element
@@ -0,0 +1,2 @@
+## maya
+# An offline stand-in for the maya package, see OpenMaya.py
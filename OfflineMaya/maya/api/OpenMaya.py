@@ -0,0 +1,1649 @@
+## OpenMaya.py
+# An offline stand-in for the subset of maya.api.OpenMaya used by the generated plugins
+# It only has the classes, functions and names that exist in Maya, so a generated plugin that
+# runs here only uses real API calls. The data is kept in plain Python objects and nothing is
+# evaluated by a dependency graph, the stand-in is only for loading and timing the plugins.
+# Anything that is not part of the Maya API is prefixed with an underscore.
+
+import copy
+
+#----------------------------------------------------------
+# Objects
+#----------------------------------------------------------
+
+## Function set types, used with MObject.hasFn
+class MFn(object):
+	kInvalid = 0
+	kAttribute = 1
+	kNumericAttribute = 2
+	kTypedAttribute = 3
+	kDependencyNode = 4
+	kMesh = 5
+	kMeshData = 6
+	kNurbsCurve = 7
+	kNurbsCurveData = 8
+	kNurbsSurface = 9
+	kNurbsSurfaceData = 10
+	kDoubleArrayData = 11
+	kIntArrayData = 12
+	kPluginDependNode = 13
+
+## The names of the function set types, for MObject.apiTypeStr
+_apiTypeNames = dict((value, name) for name, value in vars(MFn).items() if name.startswith("k"))
+
+## A handle to an internal Maya object
+# The stand-in keeps the data of the object in _data
+class MObject(object):
+	kNullObj = None
+
+	## Constructor
+	# @param _other An MObject to copy, or nothing for a null object
+	def __init__(self, _other = None):
+		if _other != None:
+			self._apiType = _other._apiType
+			self._compatible = _other._compatible
+			self._data = _other._data
+		else:
+			self._apiType = MFn.kInvalid
+			self._compatible = ()
+			self._data = None
+
+	## Check if the object is null
+	# @return True if the object is null
+	def isNull(self):
+		return self._apiType == MFn.kInvalid
+
+	## Check if a function set can be used with the object
+	# @param _type An MFn type
+	# @return True if the function set is compatible
+	def hasFn(self, _type):
+		return _type == self._apiType or _type in self._compatible
+
+	## Get the type of the object
+	# @return The MFn type
+	def apiType(self):
+		return self._apiType
+
+	@property
+	def apiTypeStr(self):
+		return _apiTypeNames.get(self._apiType, "kInvalid")
+
+	def __eq__(self, _other):
+		if isinstance(_other, MObject):
+			return self._data is _other._data and self._apiType == _other._apiType
+		return NotImplemented
+
+	def __ne__(self, _other):
+		result = self.__eq__(_other)
+		return result if result is NotImplemented else not result
+
+	def __hash__(self):
+		return id(self._data)
+
+MObject.kNullObj = MObject()
+
+## Make an MObject for stand-in data
+# @param _apiType The MFn type of the object
+# @param _data The data of the object
+# @param _compatible Other MFn types that can be used with the object
+# @return The MObject
+def _makeObject(_apiType, _data, _compatible = ()):
+	obj = MObject()
+	obj._apiType = _apiType
+	obj._data = _data
+	obj._compatible = tuple(_compatible)
+	return obj
+
+## The type id of a node
+class MTypeId(object):
+
+	## Constructor
+	# @param _id The id
+	def __init__(self, _id = 0, _secondary = None):
+		self.m_id = _id if _secondary == None else (_id << 8) | _secondary
+
+	## Get the id
+	# @return The id
+	def id(self):
+		return self.m_id
+
+	def __eq__(self, _other):
+		return isinstance(_other, MTypeId) and self.m_id == _other.m_id
+
+	def __ne__(self, _other):
+		return not self.__eq__(_other)
+
+	def __hash__(self):
+		return hash(self.m_id)
+
+## The coordinate space of points
+class MSpace(object):
+	kInvalid = 0
+	kTransform = 1
+	kPreTransform = 2
+	kPostTransform = 3
+	kWorld = 4
+	kObject = kPreTransform
+
+#----------------------------------------------------------
+# Maths and arrays
+#----------------------------------------------------------
+
+## A point in homogeneous coordinates
+class MPoint(object):
+	__slots__ = ("x", "y", "z", "w")
+
+	## Constructor
+	# @param _args Nothing for the origin, an MPoint or sequence to copy, or x, y, z and an optional w
+	def __init__(self, *_args):
+		if len(_args) == 1:
+			_args = tuple(_args[0])
+		values = list(_args) + [0.0, 0.0, 0.0, 1.0][len(_args):]
+		self.x, self.y, self.z, self.w = [float(value) for value in values[:4]]
+
+	def __len__(self):
+		return 4
+
+	def __getitem__(self, _index):
+		return (self.x, self.y, self.z, self.w)[_index]
+
+	def __iter__(self):
+		return iter((self.x, self.y, self.z, self.w))
+
+	def __eq__(self, _other):
+		return tuple(self) == tuple(_other)
+
+	def __ne__(self, _other):
+		return not self.__eq__(_other)
+
+	def __repr__(self):
+		return "maya.api.OpenMaya.MPoint(%r, %r, %r, %r)" % (self.x, self.y, self.z, self.w)
+
+## A 4x4 matrix, the identity by default
+class MMatrix(object):
+
+	## Constructor
+	# @param _values Nothing for the identity, or 16 values or 4 rows of 4 values
+	def __init__(self, _values = None):
+		if _values == None:
+			self.m_values = [1.0 if i % 5 == 0 else 0.0 for i in range(16)]
+		else:
+			values = list(_values)
+			if len(values) == 4:
+				values = [value for row in values for value in row]
+			self.m_values = [float(value) for value in values]
+
+	def __len__(self):
+		return 16
+
+	def __getitem__(self, _index):
+		return self.m_values[_index]
+
+	def __iter__(self):
+		return iter(self.m_values)
+
+	def __eq__(self, _other):
+		try:
+			return list(self) == list(_other)
+		except TypeError:
+			# e.g. comparing with None
+			return False
+
+	def __ne__(self, _other):
+		return not self.__eq__(_other)
+
+	def __repr__(self):
+		return "maya.api.OpenMaya.MMatrix(%r)" % (self.m_values,)
+
+## The base of the array classes, a list of a single element type
+class _MArray(list):
+	_elementType = None
+
+	## Constructor
+	# @param _args Nothing for an empty array, a sequence to copy, or a size and an initial value
+	def __init__(self, *_args):
+		list.__init__(self)
+		if len(_args) == 1 and not isinstance(_args[0], int):
+			self.extend(self._convert(x) for x in _args[0])
+		elif _args:
+			initial = _args[1] if len(_args) > 1 else self._elementType()
+			self.extend(self._convert(initial) for i in range(_args[0]))
+
+	## Convert a value to the element type
+	# @param _value The value
+	# @return The converted value
+	def _convert(self, _value):
+		return self._elementType(_value)
+
+	## Get the number of elements
+	# @return The length of the array
+	def length(self):
+		return len(self)
+
+	## Set the number of elements
+	# @param _length The new length
+	def setLength(self, _length):
+		if _length < len(self):
+			del self[_length:]
+		else:
+			self.extend(self._elementType() for i in range(_length - len(self)))
+
+	## Copy another array
+	# @param _other The array to copy
+	def copy(self, _other):
+		self[:] = [self._convert(x) for x in _other]
+		return self
+
+	## Remove every element
+	def clear(self):
+		del self[:]
+
+## An array of doubles
+class MDoubleArray(_MArray):
+	_elementType = float
+
+## An array of floats
+class MFloatArray(_MArray):
+	_elementType = float
+
+## An array of ints
+class MIntArray(_MArray):
+	_elementType = int
+
+## An array of points
+class MPointArray(_MArray):
+	_elementType = MPoint
+
+	## Convert a value to an MPoint
+	# @param _value An MPoint or a sequence of 3 or 4 values
+	# @return The MPoint
+	def _convert(self, _value):
+		if isinstance(_value, MPoint):
+			return MPoint(_value)
+		return MPoint(*_value)
+
+## A list of objects, e.g. the selection
+class MSelectionList(object):
+
+	## Constructor
+	# @param _other An MSelectionList to copy
+	def __init__(self, _other = None):
+		self.m_objects = list(_other.m_objects) if _other != None else []
+
+	## Add an object to the list
+	# @param _object An MObject, or the name of a node created with _createNode
+	def add(self, _object):
+		if not isinstance(_object, MObject):
+			_object = _nodesByName[_object]
+		self.m_objects.append(_object)
+		return self
+
+	## Get the number of objects
+	# @return The length of the list
+	def length(self):
+		return len(self.m_objects)
+
+	## Check if the list is empty
+	# @return True if there are no objects
+	def isEmpty(self):
+		return not self.m_objects
+
+	## Get a dependency node in the list
+	# @param _index The index in the list
+	# @return The MObject of the node
+	def getDependNode(self, _index):
+		return self.m_objects[_index]
+
+	## Remove every object
+	def clear(self):
+		del self.m_objects[:]
+		return self
+
+#----------------------------------------------------------
+# Data
+#----------------------------------------------------------
+
+## The stand-in data of a mesh
+class _MeshData(object):
+
+	## Constructor
+	# @param _points The points
+	# @param _polygonCounts The number of vertices in each polygon
+	# @param _polygonConnects The vertex indices of each polygon
+	def __init__(self, _points = (), _polygonCounts = (), _polygonConnects = ()):
+		self.points = MPointArray(_points)
+		self.polygonCounts = MIntArray(_polygonCounts)
+		self.polygonConnects = MIntArray(_polygonConnects)
+
+## Make a grid mesh for testing
+# @param _numPoints The approximate number of points
+# @return The MObject of the mesh data
+def _makeGridMesh(_numPoints):
+	size = max(2, int(round(_numPoints ** 0.5)))
+	points = [(float(i % size), 0.0, float(i // size)) for i in range(size * size)]
+	counts = []
+	connects = []
+	for row in range(size - 1):
+		for column in range(size - 1):
+			corner = row * size + column
+			counts.append(4)
+			connects.extend([corner, corner + 1, corner + size + 1, corner + size])
+	return _makeObject(MFn.kMeshData, _MeshData(points, counts, connects), [MFn.kMesh])
+
+## Make a NURBS curve or surface for testing
+# @param _apiType MFn.kNurbsCurveData or MFn.kNurbsSurfaceData
+# @param _numPoints The number of control vertices
+# @return The MObject of the data
+def _makeNurbsData(_apiType, _numPoints):
+	shapeType = MFn.kNurbsCurve if _apiType == MFn.kNurbsCurveData else MFn.kNurbsSurface
+	return _makeObject(_apiType, MPointArray([(float(i), 0.0, 0.0) for i in range(_numPoints)]), [shapeType])
+
+## The base of the data function sets
+class MFnData(object):
+	kInvalid = 0
+	kNumeric = 1
+	kPlugin = 2
+	kPluginGeometry = 3
+	kString = 4
+	kMatrix = 5
+	kStringArray = 6
+	kDoubleArray = 7
+	kFloatArray = 8
+	kIntArray = 9
+	kPointArray = 10
+	kVectorArray = 11
+	kComponentList = 12
+	kMesh = 13
+	kLattice = 14
+	kNurbsCurve = 15
+	kNurbsSurface = 16
+	kSphere = 17
+	kDynArrayAttrs = 18
+	kSubdSurface = 19
+
+	## Constructor
+	# @param _object The data to attach to
+	def __init__(self, _object = None):
+		self.m_object = _object
+
+	## Get the data the function set is attached to
+	# @return The MObject
+	def object(self):
+		return self.m_object
+
+## Function set for numeric data
+class MFnNumericData(MFnData):
+	kInvalid = 0
+	kBoolean = 1
+	kByte = 2
+	kChar = 3
+	kShort = 4
+	k2Short = 5
+	k3Short = 6
+	kLong = 7
+	kInt = 7
+	k2Long = 8
+	k2Int = 8
+	k3Long = 9
+	k3Int = 9
+	kInt64 = 10
+	kAddr = 11
+	kFloat = 12
+	k2Float = 13
+	k3Float = 14
+	kDouble = 15
+	k2Double = 16
+	k3Double = 17
+	k4Double = 18
+
+## Function set for double array data
+class MFnDoubleArrayData(MFnData):
+
+	## Create new data
+	# @param _array The values
+	# @return The MObject of the data
+	def create(self, _array = ()):
+		self.m_object = _makeObject(MFn.kDoubleArrayData, MDoubleArray(_array))
+		return self.m_object
+
+	## Get the values
+	# @return The MDoubleArray of the data
+	def array(self):
+		return self.m_object._data
+
+	## Replace the values
+	# @param _array The new values
+	def set(self, _array):
+		self.m_object._data[:] = MDoubleArray(_array)
+
+	def __len__(self):
+		return len(self.m_object._data)
+
+## Function set for int array data
+class MFnIntArrayData(MFnData):
+
+	## Create new data
+	# @param _array The values
+	# @return The MObject of the data
+	def create(self, _array = ()):
+		self.m_object = _makeObject(MFn.kIntArrayData, MIntArray(_array))
+		return self.m_object
+
+	## Get the values
+	# @return The MIntArray of the data
+	def array(self):
+		return self.m_object._data
+
+	## Replace the values
+	# @param _array The new values
+	def set(self, _array):
+		self.m_object._data[:] = MIntArray(_array)
+
+	def __len__(self):
+		return len(self.m_object._data)
+
+## Function set for mesh data
+class MFnMeshData(MFnData):
+
+	## Create an empty mesh data object, which a mesh can be created in
+	# @return The MObject of the data
+	def create(self):
+		self.m_object = _makeObject(MFn.kMeshData, _MeshData(), [MFn.kMesh])
+		return self.m_object
+
+## Function set for NURBS curve data
+class MFnNurbsCurveData(MFnData):
+
+	## Create an empty curve data object
+	# @return The MObject of the data
+	def create(self):
+		self.m_object = _makeObject(MFn.kNurbsCurveData, MPointArray(), [MFn.kNurbsCurve])
+		return self.m_object
+
+## Function set for NURBS surface data
+class MFnNurbsSurfaceData(MFnData):
+
+	## Create an empty surface data object
+	# @return The MObject of the data
+	def create(self):
+		self.m_object = _makeObject(MFn.kNurbsSurfaceData, MPointArray(), [MFn.kNurbsSurface])
+		return self.m_object
+
+## Function set for meshes
+class MFnMesh(object):
+
+	## Constructor
+	# @param _object The mesh to attach to
+	def __init__(self, _object = None):
+		if _object != None and not _object.hasFn(MFn.kMesh):
+			raise RuntimeError("(kInvalidParameter): Object is incompatible with this method")
+		self.m_object = _object
+
+	## Get the points of the mesh
+	# @param _space The coordinate space
+	# @return An MPointArray
+	def getPoints(self, _space = MSpace.kObject):
+		return MPointArray(self.m_object._data.points)
+
+	## Set the points of the mesh
+	# @param _points The new points
+	# @param _space The coordinate space
+	def setPoints(self, _points, _space = MSpace.kObject):
+		self.m_object._data.points = MPointArray(_points)
+		return self
+
+	## Get the vertices of every polygon
+	# @return A tuple of the polygon counts and the polygon connects
+	def getVertices(self):
+		data = self.m_object._data
+		return (MIntArray(data.polygonCounts), MIntArray(data.polygonConnects))
+
+	## Copy a mesh
+	# @param _source The mesh to copy
+	# @param _parent The mesh data to copy it into
+	# @return The MObject of the new mesh
+	def copy(self, _source, _parent = None):
+		data = copy.deepcopy(_source._data)
+		if _parent != None and _parent.hasFn(MFn.kMeshData):
+			_parent._data = data
+			self.m_object = _parent
+		else:
+			self.m_object = _makeObject(MFn.kMesh, data)
+		return self.m_object
+
+	@property
+	def numVertices(self):
+		return len(self.m_object._data.points)
+
+	@property
+	def numPolygons(self):
+		return len(self.m_object._data.polygonCounts)
+
+## Function set for NURBS curves
+class MFnNurbsCurve(object):
+
+	## Constructor
+	# @param _object The curve to attach to
+	def __init__(self, _object = None):
+		self.m_object = _object
+
+	## Get the control vertices
+	# @param _space The coordinate space
+	# @return An MPointArray
+	def cvPositions(self, _space = MSpace.kObject):
+		return MPointArray(self.m_object._data)
+
+	## Set the control vertices
+	# @param _points The new control vertices
+	# @param _space The coordinate space
+	def setCVPositions(self, _points, _space = MSpace.kObject):
+		self.m_object._data[:] = MPointArray(_points)
+
+	## Get the knots, the stand-in curves are uniform cubics
+	# @return An MDoubleArray
+	def knots(self):
+		return MDoubleArray([float(i) for i in range(len(self.m_object._data) + 2)])
+
+## Function set for NURBS surfaces
+class MFnNurbsSurface(MFnNurbsCurve):
+
+	## Get the knots in U
+	# @return An MDoubleArray
+	def knotsInU(self):
+		return self.knots()
+
+	## Get the knots in V
+	# @return An MDoubleArray
+	def knotsInV(self):
+		return self.knots()
+
+#----------------------------------------------------------
+# Attributes
+#----------------------------------------------------------
+
+## The stand-in description of an attribute
+class _AttributeData(object):
+
+	## Constructor
+	# @param _longName The long name
+	# @param _shortName The short name
+	# @param _dataType The MFnNumericData or MFnData type
+	# @param _isNumeric True for a numeric attribute
+	# @param _default The default value
+	def __init__(self, _longName, _shortName, _dataType, _isNumeric, _default):
+		self.longName = _longName
+		self.shortName = _shortName
+		self.dataType = _dataType
+		self.isNumeric = _isNumeric
+		self.default = _default
+		self.readable = True
+		self.writable = True
+		self.storable = True
+		self.keyable = False
+		self.cached = True
+		self.array = False
+		self.usesArrayDataBuilder = False
+		self.minValue = None
+		self.maxValue = None
+		self.children = []
+
+## The number of values of each numeric type
+_numericSizes = {
+	MFnNumericData.k2Short : 2, MFnNumericData.k3Short : 3,
+	MFnNumericData.k2Int : 2, MFnNumericData.k3Int : 3,
+	MFnNumericData.k2Float : 2, MFnNumericData.k3Float : 3,
+	MFnNumericData.k2Double : 2, MFnNumericData.k3Double : 3, MFnNumericData.k4Double : 4
+}
+
+## The base of the attribute function sets
+class MFnAttribute(object):
+
+	## Constructor
+	# @param _object The attribute to attach to
+	def __init__(self, _object = None):
+		self.m_object = _object
+
+	## Get the attribute the function set is attached to
+	# @return The MObject
+	def object(self):
+		return self.m_object
+
+	## Create an attribute and attach the function set to it
+	def _create(self, _apiType, _data):
+		self.m_object = _makeObject(_apiType, _data, [MFn.kAttribute])
+		return self.m_object
+
+	@property
+	def name(self):
+		return self.m_object._data.longName
+
+	@property
+	def shortName(self):
+		return self.m_object._data.shortName
+
+	## Make a property that reads and writes a field of the attribute data
+	def _field(_name):
+		return property(lambda self: getattr(self.m_object._data, _name), lambda self, _value: setattr(self.m_object._data, _name, _value))
+
+	readable = _field("readable")
+	writable = _field("writable")
+	storable = _field("storable")
+	keyable = _field("keyable")
+	cached = _field("cached")
+	array = _field("array")
+	usesArrayDataBuilder = _field("usesArrayDataBuilder")
+	affectsAppearance = _field("cached")
+	del _field
+
+## Function set for numeric attributes
+class MFnNumericAttribute(MFnAttribute):
+
+	## Create a numeric attribute
+	# @param _longName The long name
+	# @param _shortName The short name
+	# @param _type The MFnNumericData type
+	# @param _default The default value
+	# @return The MObject of the attribute
+	def create(self, _longName, _shortName, _type, _default = 0):
+		size = _numericSizes.get(_type, 1)
+		if size > 1 and not isinstance(_default, (tuple, list)):
+			_default = (_default,) * size
+		return self._create(MFn.kNumericAttribute, _AttributeData(_longName, _shortName, _type, True, _default))
+
+	@property
+	def minValue(self):
+		return self.m_object._data.minValue
+
+	@minValue.setter
+	def minValue(self, _value):
+		self.m_object._data.minValue = _value
+
+	@property
+	def maxValue(self):
+		return self.m_object._data.maxValue
+
+	@maxValue.setter
+	def maxValue(self, _value):
+		self.m_object._data.maxValue = _value
+
+	@property
+	def default(self):
+		return self.m_object._data.default
+
+	@default.setter
+	def default(self, _value):
+		self.m_object._data.default = _value
+
+## Function set for typed attributes
+class MFnTypedAttribute(MFnAttribute):
+
+	## Create a typed attribute
+	# @param _longName The long name
+	# @param _shortName The short name
+	# @param _type The MFnData type
+	# @param _default The default data
+	# @return The MObject of the attribute
+	def create(self, _longName, _shortName, _type, _default = None):
+		return self._create(MFn.kTypedAttribute, _AttributeData(_longName, _shortName, _type, False, _default))
+
+	## Get the type of data
+	# @return The MFnData type
+	def attrType(self):
+		return self.m_object._data.dataType
+
+#----------------------------------------------------------
+# Data block
+#----------------------------------------------------------
+
+## The size of the stand-in data made for typed attributes that have not been set
+_defaultDataSize = [1000]
+
+## Make the value of an attribute that has not been set
+# @param _attribute The MObject of the attribute
+# @return The value
+def _makeDefaultValue(_attribute):
+	data = _attribute._data
+	if data.isNumeric:
+		return data.default
+	if data.default != None and not (isinstance(data.default, MObject) and data.default.isNull()):
+		return data.default
+	size = _defaultDataSize[0]
+	if data.dataType == MFnData.kMesh:
+		return _makeGridMesh(size)
+	if data.dataType == MFnData.kNurbsCurve:
+		return _makeNurbsData(MFn.kNurbsCurveData, size)
+	if data.dataType == MFnData.kNurbsSurface:
+		return _makeNurbsData(MFn.kNurbsSurfaceData, size)
+	if data.dataType == MFnData.kDoubleArray:
+		return MFnDoubleArrayData().create([float(i) for i in range(size)])
+	if data.dataType == MFnData.kIntArray:
+		return MFnIntArrayData().create(range(size))
+	if data.dataType == MFnData.kMatrix:
+		return MMatrix()
+	if data.dataType == MFnData.kString:
+		return ""
+	return MObject()
+
+## A handle to the value of one attribute in a data block
+class MDataHandle(object):
+
+	## Constructor
+	# @param _values The dict the value is stored in
+	# @param _key The key of the value in the dict
+	# @param _attribute The MObject of the attribute
+	def __init__(self, _values = None, _key = None, _attribute = None):
+		self.m_values = _values if _values != None else {}
+		self.m_key = _key
+		self.m_attribute = _attribute if _attribute != None else MObject()
+		self.m_clean = False
+
+	def _get(self):
+		if self.m_key not in self.m_values:
+			self.m_values[self.m_key] = _makeDefaultValue(self.m_attribute)
+		return self.m_values[self.m_key]
+
+	def _set(self, _value):
+		self.m_values[self.m_key] = _value
+
+	## Get the attribute of the handle
+	# @return The MObject of the attribute
+	def attribute(self):
+		return self.m_attribute
+
+	## Check if the handle has no data
+	# @return True if the handle is not attached to an attribute
+	def isNull(self):
+		return self.m_key == None
+
+	## Mark the data as clean
+	def setClean(self):
+		self.m_clean = True
+		return self
+
+	## Get the data object of a typed attribute
+	# @return The MObject of the data
+	def data(self):
+		return self._get()
+
+	def asBool(self):
+		return bool(self._get())
+
+	def asChar(self):
+		return int(self._get())
+
+	def asShort(self):
+		return int(self._get())
+
+	def asInt(self):
+		return int(self._get())
+
+	def asFloat(self):
+		return float(self._get())
+
+	def asDouble(self):
+		return float(self._get())
+
+	def asShort2(self):
+		return tuple(int(x) for x in self._get())
+
+	def asShort3(self):
+		return tuple(int(x) for x in self._get())
+
+	def asInt2(self):
+		return tuple(int(x) for x in self._get())
+
+	def asInt3(self):
+		return tuple(int(x) for x in self._get())
+
+	def asFloat2(self):
+		return tuple(float(x) for x in self._get())
+
+	def asFloat3(self):
+		return tuple(float(x) for x in self._get())
+
+	def asDouble2(self):
+		return tuple(float(x) for x in self._get())
+
+	def asDouble3(self):
+		return tuple(float(x) for x in self._get())
+
+	def asDouble4(self):
+		return tuple(float(x) for x in self._get())
+
+	def asString(self):
+		return str(self._get())
+
+	def asMatrix(self):
+		return MMatrix(self._get())
+
+	def asMesh(self):
+		return self._get()
+
+	def asNurbsCurve(self):
+		return self._get()
+
+	def asNurbsSurface(self):
+		return self._get()
+
+	def setBool(self, _value):
+		self._set(bool(_value))
+
+	def setChar(self, _value):
+		self._set(int(_value))
+
+	def setShort(self, _value):
+		self._set(int(_value))
+
+	def setInt(self, _value):
+		self._set(int(_value))
+
+	def setFloat(self, _value):
+		self._set(float(_value))
+
+	def setDouble(self, _value):
+		self._set(float(_value))
+
+	def set2Short(self, _x, _y):
+		self._set((int(_x), int(_y)))
+
+	def set3Short(self, _x, _y, _z):
+		self._set((int(_x), int(_y), int(_z)))
+
+	def set2Int(self, _x, _y):
+		self._set((int(_x), int(_y)))
+
+	def set3Int(self, _x, _y, _z):
+		self._set((int(_x), int(_y), int(_z)))
+
+	def set2Float(self, _x, _y):
+		self._set((float(_x), float(_y)))
+
+	def set3Float(self, _x, _y, _z):
+		self._set((float(_x), float(_y), float(_z)))
+
+	def set2Double(self, _x, _y):
+		self._set((float(_x), float(_y)))
+
+	def set3Double(self, _x, _y, _z):
+		self._set((float(_x), float(_y), float(_z)))
+
+	def setString(self, _value):
+		self._set(str(_value))
+
+	def setMMatrix(self, _value):
+		self._set(MMatrix(_value))
+
+	def setMObject(self, _value):
+		self._set(_value)
+
+	## Copy the data of another handle
+	# @param _other The handle to copy
+	def copy(self, _other):
+		self._set(copy.deepcopy(_other._get()))
+
+	## Get a child of a compound attribute
+	# @param _attribute The MObject of the child attribute
+	# @return The MDataHandle of the child
+	def child(self, _attribute):
+		return MDataHandle(self._get(), _attribute, _attribute)
+
+## A handle to the elements of a multi attribute
+class MArrayDataHandle(object):
+
+	## Constructor
+	# @param _handle The MDataHandle of the attribute, or the dict of elements
+	# @param _attribute The MObject of the attribute
+	def __init__(self, _handle, _attribute = None):
+		if isinstance(_handle, MDataHandle):
+			_attribute = _handle.m_attribute
+			_handle = _handle._get()
+			if not isinstance(_handle, dict):
+				raise RuntimeError("(kInvalidParameter): Data handle is not an array")
+		self.m_elements = _handle
+		self.m_attribute = _attribute
+		self.m_indices = sorted(self.m_elements)
+		self.m_position = 0
+
+	def __len__(self):
+		return len(self.m_indices)
+
+	## Get the number of elements
+	# @return The number of elements
+	def elementCount(self):
+		return len(self.m_indices)
+
+	## Move to an element by its position in the array
+	# @param _position The physical index
+	def jumpToPhysicalElement(self, _position):
+		if _position < 0 or _position >= len(self.m_indices):
+			raise RuntimeError("(kInvalidParameter): Element does not exist")
+		self.m_position = _position
+		return self
+
+	## Move to an element by its logical index
+	# @param _index The logical index
+	def jumpToLogicalElement(self, _index):
+		if _index not in self.m_elements:
+			raise RuntimeError("(kInvalidParameter): Element does not exist")
+		self.m_position = self.m_indices.index(_index)
+		return self
+
+	## Move to the next element
+	# @return False if there are no more elements
+	def next(self):
+		self.m_position += 1
+		return self.m_position < len(self.m_indices)
+
+	## Get the logical index of the current element
+	# @return The logical index
+	def elementLogicalIndex(self):
+		return self.m_indices[self.m_position]
+
+	## Get the current element for reading
+	# @return The MDataHandle of the element
+	def inputValue(self):
+		return MDataHandle(self.m_elements, self.m_indices[self.m_position], self.m_attribute)
+
+	## Get the current element for writing
+	# @return The MDataHandle of the element
+	def outputValue(self):
+		return self.inputValue()
+
+	## Get a builder to change the elements
+	# @return An MArrayDataBuilder with the current elements
+	def builder(self):
+		builder = MArrayDataBuilder(None, self.m_attribute, len(self.m_indices))
+		builder.m_elements = dict(self.m_elements)
+		return builder
+
+	## Replace the elements with the contents of a builder
+	# @param _builder The MArrayDataBuilder
+	def set(self, _builder):
+		self.m_elements.clear()
+		self.m_elements.update(_builder.m_elements)
+		self.m_indices = sorted(self.m_elements)
+		self.m_position = 0
+
+	## Mark every element as clean
+	def setAllClean(self):
+		return self
+
+	## Mark the array as clean
+	def setClean(self):
+		return self
+
+## Builds the elements of a multi attribute
+class MArrayDataBuilder(object):
+
+	## Constructor
+	# @param _dataBlock The data block of the node
+	# @param _attribute The MObject of the attribute
+	# @param _numElements The expected number of elements
+	def __init__(self, _dataBlock, _attribute, _numElements):
+		self.m_attribute = _attribute
+		self.m_elements = {}
+		self.m_numElements = _numElements
+
+	def __len__(self):
+		return len(self.m_elements)
+
+	## Add an element
+	# @param _index The logical index
+	# @return The MDataHandle of the element
+	def addElement(self, _index):
+		if _index not in self.m_elements:
+			self.m_elements[_index] = _makeDefaultValue(self.m_attribute)
+		return MDataHandle(self.m_elements, _index, self.m_attribute)
+
+	## Make room for more elements
+	# @param _amount The number of elements to add room for
+	def growArray(self, _amount):
+		self.m_numElements += _amount
+
+## The data of a node during compute
+class MDataBlock(object):
+
+	## Constructor
+	# The stand-in data block belongs to a node, in Maya it is passed to compute
+	# @param _values The dict of attribute values, shared with the node
+	def __init__(self, _values = None):
+		self.m_values = _values if _values != None else {}
+
+	def _handle(self, _attribute):
+		if _attribute._data.array and _attribute not in self.m_values:
+			self.m_values[_attribute] = {}
+		return MDataHandle(self.m_values, _attribute, _attribute)
+
+	## Get an attribute for reading
+	# @param _attribute The MObject of the attribute, or an MPlug
+	# @return The MDataHandle
+	def inputValue(self, _attribute):
+		if isinstance(_attribute, MPlug):
+			_attribute = _attribute.attribute()
+		return self._handle(_attribute)
+
+	## Get an attribute for writing
+	# @param _attribute The MObject of the attribute, or an MPlug
+	# @return The MDataHandle
+	def outputValue(self, _attribute):
+		return self.inputValue(_attribute)
+
+	## Get a multi attribute for reading
+	# @param _attribute The MObject of the attribute
+	# @return The MArrayDataHandle
+	def inputArrayValue(self, _attribute):
+		if _attribute not in self.m_values:
+			self.m_values[_attribute] = {}
+		return MArrayDataHandle(self.m_values[_attribute], _attribute)
+
+	## Get a multi attribute for writing
+	# @param _attribute The MObject of the attribute
+	# @return The MArrayDataHandle
+	def outputArrayValue(self, _attribute):
+		return self.inputArrayValue(_attribute)
+
+	## Mark a plug as clean
+	# @param _plug The plug
+	def setClean(self, _plug):
+		return self
+
+#----------------------------------------------------------
+# Nodes
+#----------------------------------------------------------
+
+## A connection point on a node
+class MPlug(object):
+
+	## Constructor
+	# @param _node The MObject of the node
+	# @param _attribute The MObject of the attribute
+	# @param _logicalIndex The logical index of an element of a multi attribute
+	def __init__(self, _node = None, _attribute = None, _logicalIndex = None):
+		self.m_node = _node if _node != None else MObject()
+		self.m_attribute = _attribute if _attribute != None else MObject()
+		self.m_logicalIndex = _logicalIndex
+
+	## Get the attribute of the plug
+	# @return The MObject of the attribute
+	def attribute(self):
+		return self.m_attribute
+
+	## Get the node of the plug
+	# @return The MObject of the node
+	def node(self):
+		return self.m_node
+
+	@property
+	def isElement(self):
+		return self.m_logicalIndex != None
+
+	@property
+	def isArray(self):
+		return self.m_logicalIndex == None and self.m_attribute._data.array
+
+	@property
+	def isNull(self):
+		return self.m_attribute.isNull()
+
+	## Get the multi attribute plug of an element plug
+	# @return The MPlug of the whole array
+	def array(self):
+		if self.m_logicalIndex == None:
+			raise RuntimeError("(kInvalidParameter): Plug is not an array element")
+		return MPlug(self.m_node, self.m_attribute)
+
+	## Get an element of a multi attribute plug
+	# @param _index The logical index
+	# @return The MPlug of the element
+	def elementByLogicalIndex(self, _index):
+		return MPlug(self.m_node, self.m_attribute, _index)
+
+	## Get the logical index of an element plug
+	# @return The logical index
+	def logicalIndex(self):
+		return self.m_logicalIndex
+
+	## Get the name of the plug without the node name
+	# @return The name
+	def partialName(self, *_args, **_kwargs):
+		name = self.m_attribute._data.longName if _kwargs.get("useLongNames") else self.m_attribute._data.shortName
+		if self.m_logicalIndex != None:
+			name += "[%i]" % self.m_logicalIndex
+		return name
+
+	def __eq__(self, _other):
+		if isinstance(_other, MPlug):
+			return self.m_attribute == _other.m_attribute and self.m_node == _other.m_node and self.m_logicalIndex == _other.m_logicalIndex
+		if isinstance(_other, MObject):
+			# A plug compares equal to its attribute, as in Maya
+			return self.m_logicalIndex == None and self.m_attribute == _other
+		return NotImplemented
+
+	def __ne__(self, _other):
+		result = self.__eq__(_other)
+		return result if result is NotImplemented else not result
+
+	def __hash__(self):
+		return hash((self.m_attribute, self.m_logicalIndex))
+
+## An array of plugs
+class MPlugArray(_MArray):
+	_elementType = MPlug
+
+	def _convert(self, _value):
+		return _value
+
+## The stand-in records of the static attributes of each node class
+_classAttributes = {}
+_classAffects = {}
+
+## The base class of dependency graph nodes
+class MPxNode(object):
+	kDependNode = 0
+	kLocatorNode = 1
+	kDeformerNode = 2
+	kManipContainer = 3
+	kSurfaceShape = 4
+	kFieldNode = 5
+	kEmitterNode = 6
+	kSpringNode = 7
+	kIkSolverNode = 8
+	kHardwareShader = 9
+	kHwShaderNode = 10
+	kTransformNode = 11
+	kObjectSet = 12
+	kFluidEmitterNode = 13
+	kImagePlaneNode = 14
+	kParticleAttributeMapperNode = 15
+	kCameraSetNode = 16
+	kConstraintNode = 17
+	kManipulatorNode = 18
+	kMotionPathNode = 19
+	kClientDeviceNode = 20
+	kThreadedDeviceNode = 21
+	kAssembly = 22
+	kSkinCluster = 23
+	kGeometryFilter = 24
+	kBlendShape = 25
+	kLast = 26
+
+	kDefaultScheduleType = 0
+	kParallel = 1
+	kSerial = 2
+	kGloballySerial = 3
+	kUntrusted = 4
+
+	## Constructor
+	def __init__(self):
+		# The values of the attributes, shared by the data block
+		self._values = {}
+		self._object = _makeObject(MFn.kPluginDependNode, self, [MFn.kDependencyNode])
+
+	## Get the node
+	# @return The MObject of the node
+	def thisMObject(self):
+		return self._object
+
+	## Get the data block of the node
+	# The stand-in has one data block per node, in Maya it is passed to compute
+	# @return The MDataBlock
+	def _dataBlock(self):
+		return MDataBlock(self._values)
+
+	## Add a static attribute to the node class
+	# @param _attribute The MObject of the attribute
+	@classmethod
+	def addAttribute(cls, _attribute):
+		if _attribute.isNull():
+			raise RuntimeError("(kInvalidParameter): Attribute is null")
+		attributes = _classAttributes.setdefault(cls, [])
+		if _attribute in attributes:
+			raise RuntimeError("(kFailure): Attribute has already been added")
+		attributes.append(_attribute)
+
+	## Make one attribute affect another
+	# @param _input The MObject of the input attribute
+	# @param _output The MObject of the output attribute
+	@classmethod
+	def attributeAffects(cls, _input, _output):
+		_classAffects.setdefault(cls, []).append((_input, _output))
+
+	## The function that is called when the node is dirty
+	def compute(self, _plug, _dataBlock):
+		return None
+
+	## How the Evaluation Manager may schedule the node
+	def schedulingType(self):
+		return MPxNode.kDefaultScheduleType
+
+	def setDependentsDirty(self, _plug, _plugArray):
+		return self
+
+	def preEvaluation(self, _context, _evaluationNode):
+		return None
+
+	def postEvaluation(self, _context, _evaluationNode, _evalType):
+		return None
+
+	def getCacheSetup(self, _evaluationNode, _disablingInfo, _cacheSetupInfo, _monitoredAttributes):
+		return None
+
+	def configCache(self, _evaluationNode, _schema):
+		return None
+
+## The preferences a node gives for the evaluation cache
+class MNodeCacheSetupInfo(object):
+	kRequireCache = 0
+	kWantToCacheByDefault = 1
+	kWantToCacheTopologyByDefault = 2
+
+	def __init__(self):
+		self.m_preferences = {}
+
+	def setPreference(self, _preference, _value):
+		self.m_preferences[_preference] = _value
+
+	def getPreference(self, _preference):
+		return self.m_preferences.get(_preference, False)
+
+## The attributes a node stores in the evaluation cache
+class MCacheSchema(object):
+
+	def __init__(self):
+		self.m_attributes = []
+
+	def add(self, _attribute):
+		self.m_attributes.append(_attribute)
+
+	def isEmpty(self):
+		return not self.m_attributes
+
+	def reset(self):
+		del self.m_attributes[:]
+
+## An iterator over the points of a geometry
+class MItGeometry(object):
+
+	## Constructor
+	# @param _object The geometry, or an MPointArray of points for the stand-in
+	def __init__(self, _object):
+		if isinstance(_object, MObject):
+			_object = _object._data.points if _object.hasFn(MFn.kMesh) else _object._data
+		self.m_points = _object
+		self.m_index = 0
+
+	def __len__(self):
+		return len(self.m_points)
+
+	## Get the number of points
+	# @return The number of points
+	def count(self):
+		return len(self.m_points)
+
+	## Get every point in one call
+	# @param _space The coordinate space
+	# @return An MPointArray
+	def allPositions(self, _space = MSpace.kObject):
+		return MPointArray(self.m_points)
+
+	## Set every point in one call
+	# @param _points The new points
+	# @param _space The coordinate space
+	def setAllPositions(self, _points, _space = MSpace.kObject):
+		if len(_points) != len(self.m_points):
+			raise RuntimeError("(kInvalidParameter): Wrong number of points")
+		self.m_points[:] = MPointArray(_points)
+
+	def isDone(self):
+		return self.m_index >= len(self.m_points)
+
+	def next(self):
+		self.m_index += 1
+
+	def index(self):
+		return self.m_index
+
+	def position(self, _space = MSpace.kObject):
+		return MPoint(self.m_points[self.m_index])
+
+	def setPosition(self, _point, _space = MSpace.kObject):
+		self.m_points[self.m_index] = MPoint(_point)
+
+	def reset(self):
+		self.m_index = 0
+
+#----------------------------------------------------------
+# Commands
+#----------------------------------------------------------
+
+## The nodes created by the stand-in, by name
+_nodesByName = {}
+
+## Make a dependency node for commands to operate on
+# @param _name The name of the node
+# @return The MObject of the node
+def _createNode(_name):
+	node = _makeObject(MFn.kDependencyNode, {"name" : _name})
+	_nodesByName[_name] = node
+	return node
+
+## The arguments passed to a command
+class MArgList(object):
+
+	## Constructor
+	# @param _args The arguments, e.g. ["-r", 2.0, "pCube1"]
+	def __init__(self, _args = ()):
+		self.m_args = list(_args)
+
+	def __len__(self):
+		return len(self.m_args)
+
+	## Get the number of arguments
+	# @return The length of the list
+	def length(self):
+		return len(self.m_args)
+
+	def asString(self, _index):
+		return str(self.m_args[_index])
+
+	def asDouble(self, _index):
+		return float(self.m_args[_index])
+
+	def asInt(self, _index):
+		return int(self.m_args[_index])
+
+	def asBool(self, _index):
+		return self.m_args[_index] not in (False, 0, "0", "false", "False", "off")
+
+	## Add an argument
+	# @param _value The argument
+	def addArg(self, _value):
+		self.m_args.append(_value)
+		return self
+
+## The flags and arguments a command accepts
+class MSyntax(object):
+	kInvalidArgType = 0
+	kNoArg = 1
+	kBoolean = 2
+	kLong = 3
+	kDouble = 4
+	kString = 5
+	kUnsigned = 6
+	kDistance = 7
+	kAngle = 8
+	kTime = 9
+	kSelectionItem = 10
+	kLastArgType = 11
+
+	kInvalidObjectFormat = 0
+	kNone = 1
+	kStringObjects = 2
+	kSelectionList = 3
+	kLastObjectFormat = 4
+
+	def __init__(self):
+		self.m_flags = {}
+		self.m_objectType = MSyntax.kNone
+		self.m_useSelectionAsDefault = False
+
+	## Add a flag
+	# @param _shortName The short name, e.g. -r
+	# @param _longName The long name, e.g. -radius
+	# @param _argTypes The types of the arguments of the flag
+	def addFlag(self, _shortName, _longName, *_argTypes):
+		flag = (_shortName, _longName, list(_argTypes))
+		self.m_flags[_shortName] = flag
+		self.m_flags[_longName] = flag
+		return self
+
+	## Set the type of objects the command accepts
+	# @param _objectType kNone, kStringObjects or kSelectionList
+	def setObjectType(self, _objectType, _minimumObjects = 0, _maximumObjects = None):
+		self.m_objectType = _objectType
+		return self
+
+	## Use the selection if no objects are passed to the command
+	# @param _useSelection True to use the selection
+	def useSelectionAsDefault(self, _useSelection):
+		self.m_useSelectionAsDefault = _useSelection
+		return self
+
+## Parses the arguments of a command against its syntax
+class MArgParser(object):
+
+	## Constructor
+	# @param _syntax The MSyntax of the command
+	# @param _args The MArgList passed to doIt
+	def __init__(self, _syntax, _args):
+		self.m_syntax = _syntax
+		self.m_flagArguments = {}
+		self.m_objects = []
+		args = list(_args.m_args)
+		i = 0
+		while i < len(args):
+			arg = args[i]
+			flag = self.m_syntax.m_flags.get(arg) if isinstance(arg, str) else None
+			if flag == None:
+				self.m_objects.append(arg)
+				i += 1
+				continue
+			numArgs = len([x for x in flag[2] if x != MSyntax.kNoArg])
+			values = args[i + 1:i + 1 + numArgs]
+			if len(values) != numArgs:
+				raise RuntimeError("(kInvalidParameter): Flag " + arg + " needs " + str(numArgs) + " arguments")
+			self.m_flagArguments[flag[0]] = values
+			i += 1 + numArgs
+
+	## Check if a flag was passed to the command
+	# @param _flag The short or long name of the flag
+	# @return True if the flag was set
+	def isFlagSet(self, _flag):
+		flag = self.m_syntax.m_flags.get(_flag)
+		return flag != None and flag[0] in self.m_flagArguments
+
+	def _flagArgument(self, _flag, _index):
+		flag = self.m_syntax.m_flags.get(_flag)
+		if flag == None or flag[0] not in self.m_flagArguments:
+			raise RuntimeError("(kInvalidParameter): Flag " + _flag + " is not set")
+		return self.m_flagArguments[flag[0]][_index]
+
+	def flagArgumentBool(self, _flag, _index):
+		return MArgList([self._flagArgument(_flag, _index)]).asBool(0)
+
+	def flagArgumentDouble(self, _flag, _index):
+		return float(self._flagArgument(_flag, _index))
+
+	def flagArgumentFloat(self, _flag, _index):
+		return float(self._flagArgument(_flag, _index))
+
+	def flagArgumentInt(self, _flag, _index):
+		return int(self._flagArgument(_flag, _index))
+
+	def flagArgumentString(self, _flag, _index):
+		return str(self._flagArgument(_flag, _index))
+
+	def flagArgumentMAngle(self, _flag, _index):
+		return float(self._flagArgument(_flag, _index))
+
+	def flagArgumentMDistance(self, _flag, _index):
+		return float(self._flagArgument(_flag, _index))
+
+	def flagArgumentMTime(self, _flag, _index):
+		return float(self._flagArgument(_flag, _index))
+
+## Parses the arguments of a command and gives access to the objects passed to it
+class MArgDatabase(MArgParser):
+
+	## Get the objects passed to the command, or the selection if there are none
+	# @return An MSelectionList
+	def getObjectList(self):
+		if self.m_syntax.m_objectType != MSyntax.kSelectionList:
+			raise RuntimeError("(kInvalidParameter): The command syntax does not take a selection list")
+		if not self.m_objects and self.m_syntax.m_useSelectionAsDefault:
+			return MGlobal.getActiveSelectionList()
+		selection = MSelectionList()
+		for obj in self.m_objects:
+			selection.add(obj)
+		return selection
+
+## The base class of commands
+class MPxCommand(object):
+
+	def __init__(self):
+		self._syntax = MSyntax()
+
+	## Get the syntax of the command
+	# @return The MSyntax made by the syntax creator of the command
+	def syntax(self):
+		return self._syntax
+
+	def isUndoable(self):
+		return False
+
+	def hasSyntax(self):
+		return True
+
+	def redoIt(self):
+		return None
+
+	def undoIt(self):
+		return None
+
+## Queues changes to the dependency graph so they can be done and undone together
+class MDGModifier(object):
+
+	def __init__(self):
+		self.m_operations = []
+
+	## Queue a rename
+	# @param _node The MObject of the node
+	# @param _name The new name
+	def renameNode(self, _node, _name):
+		data = _node._data
+		self.m_operations.append((lambda: data.__setitem__("name", _name), lambda oldName = data.get("name"): data.__setitem__("name", oldName)))
+		return self
+
+	## Queue the creation of a node
+	# @param _type The type of the node
+	# @return The MObject of the new node
+	def createNode(self, _type):
+		node = _makeObject(MFn.kDependencyNode, {"name" : str(_type) + "1", "type" : _type})
+		self.m_operations.append((lambda: _nodesByName.__setitem__(node._data["name"], node), lambda: _nodesByName.pop(node._data["name"], None)))
+		return node
+
+	## Queue the deletion of a node
+	# @param _node The MObject of the node
+	def deleteNode(self, _node):
+		name = _node._data.get("name")
+		self.m_operations.append((lambda: _nodesByName.pop(name, None), lambda: _nodesByName.__setitem__(name, _node)))
+		return self
+
+	## Queue a MEL command
+	# @param _command The command
+	def commandToExecute(self, _command):
+		self.m_operations.append((lambda: None, lambda: None))
+		return self
+
+	## Do every queued operation
+	def doIt(self):
+		for operation in self.m_operations:
+			operation[0]()
+		return self
+
+	## Undo every queued operation, in reverse order
+	def undoIt(self):
+		for operation in reversed(self.m_operations):
+			operation[1]()
+		return self
+
+## Queues changes to the DAG so they can be done and undone together
+class MDagModifier(MDGModifier):
+
+	## Queue a reparent
+	# @param _node The MObject of the node
+	# @param _newParent The MObject of the new parent
+	def reparentNode(self, _node, _newParent = None):
+		self.m_operations.append((lambda: None, lambda: None))
+		return self
+
+#----------------------------------------------------------
+# Global functions and plugins
+#----------------------------------------------------------
+
+## Global functions
+class MGlobal(object):
+	_activeSelection = MSelectionList()
+
+	## Get the selection
+	# @return A copy of the selection
+	@staticmethod
+	def getActiveSelectionList(_orderedSelectionIfAvailable = False):
+		return MSelectionList(MGlobal._activeSelection)
+
+	## Set the selection
+	# @param _selection The new selection
+	@staticmethod
+	def setActiveSelectionList(_selection, _listAdjustment = 0):
+		MGlobal._activeSelection = MSelectionList(_selection)
+
+	@staticmethod
+	def displayInfo(_message):
+		pass
+
+	@staticmethod
+	def displayWarning(_message):
+		pass
+
+	@staticmethod
+	def displayError(_message):
+		pass
+
+## Registers the nodes and commands of a plugin
+class MFnPlugin(object):
+	## The stand-in records of everything registered, by name
+	_registeredNodes = {}
+	_registeredCommands = {}
+
+	## Constructor
+	# @param _object The MObject of the plugin passed to initializePlugin
+	def __init__(self, _object = None, _vendor = "", _version = "", _apiVersion = ""):
+		self.m_object = _object
+
+	## Register a node
+	# The node initializer is called straight away, as in Maya
+	def registerNode(self, _name, _typeId, _creator, _initializer, _type = MPxNode.kDependNode, _classification = None):
+		if _name in MFnPlugin._registeredNodes:
+			raise RuntimeError("(kFailure): Node " + _name + " is already registered")
+		_initializer()
+		MFnPlugin._registeredNodes[_name] = (_typeId, _creator, _initializer, _type)
+
+	## Deregister a node
+	# @param _typeId The MTypeId of the node
+	def deregisterNode(self, _typeId):
+		for name, node in list(MFnPlugin._registeredNodes.items()):
+			if node[0] == _typeId:
+				del MFnPlugin._registeredNodes[name]
+				return
+		raise RuntimeError("(kFailure): Node is not registered")
+
+	## Register a command
+	def registerCommand(self, _name, _creator, _syntaxCreator = None):
+		if _name in MFnPlugin._registeredCommands:
+			raise RuntimeError("(kFailure): Command " + _name + " is already registered")
+		MFnPlugin._registeredCommands[_name] = (_creator, _syntaxCreator)
+
+	## Deregister a command
+	# @param _name The name of the command
+	def deregisterCommand(self, _name):
+		if MFnPlugin._registeredCommands.pop(_name, None) == None:
+			raise RuntimeError("(kFailure): Command " + _name + " is not registered")
+
+## Get the attributes added to a node class
+# @param _nodeClass The MPxNode subclass
+# @return A list of the MObject of each attribute
+def _getClassAttributes(_nodeClass):
+	attributes = []
+	for cls in reversed(_nodeClass.__mro__):
+		attributes.extend(_classAttributes.get(cls, []))
+	return attributes
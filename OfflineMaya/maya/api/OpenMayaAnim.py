@@ -0,0 +1,39 @@
+## OpenMayaAnim.py
+# An offline stand-in for the subset of maya.api.OpenMayaAnim used by the generated deformers
+# See OpenMaya.py
+
+import maya.api.OpenMaya as om
+
+## Make a static attribute of a base class
+# @param _longName The long name
+# @param _shortName The short name
+# @param _numeric True for a numeric attribute, the type is then _dataType
+# @param _dataType The MFnNumericData or MFnData type
+# @param _array True for a multi attribute
+# @return The MObject of the attribute
+def _makeAttribute(_longName, _shortName, _numeric, _dataType, _array = False, _default = None):
+	if _numeric:
+		fn = om.MFnNumericAttribute()
+		attribute = fn.create(_longName, _shortName, _dataType, _default or 0.0)
+	else:
+		fn = om.MFnTypedAttribute()
+		attribute = fn.create(_longName, _shortName, _dataType)
+	fn.array = _array
+	return attribute
+
+## The base class of deformers that do not need painted weights
+class MPxGeometryFilter(om.MPxNode):
+	envelope = _makeAttribute("envelope", "en", True, om.MFnNumericData.kFloat, _default = 1.0)
+	input = _makeAttribute("input", "ip", False, om.MFnData.kMesh, True)
+	inputGeom = _makeAttribute("inputGeom", "ig", False, om.MFnData.kMesh)
+	groupId = _makeAttribute("groupId", "gi", True, om.MFnNumericData.kInt)
+	outputGeom = _makeAttribute("outputGeom", "og", False, om.MFnData.kMesh, True)
+
+	## The function that is called to deform the points of one geometry
+	def deform(self, _dataBlock, _geoIter, _localToWorldMatrix, _multiIndex):
+		return None
+
+## The base class of deformers with painted weights
+class MPxDeformerNode(MPxGeometryFilter):
+	weightList = _makeAttribute("weightList", "wl", False, om.MFnData.kDoubleArray, True)
+	weights = _makeAttribute("weights", "w", True, om.MFnNumericData.kFloat, True, 1.0)
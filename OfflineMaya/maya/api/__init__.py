@@ -0,0 +1,2 @@
+## maya.api
+# An offline stand-in for the maya.api package, see OpenMaya.py
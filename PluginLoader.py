@@ -0,0 +1,128 @@
+## PluginLoader.py
+# This file generates plugins in memory and registers them in a running Maya session, without writing a file
+# The generated plugins are registered under a small host plugin, PluginLoaderHost.py, which is loaded once.
+# Loading a spec again unloads the previous version first, so a spec can be edited and reloaded in one call
+# e.g. in the Maya script editor
+# import PluginLoader
+# PluginLoader.loadPlugin("/path/to/myNode.json")
+# Usage: python PluginLoader.py <spec.json>, to print the generated code
+
+import json
+import linecache
+import os
+import sys
+import types
+
+import BatchCreator
+
+## The host plugin that the generated plugins are registered under
+hostPluginFile = os.path.join(os.path.dirname(os.path.abspath(__file__)), "PluginLoaderHost.py")
+hostPluginName = "PluginLoaderHost"
+
+## The loaded plugins, by module name
+loadedPlugins = {}
+
+## Get the spec as a dict
+# @param _spec The JSON file of the spec, or a dict of the spec
+# @return The dict of the spec
+def loadSpec(_spec):
+	if isinstance(_spec, dict):
+		return _spec
+	fileIn = open(_spec, "r")
+	try:
+		return json.load(fileIn)
+	finally:
+		fileIn.close()
+
+## Generate the code of a plugin without writing a file
+# @param _spec The JSON file of the spec, or a dict of the spec
+# @param _specType "node", "deformer", "command" or "bundle", or None to detect it from the spec
+# @return The generated code as a string
+def generateSource(_spec, _specType = None):
+	return generateSourceFromJSON(_spec, loadSpec(_spec), _specType)
+
+## Generate the code of a plugin from a spec that is already loaded
+# @param _spec The JSON file of the spec, or a dict of the spec
+# @param _jsonFile The dict of the spec, from loadSpec
+# @param _specType "node", "deformer", "command" or "bundle", or None to detect it from the spec
+# @return The generated code as a string
+def generateSourceFromJSON(_spec, _jsonFile, _specType = None):
+	specType = _specType or BatchCreator.getSpecTypeFromJSON(_jsonFile)
+	if specType not in BatchCreator.creators:
+		raise ValueError("Unknown spec type: " + str(specType))
+	# The file of a bundle is passed on as it is, so its entries are found next to it
+	if specType == "bundle":
+		return BatchCreator.creators[specType](_spec, False).getText()
+	return BatchCreator.creators[specType](_jsonFile, False).getText()
+
+## Generate a plugin and compile it into a module
+# The module is not added to sys.modules, so it never hides a plugin file of the same name.
+# The spec is loaded once for the type, the code and the module name
+# @param _spec The JSON file of the spec, or a dict of the spec
+# @param _specType "node", "deformer", "command" or "bundle", or None to detect it from the spec
+# @return The module of the plugin, named after the fileName in the spec
+def compilePlugin(_spec, _specType = None):
+	jsonFile = loadSpec(_spec)
+	source = generateSourceFromJSON(_spec, jsonFile, _specType)
+	moduleName = str(jsonFile.get("fileName"))
+	fileName = "<generated " + moduleName + ".py>"
+	# Keep the code so tracebacks can show the generated lines
+	linecache.cache[fileName] = (len(source), None, source.splitlines(True), fileName)
+	module = types.ModuleType(moduleName)
+	module.__file__ = fileName
+	exec(compile(source, fileName, "exec"), module.__dict__)
+	return module
+
+## Get the MObject of the host plugin, loading it if necessary
+# @return The MObject to pass to initializePlugin and uninitializePlugin
+def getHostPlugin():
+	import maya.cmds as cmds
+	import maya.api.OpenMaya as om
+	if not cmds.pluginInfo(hostPluginName, query = True, loaded = True):
+		cmds.loadPlugin(hostPluginFile)
+	return om.MFnPlugin.findPlugin(hostPluginName)
+
+## Generate a plugin and register it in the running session
+# The spec is compiled before the previous version is unloaded, so a broken spec leaves it loaded.
+# Maya cannot deregister a node type while nodes of that type exist, so delete them before reloading
+# @param _spec The JSON file of the spec, or a dict of the spec
+# @param _specType "node", "deformer", "command" or "bundle", or None to detect it from the spec
+# @param _pluginObject The MObject of the plugin to register under, or None for the host plugin
+# @return The module of the plugin
+def loadPlugin(_spec, _specType = None, _pluginObject = None):
+	module = compilePlugin(_spec, _specType)
+	if _pluginObject is None:
+		_pluginObject = getHostPlugin()
+	# The node and command names of the previous version would clash
+	unloadPlugin(module.__name__, _pluginObject)
+	module.initializePlugin(_pluginObject)
+	loadedPlugins[module.__name__] = module
+	return module
+
+## Deregister a plugin loaded with loadPlugin
+# @param _name The module name of the plugin, i.e. the fileName in the spec
+# @param _pluginObject The MObject of the plugin it was registered under, or None for the host plugin
+# @return True if the plugin was loaded
+def unloadPlugin(_name, _pluginObject = None):
+	module = loadedPlugins.get(_name)
+	if module == None:
+		return False
+	if _pluginObject is None:
+		_pluginObject = getHostPlugin()
+	module.uninitializePlugin(_pluginObject)
+	del loadedPlugins[_name]
+	return True
+
+## Deregister every plugin loaded with loadPlugin
+# This is called when the host plugin is unloaded
+# @param _pluginObject The MObject of the plugin they were registered under
+def unloadAll(_pluginObject):
+	for name in sorted(loadedPlugins):
+		unloadPlugin(name, _pluginObject)
+
+# Main
+if __name__ == "__main__":
+	if len(sys.argv) != 2:
+		sys.stderr.write("Usage: python PluginLoader.py <spec.json>\n")
+		sys.exit(2)
+	sys.stdout.write(generateSource(sys.argv[1]))
@@ -0,0 +1,34 @@
+## PluginLoaderHost.py
+# The Maya plugin that the plugins generated in memory by PluginLoader.py are registered under
+# PluginLoader loads it when it is first needed, and unloading it deregisters every generated plugin
+
+import os
+import sys
+
+import maya.api.OpenMaya as om
+
+## This function tells Maya to use the Python API 2.0
+def maya_useNewAPI():
+	pass
+
+## Get the PluginLoader module
+# Maya loads this file by its path, so the generator directory may not be on sys.path
+# @return The PluginLoader module
+def getLoader():
+	generatorDir = os.path.dirname(os.path.abspath(__file__))
+	if generatorDir not in sys.path:
+		sys.path.append(generatorDir)
+	import PluginLoader
+	return PluginLoader
+
+## Initialise the plugin when Maya loads it
+def initializePlugin(mobject):
+	om.MFnPlugin(mobject, "MayaPythonAPIBoilerplateGenerators", "1.0")
+
+## Uninitialise the plugin when Maya unloads it
+def uninitializePlugin(mobject):
+	try:
+		getLoader().unloadAll(mobject)
+	except:
+		sys.stderr.write("Failed to unload the generated plugins")
+		raise
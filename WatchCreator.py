@@ -0,0 +1,307 @@
+## WatchCreator.py
+# This file watches a directory of JSON specs, or a manifest, and regenerates each plugin when its spec changes
+# The generators stay loaded between changes, so a save costs the generation time rather than a new Python process.
+# Changes are seen with inotify on Linux, and by polling the modification times everywhere else.
+# Restart the watcher after editing the generator code, as it keeps running the code it started with
+# Usage: python WatchCreator.py <specDirectory or manifest.json> [--debounce seconds] [--interval seconds] [--poll]
+
+import argparse
+import ctypes
+import ctypes.util
+import errno
+import os
+import select
+import struct
+import sys
+import time
+
+import BatchCreator
+import GenerationCache
+
+## The inotify events that mean a file was written, renamed or deleted
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_CLOEXEC = 0o2000000
+
+## The size of the fixed part of an inotify event: wd, mask, cookie and len
+eventHeaderSize = struct.calcsize("iIII")
+
+## Check if a file could be a spec or a manifest
+# The generation cache and the temporary files of atomic writes are hidden, and the generated files are .py
+# @param _fileName The file name
+# @return True if a change to the file should be handled
+def isWatchedFile(_fileName):
+	name = os.path.basename(_fileName)
+	return name.endswith(".json") and not name.startswith(".")
+
+## Class to wait for changes with inotify
+class InotifyWatcher(object):
+
+	## Set up inotify
+	# Raises OSError if inotify is not available, e.g. on Windows or macOS
+	# @param _directories The directories to watch
+	def __init__(self, _directories):
+		libcName = ctypes.util.find_library("c")
+		if libcName == None:
+			raise OSError(errno.ENOSYS, "The C library was not found")
+		self.m_libc = ctypes.CDLL(libcName, use_errno = True)
+		if not hasattr(self.m_libc, "inotify_init1"):
+			raise OSError(errno.ENOSYS, "inotify is not available")
+		self.m_fd = self.m_libc.inotify_init1(IN_CLOEXEC)
+		if self.m_fd < 0:
+			raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+		# The directory of each watch descriptor
+		self.m_directories = {}
+		self.setDirectories(_directories)
+
+	## Watch more directories
+	# @param _directories The directories to watch, the ones already watched are ignored
+	def setDirectories(self, _directories):
+		mask = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+		for directory in _directories:
+			if directory in self.m_directories.values():
+				continue
+			wd = self.m_libc.inotify_add_watch(self.m_fd, os.path.abspath(directory).encode(sys.getfilesystemencoding()), mask)
+			if wd < 0:
+				raise OSError(ctypes.get_errno(), "Cannot watch " + directory)
+			self.m_directories[wd] = directory
+
+	## Wait for files to change
+	# @param _timeout The longest time to wait in seconds, or None to wait until something changes
+	# @return A set of the paths of the changed files, empty if nothing changed
+	def wait(self, _timeout):
+		try:
+			readable = select.select([self.m_fd], [], [], _timeout)[0]
+		except (select.error, OSError) as e:
+			# A signal interrupted the wait, e.g. on Python 2
+			if e.args[0] == errno.EINTR:
+				return set()
+			raise
+		if not readable:
+			return set()
+		data = os.read(self.m_fd, 65536)
+		changed = set()
+		offset = 0
+		while offset + eventHeaderSize <= len(data):
+			wd, mask, cookie, length = struct.unpack_from("iIII", data, offset)
+			name = data[offset + eventHeaderSize:offset + eventHeaderSize + length].rstrip(b"\0")
+			offset += eventHeaderSize + length
+			if wd in self.m_directories and name:
+				if not isinstance(name, str):
+					name = name.decode(sys.getfilesystemencoding())
+				if isWatchedFile(name):
+					changed.add(os.path.join(self.m_directories[wd], name))
+		return changed
+
+	## Stop watching
+	def close(self):
+		os.close(self.m_fd)
+
+## Class to wait for changes by polling the modification times
+class PollingWatcher(object):
+
+	## Take the first snapshot of the directories
+	# @param _directories The directories to watch
+	# @param _interval The time between polls in seconds
+	def __init__(self, _directories, _interval = 0.25):
+		self.m_interval = _interval
+		self.m_directories = []
+		self.m_snapshot = {}
+		self.setDirectories(_directories)
+
+	## Watch more directories
+	# @param _directories The directories to watch, the ones already watched are ignored
+	def setDirectories(self, _directories):
+		for directory in _directories:
+			if directory not in self.m_directories:
+				self.m_directories.append(directory)
+				self.m_snapshot.update(self.getSnapshot(directory))
+
+	## Get the modification time and size of every watched file in a directory
+	# @param _directory The directory
+	# @return A dict of the path of each file to its modification time and size
+	def getSnapshot(self, _directory):
+		snapshot = {}
+		try:
+			fileNames = os.listdir(_directory)
+		except OSError:
+			return snapshot
+		for fileName in fileNames:
+			if isWatchedFile(fileName):
+				path = os.path.join(_directory, fileName)
+				try:
+					stat = os.stat(path)
+				except OSError:
+					continue
+				snapshot[path] = (stat.st_mtime, stat.st_size)
+		return snapshot
+
+	## Wait for files to change
+	# @param _timeout The longest time to wait in seconds, or None to wait until something changes
+	# @return A set of the paths of the changed files, empty if nothing changed
+	def wait(self, _timeout):
+		startTime = time.time()
+		while True:
+			snapshot = {}
+			for directory in self.m_directories:
+				snapshot.update(self.getSnapshot(directory))
+			changed = set(path for path in set(snapshot) | set(self.m_snapshot) if snapshot.get(path) != self.m_snapshot.get(path))
+			self.m_snapshot = snapshot
+			if changed:
+				return changed
+			if _timeout != None and time.time() - startTime >= _timeout:
+				return set()
+			sleepTime = self.m_interval if _timeout == None else min(self.m_interval, _timeout - (time.time() - startTime))
+			time.sleep(max(0.0, sleepTime))
+
+	## Stop watching
+	def close(self):
+		pass
+
+## Make a watcher, using inotify if it is available
+# @param _directories The directories to watch
+# @param _poll True to always poll
+# @param _interval The time between polls in seconds
+# @return An InotifyWatcher or a PollingWatcher
+def makeWatcher(_directories, _poll = False, _interval = 0.25):
+	if not _poll:
+		try:
+			return InotifyWatcher(_directories)
+		except (OSError, AttributeError):
+			pass
+	return PollingWatcher(_directories, _interval)
+
+## Class to regenerate the specs in a directory or manifest as they change
+class SpecWatcher(object):
+
+	## Constructor
+	# @param _path A directory of JSON specs or a manifest JSON file
+	# @param _cache The GenerationCache of the specs
+	def __init__(self, _path, _cache):
+		self.m_path = _path
+		self.m_cache = _cache
+		self.m_isManifest = not os.path.isdir(_path)
+		# The hash of each spec that failed, so it is not retried until it changes
+		self.m_failed = {}
+		self.m_specs = BatchCreator.collectSpecs(_path)
+
+	## Get the files that the output of a spec depends on
+	# @param _spec A (specType, specPath) tuple
+	# @return A list of the JSON files, e.g. a bundle and its entries
+	def getSpecFiles(self, _spec):
+		specType, specPath = _spec
+		if specType in BatchCreator.creators:
+			return BatchCreator.creators[specType].getSpecFiles(specPath)
+		return [specPath]
+
+	## Get the directories to watch
+	# @return A sorted list of the directories of the specs and the specs they depend on, and of the manifest
+	def getDirectories(self):
+		directories = set(os.path.dirname(os.path.abspath(x)) for spec in self.m_specs for x in self.getSpecFiles(spec))
+		directories.add(os.path.abspath(self.m_path if not self.m_isManifest else os.path.dirname(os.path.abspath(self.m_path))))
+		return sorted(directories)
+
+	## Update the specs after files changed
+	# A directory only needs the changed files checked, a manifest is read again as it may list new specs
+	# @param _changed The paths of the changed files
+	# @return A list of the (specType, specPath) tuples that may need generating
+	def updateSpecs(self, _changed):
+		changed = set(os.path.abspath(x) for x in _changed)
+		if self.m_isManifest:
+			self.m_specs = BatchCreator.collectSpecs(self.m_path)
+			if os.path.abspath(self.m_path) in changed:
+				return self.m_specs
+			return [spec for spec in self.m_specs if changed.intersection(os.path.abspath(x) for x in self.getSpecFiles(spec))]
+		specs = dict((os.path.abspath(specPath), (specType, specPath)) for specType, specPath in self.m_specs)
+		candidates = []
+		for path in sorted(_changed):
+			key = os.path.abspath(path)
+			if os.path.isfile(path):
+				specs[key] = (BatchCreator.getSpecType(path), path)
+				candidates.append(specs[key])
+			else:
+				specs.pop(key, None)
+				self.m_cache.remove(path)
+				self.m_failed.pop(key, None)
+		self.m_specs = [specs[key] for key in sorted(specs)]
+		# A bundle also depends on the specs of its entries
+		candidates.extend([spec for spec in self.m_specs if spec not in candidates and changed.intersection(os.path.abspath(x) for x in self.getSpecFiles(spec)[1:])])
+		return candidates
+
+	## Generate the specs whose output is out of date
+	# @param _specs A list of (specType, specPath) tuples to check
+	# @return A list of (specPath, status, error message, time taken) tuples for the specs that were generated
+	def regenerate(self, _specs):
+		results = []
+		for spec in _specs:
+			specType, specPath = spec
+			key = os.path.abspath(specPath)
+			if specType in BatchCreator.creators and self.m_cache.isCurrent(specPath, BatchCreator.creators[specType]):
+				continue
+			specHash = "".join([str(GenerationCache.hashFile(x)) for x in self.getSpecFiles(spec)])
+			if key in self.m_failed and self.m_failed[key] == specHash:
+				continue
+			result = BatchCreator.generateSpec(spec)
+			if result[1] == "OK":
+				self.m_cache.update(specPath, BatchCreator.creators[specType])
+				self.m_failed.pop(key, None)
+			else:
+				self.m_cache.remove(specPath)
+				self.m_failed[key] = specHash
+			results.append(result)
+		if results:
+			self.m_cache.save()
+		return results
+
+	## Watch the specs until interrupted
+	# A burst of changes, e.g. a save that writes several files, is handled once after it settles
+	# @param _watcher An InotifyWatcher or PollingWatcher of the directories of the specs
+	# @param _debounce The time in seconds without changes before the specs are generated
+	def run(self, _watcher, _debounce = 0.1):
+		startTime = time.time()
+		results = self.regenerate(self.m_specs)
+		if results:
+			BatchCreator.report(results, time.time() - startTime)
+			sys.stdout.flush()
+		while True:
+			changed = _watcher.wait(None)
+			if not changed:
+				continue
+			while True:
+				more = _watcher.wait(_debounce)
+				if not more:
+					break
+				changed |= more
+			startTime = time.time()
+			results = self.regenerate(self.updateSpecs(changed))
+			if results:
+				BatchCreator.report(results, time.time() - startTime)
+				sys.stdout.flush()
+			_watcher.setDirectories(self.getDirectories())
+
+# Main
+if __name__ == "__main__":
+	parser = argparse.ArgumentParser(description = "Regenerate Maya plugins whenever their JSON specs change")
+	parser.add_argument("path", help = "A directory of JSON specs or a manifest JSON file")
+	parser.add_argument("--cache", default = None, help = "The generation cache file (default: .generationCache.json next to the specs)")
+	parser.add_argument("--debounce", type = float, default = 0.1, help = "Seconds without changes before generating (default: 0.1)")
+	parser.add_argument("--interval", type = float, default = 0.25, help = "Seconds between polls when inotify is not used (default: 0.25)")
+	parser.add_argument("--poll", action = "store_true", help = "Poll for changes even if inotify is available")
+	args = parser.parse_args()
+	cacheFile = args.cache
+	if cacheFile == None:
+		specDir = args.path if os.path.isdir(args.path) else os.path.dirname(os.path.abspath(args.path))
+		cacheFile = os.path.join(specDir, ".generationCache.json")
+	specWatcher = SpecWatcher(args.path, GenerationCache.GenerationCache(cacheFile))
+	watcher = makeWatcher(specWatcher.getDirectories(), args.poll, args.interval)
+	sys.stdout.write("Watching %s with %s, press Ctrl+C to stop\n" % (args.path, "inotify" if isinstance(watcher, InotifyWatcher) else "polling"))
+	sys.stdout.flush()
+	try:
+		specWatcher.run(watcher, args.debounce)
+	except KeyboardInterrupt:
+		pass
+	finally:
+		watcher.close()
@@ -0,0 +1,100 @@
+## test_JSONStream.py
+# Checks that the incremental reader decodes the same values as json.load, wherever the chunks end
+# Usage: python -m unittest discover tests
+
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import JSONStream
+
+## The arrays that are streamed
+streamedKeys = ("inputAttributes", "outputAttributes")
+
+## The chunk sizes to read with, small enough for a chunk to end inside most values
+chunkSizes = (1, 2, 3, 7, 64)
+
+## Make a random JSON value
+# @param _random The random number generator
+# @param _depth The depth of nesting left
+# @return The value
+def makeValue(_random, _depth):
+	kind = _random.randint(0, 7 if _depth > 0 else 5)
+	if kind == 0:
+		return _random.randint(-100000, 100000)
+	if kind == 1:
+		# Floats with fractions and exponents, whose . or e may be the last character of a chunk
+		return _random.uniform(-1e6, 1e6) * 10 ** _random.randint(-30, 30)
+	if kind == 2:
+		return _random.choice([True, False, None])
+	if kind == 3:
+		return "".join(_random.choice(u"ab \"\\/\u00e9,]}:{[") for i in range(_random.randint(0, 8)))
+	if kind == 4:
+		return 0.5
+	if kind == 5:
+		return -1e-7
+	if kind == 6:
+		return [makeValue(_random, _depth - 1) for i in range(_random.randint(0, 4))]
+	return dict(("k%i" % i, makeValue(_random, _depth - 1)) for i in range(_random.randint(0, 4)))
+
+class JSONStreamTest(unittest.TestCase):
+
+	def setUp(self):
+		self.m_dir = tempfile.mkdtemp()
+
+	def tearDown(self):
+		shutil.rmtree(self.m_dir)
+
+	## Write a JSON file
+	# @param _text The contents
+	# @return The path of the file
+	def writeFile(self, _text):
+		fileName = os.path.join(self.m_dir, "spec.json")
+		fileOut = open(fileName, "w")
+		try:
+			fileOut.write(_text)
+		finally:
+			fileOut.close()
+		return fileName
+
+	## Check that every chunk size reads the same members and arrays as json.load
+	# @param _text The contents of the JSON file
+	def checkFile(self, _text):
+		fileName = self.writeFile(_text)
+		expected = json.loads(_text)
+		for chunkSize in chunkSizes:
+			reader = JSONStream.JSONStreamReader(fileName, streamedKeys, chunkSize)
+			self.assertEqual(reader.getMembers(), dict((key, value) for key, value in expected.items() if key not in streamedKeys))
+			self.assertEqual(sorted(reader.getKeys()), sorted(expected))
+			for key in streamedKeys:
+				self.assertEqual(list(reader.iterArray(key)), expected.get(key) or [])
+
+	def testNumbersAcrossChunks(self):
+		self.checkFile('{"inputAttributes" : [1.5e3, 2.25, -0.5E-2, 10, 1e+5], "minValue" : 1.5, "outputAttributes" : null}')
+
+	def testRandomObjects(self):
+		generator = random.Random(1)
+		for i in range(40):
+			data = dict(("m%i" % j, makeValue(generator, 2)) for j in range(generator.randint(0, 3)))
+			for key in streamedKeys:
+				if generator.random() < 0.8:
+					data[key] = [makeValue(generator, 2) for j in range(generator.randint(0, 6))]
+			self.checkFile(json.dumps(data, indent = generator.choice([None, 1, 4])))
+
+	def testEmpty(self):
+		self.checkFile("{}")
+		self.checkFile('\n{ "inputAttributes" : [ ] }\n')
+
+	def testInvalid(self):
+		for text in ('{"a" : 1', '{"a" 1}', '[1]', '{"inputAttributes" : [1,}', '{"inputAttributes" : [1.5x]}'):
+			reader = JSONStream.JSONStreamReader(self.writeFile(text), streamedKeys, 2)
+			self.assertRaises(ValueError, lambda: list(reader.iterArray("inputAttributes")) + list(reader.scan(None)))
+
+if __name__ == "__main__":
+	unittest.main()